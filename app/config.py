@@ -11,6 +11,101 @@ class Settings(BaseSettings):
     MY_API_BASE_URL : str
     MY_API_CORE_REPORTS : str
     DART_API_KEY : str
+
+    # API 서버의 비동기 OpenSearch 클라이언트 (app/opensearch_client.py, aiohttp 필요)
+    # 연결 풀 크기는 동시에 OpenSearch로 나가는 요청 수 상한
+    OS_ASYNC_POOL_MAXSIZE: int = 50
+    OS_ASYNC_REQUEST_TIMEOUT: float = 30.0
+
+    # 검색 결과 캐시 (app/services/search_cache.py): memory / sqlite / off
+    # uvicorn 워커가 여럿이거나 적재를 별도 프로세스(스크립트)로 돌리면 sqlite로 공유해야 무효화가 모두에게 보임
+    SEARCH_CACHE_BACKEND: str = "memory"
+    SEARCH_CACHE_TTL_SEC: float = 60.0
+    SEARCH_CACHE_MAX_BYTES: int = 64 * 1024 ** 2
+    SEARCH_CACHE_PATH: str = ".cache/search_cache.sqlite3"
+    # snippet 하이라이트에서 섹션 본문을 분석할 최대 글자 수 (index.highlight.max_analyzed_offset 이하로)
+    SEARCH_SNIPPET_MAX_ANALYZED_CHARS: int = 1_000_000
+    # 보고서 검색이 읽는 문서: report(보고서 문서의 nested 섹션) / section(rpt_*_sec) / passage(rpt_*_psg)
+    # 비우면 INGEST_INDEX_MODE=section일 때 section, 아니면 report. passage는 패시지 인덱스를 모두 적재한 뒤에 지정
+    SEARCH_SOURCE: str = ""
+
+    # DART OpenAPI 원문 다운로드 (app/services/dart_client.py)
+    # 로컬 스텁 서버로 테스트할 때는 DART_API_BASE_URL만 바꾸면 됨
+    DART_API_BASE_URL: str = "https://opendart.fss.or.kr/api"
+    DART_DOWNLOAD_CONCURRENCY: int = 4
+    DART_RATE_LIMIT_PER_SEC: float = 5.0  # API 키 기준 전역 한도 (0이면 제한 없음)
+    DART_RATE_LIMIT_BURST: int = 1
+    DART_REQUEST_TIMEOUT: float = 60.0
+    DART_MAX_RETRIES: int = 3
+    DART_INITIAL_BACKOFF: float = 1.0
+    DART_MAX_BACKOFF: float = 30.0
+
+    # 기업별 공시 목록 (MY_API_CORE_REPORTS) 페이지 크기/동시 요청 수
+    MY_API_PAGE_COUNT: int = 100
+    MY_API_PAGE_CONCURRENCY: int = 4
+    # 기업별 마지막 적재 접수번호 (app/services/filing_sync.py)
+    FILING_SYNC_STATE_PATH: str = ".cache/filing_sync.sqlite3"
+
+    # 기업 공시 적재 작업 큐 (app/services/ingest_jobs.py), DB 경로를 비우면 메모리에만 보관
+    INGEST_JOB_WORKERS: int = 2
+    INGEST_JOBS_DB_PATH: str = ".cache/ingest_jobs.sqlite3"
+    INGEST_JOBS_KEEP_FINISHED: int = 200
+
+    # 접수번호별 원문 ZIP 디스크 캐시 (app/services/zip_cache.py), 압축: none / zstd (zstandard 패키지 필요)
+    DART_ZIP_CACHE_ENABLED: bool = True
+    DART_ZIP_CACHE_DIR: str = ".cache/dart_zip"
+    DART_ZIP_CACHE_MAX_BYTES: int = 5 * 1024 ** 3
+    DART_ZIP_CACHE_COMPRESSION: str = "none"
+
+    # 디렉터리 인제스트 시 XML 파싱 프로세스 수 (0이면 CPU 코어 수)
+    PARSE_WORKERS: int = 0
+
+    # XML 파싱 결과 디스크 캐시
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_DIR: str = ".cache/parse"
+    PARSE_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+
+    # 색인 방식: report(보고서당 문서 하나, 섹션은 nested) / section(섹션별 문서) / both
+    INGEST_INDEX_MODE: str = "report"
+
+    # 공시 XML 루트 (하위에 분기/반기/사업/증권 폴더), 폴더별 최대 파일 수 (0이면 제한 없음)
+    INGEST_DATA_DIR: str = "C:/01571107"
+    INGEST_MAX_FILES_PER_FOLDER: int = 10
+
+    # 감시 모드 (app/services/parsing/ingest_watch.py)
+    # 변경 이벤트 묶음 대기(ms), 크기/수정 시각이 이 시간(초) 동안 그대로여야 쓰기 완료로 판단, 한 번에 보낼 파일 수
+    INGEST_WATCH_DEBOUNCE_MS: int = 500
+    INGEST_WATCH_STABLE_SEC: float = 2.0
+    INGEST_WATCH_BATCH_SIZE: int = 20
+    INGEST_WATCH_WORKERS: int = 1
+    # 시작 시 마지막 적재 접수번호 날짜보다 이 일수만큼 앞선 폴더부터 다시 확인
+    INGEST_WATCH_RESCAN_DAYS: int = 1
+
+    # 디렉터리 인제스트 체크포인트 (재실행 시 성공한 문서 건너뜀)
+    INGEST_MANIFEST_PATH: str = ".cache/ingest_manifest.sqlite3"
+    # 대량 적재 동안 refresh/replica를 끄고 끝나면 복구, 0보다 크면 적재 후 force merge 세그먼트 수
+    INGEST_BULK_LOAD_MODE: bool = False
+    INGEST_FORCE_MERGE_SEGMENTS: int = 0
+    INGEST_FORCE_MERGE_TIMEOUT: int = 3600
+
+    # OpenSearch bulk 적재 (app/services/bulk_sender.py)
+    BULK_MAX_CHUNK_BYTES: int = 10 * 1024 ** 2  # http.max_content_length(기본 100MB)보다 충분히 작게
+    BULK_MAX_CHUNK_DOCS: int = 500
+    BULK_THREADS: int = 4
+    BULK_MAX_RETRIES: int = 5
+    BULK_INITIAL_BACKOFF: float = 2.0
+    BULK_MAX_BACKOFF: float = 60.0
+
+    # 섹션 본문을 검색용 패시지로 나눠 패시지 인덱스(rpt_*_psg)에 함께 색인 (app/services/parsing/passages.py)
+    # 검색은 적재가 끝난 뒤 SEARCH_SOURCE=passage로 바꿈
+    PASSAGE_CHUNKING_ENABLED: bool = False
+    PASSAGE_MAX_CHARS: int = 2000
+
+    # 단계별 시간 측정 (app/services/profiling.py)
+    PROFILE_ENABLED: bool = False
+    PROFILE_SLOWEST_N: int = 10
+    PROFILE_CPROFILE_THRESHOLD_SEC: float = 0.0  # 0보다 크면 이 시간을 넘긴 문서의 cProfile 저장
+    PROFILE_OUTPUT_DIR: str = ".cache/profile"
     
     class Config:
         env_file = ".env"
@@ -1,7 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from .opensearch_client import close_async_client, init_async_client
 from .routers import search
+from .services.ingest_jobs import get_job_manager, shutdown_job_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_async_client()  # 검색/색인 API가 이벤트 루프를 막지 않도록 비동기 클라이언트 사용
+    get_job_manager()  # 재시작 전에 대기/실행 중이던 적재 작업 복구
+    yield
+    shutdown_job_manager(timeout=5)
+    await close_async_client()
+
 
-app = FastAPI(title="FastAPI + OpenSearch Example")
+app = FastAPI(title="FastAPI + OpenSearch Example", lifespan=lifespan)
 
 app.include_router(search.router, prefix="/search", tags=["Search"])
 
@@ -1,240 +1,138 @@
-INDEX_MAPPINGS = {
-    "rpt_qt": {
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
+# 보고서 인덱스 공통 설정/매핑 (모든 보고서 종류가 같은 구조)
+REPORT_INDEX_SETTINGS = {
+    "number_of_shards": 1,
+    "number_of_replicas": 0,
+    "analysis": {
+        "analyzer": {
+            "my_html_strip_analyzer": {
+                "char_filter": ["html_strip"],
+                "tokenizer": "standard",
+                "filter": ["lowercase"],
             }
-        },
-        "mappings": {
-            "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
-                },
-            }
-        },
-    },
-    "rpt_half": {
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
-            }
-        },
-        "mappings": {
-            "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
-                },
-            }
-        },
-    },
-    "rpt_biz": {
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
-            }
-        },
-        "mappings": {
-            "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
-                },
-            }
-        },
-    },
-    "rpt_sec_eq": {
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
-            }
-        },
-        "mappings": {
-            "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
-                },
-            }
-        },
+        }
     },
-    "rpt_ad": {
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
-            }
-        },
-        "mappings": {
+}
+
+REPORT_INDEX_MAPPINGS = {
+    "properties": {
+        "doc_id": {"type": "keyword"},
+        "doc_name": {"type": "keyword"},
+        "doc_code": {"type": "keyword"},
+        "pub_date": {"type": "date", "format": "yyyyMMdd"},
+        "corp_code": {"type": "keyword"},
+        "corp_name": {"type": "keyword"},
+        "sections": {
+            "type": "nested",
             "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
+                "sec_id": {"type": "keyword"},
+                "sec_title": {"type": "text"},
+                "sec_content": {
+                    "type": "text",
+                    "analyzer": "my_html_strip_analyzer",
                 },
-            }
-        },
-    },
-    "rpt_ad_con":{
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
-            }
+            },
         },
-        "mappings": {
-            "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
-                },
-            }
+    }
+}
+
+# 보고서 종류별 읽기 alias. 실제 문서는 "{alias}-{pub_date 연도}" 인덱스에 저장된다 (예: rpt_qt-2024).
+REPORT_ALIASES = [
+    "rpt_qt",  # 분기보고서
+    "rpt_half",  # 반기보고서
+    "rpt_biz",  # 사업보고서
+    "rpt_sec_eq",  # 증권신고서(지분증권)
+    "rpt_ad",  # 감사보고서
+    "rpt_ad_con",  # 감사보고서(연결)
+    "rpt_other",
+]
+
+# 연도를 알 수 없는 문서가 들어가는 파티션
+UNKNOWN_PARTITION = "unknown"
+
+REPORT_COMPONENT_TEMPLATE = "rpt_report"
+
+# 섹션 단위 문서 (INGEST_INDEX_MODE=section/both)
+# 보고서 메타데이터를 섹션마다 복제해 nested 없이 섹션 하나가 문서 하나가 된다.
+# _id는 "{doc_id}_{sec_id}", 라우팅은 corp_code (같은 회사 섹션은 같은 샤드)
+SECTION_INDEX_MAPPINGS = {
+    "_routing": {"required": True},
+    "properties": {
+        "doc_id": {"type": "keyword"},
+        "doc_name": {"type": "keyword"},
+        "doc_code": {"type": "keyword"},
+        "pub_date": {"type": "date", "format": "yyyyMMdd"},
+        "corp_code": {"type": "keyword"},
+        "corp_name": {"type": "keyword"},
+        "sec_id": {"type": "keyword"},
+        "sec_title": {"type": "text"},
+        "sec_content": {
+            "type": "text",
+            "analyzer": "my_html_strip_analyzer",
         },
     },
-    "rpt_other": {
-        "settings": {
-            "analysis": {
-                "analyzer": {
-                    "my_html_strip_analyzer": {
-                        "char_filter": ["html_strip"],
-                        "tokenizer": "standard",
-                        "filter": ["lowercase"],
-                    }
-                }
-            }
-        },
-        "mappings": {
-            "properties": {
-                "doc_id": {"type": "keyword"},
-                "doc_name": {"type": "keyword"},
-                "doc_code": {"type": "keyword"},
-                "pub_date": {"type": "date", "format": "yyyyMMdd"},
-                "corp_code": {"type": "keyword"},
-                "corp_name": {"type": "keyword"},
-                "sections": {
-                    "type": "nested",
-                    "properties": {
-                        "sec_id": {"type": "keyword"},
-                        "sec_title": {"type": "text"},
-                        "sec_content": {
-                            "type": "text",
-                            "analyzer": "my_html_strip_analyzer",
-                        },
-                    },
-                },
-            }
+}
+
+SECTION_COMPONENT_TEMPLATE = "rpt_section"
+
+# 섹션 본문을 나눈 검색용 패시지 문서 (PASSAGE_CHUNKING_ENABLED, app/services/parsing/passages.py)
+# 섹션 문서처럼 보고서 메타데이터를 복제하고 content == sec_content[start:end]
+# _id는 passage_id("{doc_id}_{sec_id}_{순번}"), 라우팅은 corp_code
+PASSAGE_INDEX_MAPPINGS = {
+    "_routing": {"required": True},
+    "properties": {
+        "doc_id": {"type": "keyword"},
+        "doc_name": {"type": "keyword"},
+        "doc_code": {"type": "keyword"},
+        "pub_date": {"type": "date", "format": "yyyyMMdd"},
+        "corp_code": {"type": "keyword"},
+        "corp_name": {"type": "keyword"},
+        "passage_id": {"type": "keyword"},
+        "sec_id": {"type": "keyword"},
+        "sec_title": {"type": "text"},
+        "start": {"type": "integer"},
+        "end": {"type": "integer"},
+        "content": {
+            "type": "text",
+            "analyzer": "my_html_strip_analyzer",
         },
     },
-}
\ No newline at end of file
+}
+
+PASSAGE_COMPONENT_TEMPLATE = "rpt_passage"
+
+
+def section_alias(alias):
+    """보고서 종류 alias에 대응하는 섹션 문서 alias (예: rpt_qt -> rpt_qt_sec)"""
+    return f"{alias}_sec"
+
+
+def passage_alias(alias):
+    """보고서 종류 alias에 대응하는 패시지 문서 alias (예: rpt_qt -> rpt_qt_psg)"""
+    return f"{alias}_psg"
+
+
+def partition_index_name(alias, pub_date):
+    """alias와 pub_date(yyyyMMdd)로 문서가 저장될 연도별 인덱스 이름을 만듭니다."""
+    year = (pub_date or "")[:4]
+    return f"{alias}-{year if year.isdigit() and len(year) == 4 else UNKNOWN_PARTITION}"
+
+
+def partition_indices(alias, from_year, to_year):
+    """연도 범위에 해당하는 파티션 인덱스 이름 목록 (검색 대상을 좁힐 때)"""
+    return [f"{alias}-{year}" for year in range(int(from_year), int(to_year) + 1)]
+
+
+def component_template_body(mappings=REPORT_INDEX_MAPPINGS):
+    """같은 종류의 인덱스가 공유하는 설정/매핑 (component template)"""
+    return {"template": {"settings": REPORT_INDEX_SETTINGS, "mappings": mappings}}
+
+
+def index_template_body(alias, component_template=REPORT_COMPONENT_TEMPLATE):
+    """alias별 index template: "{alias}-*" 인덱스를 만들면 공통 매핑과 읽기 alias가 붙음"""
+    return {
+        "index_patterns": [f"{alias}-*"],
+        "composed_of": [component_template],
+        "template": {"aliases": {alias: {}}},
+        "priority": 100,
+    }
+
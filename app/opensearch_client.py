@@ -5,7 +5,7 @@ from .config import settings
 from app.config import settings
 OS_HOST = settings.OS_HOST
 
-# OpenSearch 접속 정보
+# OpenSearch 접속 정보 (적재 스크립트/워커 스레드용 동기 클라이언트)
 os_client = OpenSearch(
     hosts=OS_HOST,# OpenSearch 노드 URL
     http_compress=True,
@@ -13,3 +13,37 @@ os_client = OpenSearch(
     max_retries=3,
     request_timeout=60,
 )
+
+# API 서버 이벤트 루프용 비동기 클라이언트 (앱 시작 시 만들고 종료 시 닫음, app/main.py)
+# aiohttp가 있어야 해서 동기 스크립트가 import만으로 의존하지 않도록 init 안에서 가져온다.
+_async_client = None
+
+
+def init_async_client():
+    global _async_client
+    if _async_client is None:
+        from opensearchpy import AsyncHttpConnection, AsyncOpenSearch
+
+        _async_client = AsyncOpenSearch(
+            hosts=OS_HOST,
+            connection_class=AsyncHttpConnection,
+            maxsize=settings.OS_ASYNC_POOL_MAXSIZE,  # aiohttp 연결 풀 크기
+            http_compress=True,
+            retry_on_timeout=True,
+            max_retries=3,
+            timeout=settings.OS_ASYNC_REQUEST_TIMEOUT,
+        )
+    return _async_client
+
+
+def get_async_client():
+    if _async_client is None:
+        raise RuntimeError("Async OpenSearch client is not initialized (init_async_client on app startup)")
+    return _async_client
+
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
@@ -1,8 +1,23 @@
-from fastapi import APIRouter
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.services.dart_service import test_service
-from ..opensearch_client import os_client as client
+from app.schemas.jobs import IngestJobRequest, IngestJobStatus, IngestJobSubmitResponse
+from app.schemas.search import (
+    PitCloseRequest,
+    ReportExportRequest,
+    ReportSearchRequest,
+    ReportSearchResponse,
+    ReportSection,
+    SearchCacheStats,
+)
+from app.services.ingest_jobs import get_job_manager
+from app.services.report_export import gzip_chunks, iter_export_ndjson, prepare_export
+from app.services.report_search import close_pit_async, get_section_async, search_reports_async
+from app.services.search_cache import cache_key, get_search_cache, invalidate_indices_async, normalize_text
+from ..opensearch_client import get_async_client
 
 router = APIRouter()
 
@@ -16,17 +31,26 @@ class Document(BaseModel):
 #그걸로 api 전부 가져오기
 # 오픈 서치에 넣기
 
+# OpenSearch를 부르는 핸들러는 async def + 비동기 클라이언트 (스레드 풀을 거치지 않고 이벤트 루프에서 대기)
 @router.post("/index")
-def index_document(doc: Document):
-    response = client.index(
+async def index_document(doc: Document):
+    response = await get_async_client().index(
         index=INDEX_NAME,
         id=doc.id,
         body={"title": doc.title, "content": doc.content}
     )
+    await invalidate_indices_async([INDEX_NAME])
     return {"result": response["result"]}
 
 @router.get("/search")
-def search_documents(q: str):
+async def search_documents(q: str):
+    cache = get_search_cache()
+    if cache is not None:
+        key = cache_key("documents", {"index": INDEX_NAME, "q": normalize_text(q)})
+        generations = await cache.generations_async([INDEX_NAME])
+        cached = await cache.get_async(key, generations)
+        if cached is not None:
+            return cached
     query = {
         "query": {
             "multi_match": {
@@ -35,10 +59,84 @@ def search_documents(q: str):
             }
         }
     }
-    response = client.search(index=INDEX_NAME, body=query)
+    response = await get_async_client().search(index=INDEX_NAME, body=query)
     hits = [hit["_source"] for hit in response["hits"]["hits"]]
+    if cache is not None:
+        await cache.put_async(key, generations, {"hits": hits})
     return {"hits": hits}
 
-@router.get("/test/{corp_code}")
+# 보고서 검색 (섹션 단위 매칭, 맞은 섹션만 반환, search_after 페이지, use_pit면 PIT 시점 고정)
+@router.post("/reports", response_model=ReportSearchResponse)
+async def search_report_documents(request: ReportSearchRequest):
+    try:
+        return await search_reports_async(get_async_client(), **request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# 섹션 하나를 본문까지 (검색 결과는 snippets만 싣고 전체 본문은 필요할 때 따로 받음)
+@router.get("/reports/{doc_id}/sections/{sec_id}", response_model=ReportSection)
+async def get_report_section(doc_id: str, sec_id: str):
+    section = await get_section_async(get_async_client(), doc_id, sec_id)
+    if section is None:
+        raise HTTPException(status_code=404, detail=f"Section {sec_id} of {doc_id} not found")
+    return section
+
+# 끝까지 넘기지 않은 검색의 PIT 닫기 (닫지 않아도 keep_alive가 지나면 만료)
+@router.delete("/reports/pit", status_code=204)
+async def close_report_pit(request: PitCloseRequest):
+    await close_pit_async(get_async_client(), request.pit_id)
+
+# 기업 공시 전체를 NDJSON으로 스트리밍 (나눠 읽으며 흘려보내므로 크기 제한/메모리 증가 없음)
+@router.post("/export")
+async def export_reports(request: ReportExportRequest):
+    try:
+        plan = prepare_export(**request.model_dump(exclude={"gzip"}))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    chunks = iter_export_ndjson(get_async_client(), plan)
+    headers = {"Content-Disposition": 'attachment; filename="reports.ndjson"'}
+    if request.gzip:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+
+# 검색 캐시 hit/miss 수와 사용량 (hit/miss는 응답한 워커 프로세스 기준)
+@router.get("/cache/stats", response_model=SearchCacheStats)
+async def search_cache_stats():
+    cache = get_search_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Search cache is disabled (SEARCH_CACHE_BACKEND=off)")
+    return await cache.stats_async()
+
+# 적재 작업 API는 작업 저장소(SQLite)를 동기로 읽고 쓰므로 def로 두어 스레드 풀에서 돌림 (실제 적재는 작업 워커 스레드)
+# 기업 공시 전체 적재 (요청 안에서 실행하지 않고 작업 큐에 넣은 뒤 작업 ID를 바로 반환)
+@router.get("/test/{corp_code}", response_model=IngestJobSubmitResponse, status_code=202)
 def test(corp_code: str):
-    return test_service(corp_code)
\ No newline at end of file
+    job, deduplicated = get_job_manager().submit([corp_code])
+    return {"job": job.to_dict(), "deduplicated": deduplicated}
+
+# 적재 작업 등록 (이미 대기/실행 중인 기업은 기존 작업으로 안내)
+@router.post("/jobs", response_model=IngestJobSubmitResponse, status_code=202)
+def submit_job(request: IngestJobRequest):
+    job, deduplicated = get_job_manager().submit(request.corp_codes, request.check_index, request.force)
+    return {"job": job.to_dict(), "deduplicated": deduplicated}
+
+# 적재 작업 목록 (최근 작업부터)
+@router.get("/jobs", response_model=List[IngestJobStatus])
+def list_jobs(limit: int = 50):
+    return [job.to_dict() for job in get_job_manager().list(limit)]
+
+# 적재 작업 상태 (단계별 개수, 실패 목록)
+@router.get("/jobs/{job_id}", response_model=IngestJobStatus)
+def get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+# 기업 공시 증분 동기화 (마지막 적재 이후 공시와 인덱스에 빠진 공시만 적재)
+# 적재는 작업 큐에서 실행 (같은 기업의 대기/실행 중 작업이 있으면 그 작업으로 안내)
+@router.post("/sync/{corp_code}", response_model=IngestJobSubmitResponse, status_code=202)
+def sync(corp_code: str, check_index: bool = True):
+    job, deduplicated = get_job_manager().submit([corp_code], check_index)
+    return {"job": job.to_dict(), "deduplicated": deduplicated}
@@ -0,0 +1,32 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+# 적재 작업 요청
+class IngestJobRequest(BaseModel):
+    corp_codes: List[str] = Field(..., min_length=1)  # 기업코드 목록
+    check_index: bool = True  # watermark 이전 공시 중 인덱스에 빠진 것도 적재
+    force: bool = False  # 전체 공시 다시 적재 (매핑 변경 후)
+
+
+# 적재 작업 상태
+class IngestJobStatus(BaseModel):
+    job_id: str
+    corp_codes: List[str]
+    check_index: bool
+    force: bool
+    status: str  # queued / running / done / failed
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    counts: Dict[str, int]  # 단계별 개수 (listed / queued / downloaded / parsed / indexed, *_failed)
+    failure_count: int
+    failures: List[Dict[str, Any]]  # 최근 실패 항목 {"stage", "key", "error"}
+    error: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None  # 기업별 결과
+
+
+# 작업 등록 응답
+class IngestJobSubmitResponse(BaseModel):
+    job: IngestJobStatus
+    deduplicated: Dict[str, str]  # 이미 다른 작업에 있던 기업 -> 그 작업 ID
@@ -0,0 +1,103 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+# 보고서 검색 요청 (다음 페이지는 응답의 search_after를, PIT로 검색하면 pit_id도 그대로 넣어서 요청)
+class ReportSearchRequest(BaseModel):
+    q: Optional[str] = None  # 섹션 제목/본문 검색어 (없으면 최신 공시순)
+    report_types: Optional[List[str]] = None  # rpt_qt, rpt_biz ...
+    doc_codes: Optional[List[str]] = None  # 11013, 11011 ... (DOC_CODE_INDEX_MAP)
+    corp_codes: Optional[List[str]] = None
+    pub_date_from: Optional[str] = Field(None, pattern=r"^\d{8}$")  # yyyyMMdd
+    pub_date_to: Optional[str] = Field(None, pattern=r"^\d{8}$")
+    size: int = Field(10, ge=1, le=100)
+    inner_hits_size: int = Field(3, ge=0, le=10)  # 보고서마다 돌려줄 맞은 섹션 수
+    snippets: int = Field(0, ge=0, le=5)  # 맞은 섹션마다 돌려줄 하이라이트 조각 수 (0이면 조각 없음)
+    snippet_size: int = Field(150, ge=20, le=1000)  # 조각 길이 (글자 수)
+    pit_id: Optional[str] = None
+    search_after: Optional[List[Any]] = None
+    use_pit: bool = False  # 첫 페이지에서 PIT를 열어 모든 페이지를 같은 시점의 결과로 (끝까지 넘기지 않으면 DELETE /search/reports/pit)
+
+
+# 섹션 본문의 하이라이트 조각 (태그 제거, highlights는 text 안에서 맞은 부분의 [시작, 끝) 오프셋)
+class Snippet(BaseModel):
+    text: str
+    highlights: List[List[int]]
+
+
+# 검색에 맞은 섹션 (본문 제외, 전체 본문은 GET /search/reports/{doc_id}/sections/{sec_id})
+# 패시지 검색(SEARCH_SOURCE=passage)이면 맞은 패시지마다 하나이고 passage_id와 섹션 본문 안 위치가 붙음
+# 패시지 본문도 싣지 않으므로 섹션 본문을 따로 받아 sec_content[start:end]로 잘라 씀
+class SectionHit(BaseModel):
+    sec_id: Optional[str] = None
+    sec_title: Optional[str] = None
+    score: Optional[float] = None
+    snippets: List[Snippet] = []
+    passage_id: Optional[str] = None
+    start: Optional[int] = None  # sec_content[start:end]
+    end: Optional[int] = None
+
+
+# 검색된 보고서 (메타데이터 + 맞은 섹션)
+class ReportHit(BaseModel):
+    doc_id: Optional[str] = None
+    doc_name: Optional[str] = None
+    doc_code: Optional[str] = None
+    pub_date: Optional[str] = None
+    corp_code: Optional[str] = None
+    corp_name: Optional[str] = None
+    index: str
+    score: Optional[float] = None
+    sections: List[SectionHit]
+
+
+class ReportSearchResponse(BaseModel):
+    total: Optional[int] = None  # 첫 페이지에서만
+    hits: List[ReportHit]
+    pit_id: Optional[str] = None  # use_pit로 연 PIT (PIT 없이 검색했거나 다음 페이지가 없으면 None)
+    search_after: Optional[List[Any]] = None  # 섹션/패시지 문서 검색이면 [다음 페이지 시작 위치]
+
+
+# 검색 캐시 상태 (hit/miss 등은 응답한 워커 프로세스 기준)
+class SearchCacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    stale: int  # 무효화/만료로 버린 항목
+    evictions: int
+    invalidations: int
+    hit_rate: Optional[float] = None
+    entries: int
+    bytes: int
+
+
+# 섹션 하나 (본문 포함)
+class ReportSection(BaseModel):
+    doc_id: Optional[str] = None
+    doc_name: Optional[str] = None
+    doc_code: Optional[str] = None
+    pub_date: Optional[str] = None
+    corp_code: Optional[str] = None
+    corp_name: Optional[str] = None
+    index: str
+    sec_id: Optional[str] = None
+    sec_title: Optional[str] = None
+    sec_content: Optional[str] = None
+
+
+class PitCloseRequest(BaseModel):
+    pit_id: str
+
+
+# 기업 공시 전체 내보내기 (NDJSON, 섹션마다 한 줄)
+class ReportExportRequest(BaseModel):
+    corp_codes: List[str] = Field(..., min_length=1)
+    report_types: Optional[List[str]] = None
+    doc_codes: Optional[List[str]] = None
+    pub_date_from: Optional[str] = Field(None, pattern=r"^\d{8}$")
+    pub_date_to: Optional[str] = Field(None, pattern=r"^\d{8}$")
+    # 내보낼 필드 (없으면 전체). 섹션 필드(sec_id/sec_title/sec_content)가 없으면 보고서마다 한 줄
+    fields: Optional[List[str]] = None
+    include_tables: bool = True  # False면 sec_content에서 테이블 제외
+    gzip: bool = False
+    page_size: int = Field(20, ge=1, le=100)  # OpenSearch에서 한 번에 읽을 최대 문서 수 (본문은 크기에 맞춰 줄여 읽음)
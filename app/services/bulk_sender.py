@@ -0,0 +1,134 @@
+# bulk_sender.py
+# 바이트 크기 기준으로 청크를 나눠 여러 bulk 요청을 동시에 보내는 OpenSearch 적재기
+# 보고서 하나가 수십 MB일 수 있어 문서 수(chunk_size) 기준 청크는 요청 크기를 제한하지 못한다.
+#
+#   for ok, item in send_bulk(os_client, actions):
+#       ...   # 항목별 결과 (streaming_bulk와 같은 형식)
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from opensearchpy.exceptions import ConnectionTimeout, TransportError
+from opensearchpy.helpers import expand_action
+
+from app.config import settings
+from app.services import profiling
+
+
+def send_bulk(
+    client,
+    actions,
+    max_chunk_bytes=None,
+    max_chunk_docs=None,
+    threads=None,
+    max_retries=None,
+    initial_backoff=None,
+    max_backoff=None,
+):
+    """
+    bulk 액션을 직렬화 크기 기준 청크로 묶어 threads개의 요청을 동시에 보내고
+    액션마다 (성공 여부, {op_type: 응답 항목})을 yield 합니다 (청크가 끝나는 순서).
+
+    - 청크는 max_chunk_bytes 또는 max_chunk_docs에 먼저 도달하면 나뉩니다.
+      max_chunk_bytes보다 큰 문서 하나는 단독 청크로 보냅니다.
+    - 처리 중인 청크가 threads * 2개면 하나가 끝날 때까지 actions를 더 읽지 않아
+      앞 단계(파싱)에 배압이 걸립니다.
+    - HTTP 429(es_rejected_execution 포함)와 요청 타임아웃은 지수 백오프 후
+      실패한 항목만 다시 보냅니다. 나머지 실패는 항목별 에러로 yield 합니다.
+    - 액션의 "_tag" 값(원본 파일 경로 등)은 요청에 넣지 않고 그 액션의 응답 항목에 "_tag"로 붙여 돌려줍니다.
+      청크가 끝나는 순서대로 나오므로 결과를 보낸 액션과 맞출 때 씁니다.
+    인자를 생략하면 settings의 BULK_* 값을 사용합니다.
+    """
+    max_chunk_bytes = max_chunk_bytes or settings.BULK_MAX_CHUNK_BYTES
+    max_chunk_docs = max_chunk_docs or settings.BULK_MAX_CHUNK_DOCS
+    threads = threads or settings.BULK_THREADS
+    retry_options = (
+        settings.BULK_MAX_RETRIES if max_retries is None else max_retries,
+        initial_backoff or settings.BULK_INITIAL_BACKOFF,
+        max_backoff or settings.BULK_MAX_BACKOFF,
+    )
+    max_in_flight = threads * 2
+    serializer = client.transport.serializer
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        in_flight = set()
+        for chunk in _iter_chunks(actions, serializer, max_chunk_bytes, max_chunk_docs):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            in_flight.add(executor.submit(_send_chunk, client, chunk, *retry_options))
+
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _iter_chunks(actions, serializer, max_chunk_bytes, max_chunk_docs):
+    """액션을 직렬화해 (op_type, 메타데이터, 바이트 라인, 태그) 목록의 청크로 묶습니다."""
+    chunk = []
+    size = 0
+    for action in actions:
+        tag = None
+        if "_tag" in action:
+            action = dict(action)
+            tag = action.pop("_tag")
+        meta, data = expand_action(action)
+        line = serializer.dumps(meta).encode("utf-8") + b"\n"
+        if data is not None:
+            line += serializer.dumps(data).encode("utf-8") + b"\n"
+        if chunk and (size + len(line) > max_chunk_bytes or len(chunk) >= max_chunk_docs):
+            yield chunk
+            chunk = []
+            size = 0
+        op_type, op_meta = next(iter(meta.items()))
+        chunk.append((op_type, op_meta, line, tag))
+        size += len(line)
+    if chunk:
+        yield chunk
+
+
+def _send_chunk(client, chunk, max_retries, initial_backoff, max_backoff):
+    """청크 하나를 보내고 항목별 결과 목록을 반환합니다 (워커 스레드에서 실행)."""
+    results = [None] * len(chunk)
+    pending = list(range(len(chunk)))
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            delay = min(max_backoff, initial_backoff * 2 ** (attempt - 1))
+            print(f"Bulk rejected, retrying {len(pending)} items in {delay:.1f}s (attempt {attempt}/{max_retries})")
+            time.sleep(delay)
+        last_attempt = attempt == max_retries
+
+        try:
+            with profiling.stage("bulk_request"):
+                response = client.bulk(body=b"".join(chunk[i][2] for i in pending))
+        except TransportError as e:
+            retryable = e.status_code == 429 or isinstance(e, ConnectionTimeout)
+            if retryable and not last_attempt:
+                continue
+            for i in pending:
+                op_type, op_meta, _, tag = chunk[i]
+                results[i] = (False, _tagged({op_type: {**op_meta, "status": e.status_code, "error": str(e)}}, tag))
+            return results
+
+        retry = []
+        for i, item in zip(pending, response["items"]):
+            info = next(iter(item.values()))
+            status = info.get("status", 500)
+            if status == 429 and not last_attempt:
+                retry.append(i)
+                continue
+            results[i] = (200 <= status < 300, _tagged(item, chunk[i][3]))
+        if not retry:
+            break
+        pending = retry
+    return results
+
+
+def _tagged(item, tag):
+    if tag is None:
+        return item
+    op_type, info = next(iter(item.items()))
+    return {op_type: {**info, "_tag": tag}}
@@ -0,0 +1,185 @@
+# dart_client.py
+# DART OpenAPI 원문 다운로드 클라이언트
+# keep-alive 연결 풀을 공유하는 세션, API 키 단위 전역 요청 속도 제한, 지터를 섞은 재시도를 제공한다.
+#
+#   for rcept_no, zip_data, record, error in iter_documents(rcept_nos):
+#       ...   # 다운로드가 끝나는 순서대로 (다운로드는 스레드에서 계속 진행)
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+from app.services import profiling
+from app.services.zip_cache import get_zip_cache
+
+# 다시 시도할 HTTP 상태 코드
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class DartApiError(Exception):
+    """DART가 ZIP 대신 오류 메시지를 돌려준 경우 (잘못된 키, 한도 초과, 없는 접수번호 등)"""
+
+
+class RateLimiter:
+    """
+    초당 rate건을 넘지 않도록 요청 시작 시각을 배분하는 스레드 안전 속도 제한기
+    burst건까지는 쉬고 있던 만큼 몰아서 보낼 수 있습니다.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.burst = max(1, burst)
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            # 쉬고 있던 시간은 burst건까지만 인정
+            start = max(self._next, now - self.interval * (self.burst - 1))
+            self._next = start + self.interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_session = None
+_rate_limiter = None
+_init_lock = threading.Lock()
+
+
+def get_session():
+    """다운로드 스레드들이 공유하는 keep-alive 세션 (연결 풀 크기 = 동시 다운로드 수)"""
+    global _session
+    with _init_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(1, settings.DART_DOWNLOAD_CONCURRENCY),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def get_rate_limiter():
+    """API 키 한도에 맞춘 프로세스 전역 속도 제한기"""
+    global _rate_limiter
+    with _init_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(settings.DART_RATE_LIMIT_PER_SEC, settings.DART_RATE_LIMIT_BURST)
+        return _rate_limiter
+
+
+def download_document(rcept_no, session=None, rate_limiter=None, base_url=None, api_key=None):
+    """
+    접수번호의 공시 원문 ZIP을 받아 bytes로 반환합니다.
+    연결 오류/타임아웃/429/5xx는 지수 백오프에 지터를 섞어 DART_MAX_RETRIES번까지 다시 시도하고,
+    ZIP이 아닌 응답(DART 오류 메시지)은 DartApiError로 알립니다.
+    """
+    session = session or get_session()
+    rate_limiter = rate_limiter or get_rate_limiter()
+    url = f"{(base_url or settings.DART_API_BASE_URL).rstrip('/')}/document.xml"
+    params = {"crtfc_key": api_key or settings.DART_API_KEY, "rcept_no": rcept_no}
+
+    for attempt in range(settings.DART_MAX_RETRIES + 1):
+        if attempt:
+            # full jitter: 동시에 실패한 요청들이 같은 순간에 다시 몰리지 않게
+            backoff = min(settings.DART_MAX_BACKOFF, settings.DART_INITIAL_BACKOFF * 2 ** (attempt - 1))
+            delay = random.uniform(0, backoff)
+            print(f"Retrying download {rcept_no} in {delay:.1f}s (attempt {attempt}/{settings.DART_MAX_RETRIES})")
+            time.sleep(delay)
+        last_attempt = attempt == settings.DART_MAX_RETRIES
+
+        rate_limiter.acquire()
+        try:
+            response = session.get(url, params=params, timeout=settings.DART_REQUEST_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt:
+                raise
+            continue
+        if response.status_code in _RETRY_STATUS and not last_attempt:
+            continue
+        response.raise_for_status()
+
+        data = response.content
+        if not data.startswith(b"PK"):
+            # 오류는 200 응답에 XML/JSON 메시지로 옴 (예: <status>020</status> 요청 제한 초과)
+            raise DartApiError(f"{rcept_no}: {data[:200].decode('utf-8', 'replace')}")
+        return data
+
+
+def fetch_document(rcept_no, session=None, rate_limiter=None):
+    """
+    원문 ZIP을 ZIP 캐시(DART_ZIP_CACHE_*)를 거쳐 가져옵니다. 캐시에 있으면 네트워크 요청을 하지 않습니다.
+    캐시 사용 여부는 측정 기록의 zip_cache(hit/miss/coalesced)로 남습니다.
+    """
+    cache = get_zip_cache()
+    with profiling.stage("download"):
+        if cache is None:
+            data, source = download_document(rcept_no, session, rate_limiter), "off"
+        else:
+            data, source = cache.fetch(
+                rcept_no, lambda key: download_document(key, session, rate_limiter)
+            )
+    profiling.record(download_bytes=len(data), zip_cache=source)
+    return data
+
+
+def zip_cache_stats():
+    """ZIP 캐시 적중 통계 (캐시를 끄면 None)"""
+    cache = get_zip_cache()
+    return cache.stats() if cache is not None else None
+
+
+def _download_with_profile(rcept_no, session, rate_limiter):
+    # 다운로드 스레드의 측정값은 부모 문서에 합칠 수 있게 기록으로 돌려줌
+    with profiling.document(rcept_no, collect=False) as record:
+        data = fetch_document(rcept_no, session, rate_limiter)
+    return data, record.to_dict() if record is not None else None
+
+
+def iter_documents(rcept_nos, concurrency=None):
+    """
+    접수번호 목록을 concurrency개 스레드로 동시에 내려받아 (rcept_no, zip bytes, 측정 기록, 오류)를
+    끝나는 순서대로 yield 합니다. 실패한 문서는 zip bytes가 None이고 오류가 담깁니다.
+    처리 중인 다운로드는 concurrency * 2개로 제한해, 소비하는 쪽(파싱/적재)이 느리면 다운로드도 멈춥니다.
+    """
+    concurrency = concurrency or settings.DART_DOWNLOAD_CONCURRENCY
+    session = get_session()
+    rate_limiter = get_rate_limiter()
+    max_in_flight = concurrency * 2
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}  # future -> rcept_no
+        rcept_iter = iter(rcept_nos)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                rcept_no = next(rcept_iter, None)
+                if rcept_no is None:
+                    exhausted = True
+                    break
+                pending[executor.submit(_download_with_profile, rcept_no, session, rate_limiter)] = rcept_no
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rcept_no = pending.pop(future)
+                try:
+                    data, record = future.result()
+                except Exception as e:
+                    yield rcept_no, None, None, e
+                else:
+                    yield rcept_no, data, record, None
@@ -1,46 +1,77 @@
 from pydantic import BaseModel, Field, conint
 from typing import List, Optional
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import requests
 
 #압축해제용
 import zipfile
 import io
-from typing import Dict
+import os
+from typing import Any, Dict, Generator
 
 # OpenSearch 클라이언트
-from opensearchpy.helpers import bulk
 from opensearchpy import OpenSearch
 from app.opensearch_client import os_client
+from app.services.bulk_sender import send_bulk
+from app.services.dart_client import fetch_document, get_session, iter_documents, zip_cache_stats
+from app.services.search_cache import invalidate_indices
 
 
 from app.services.parsing.ingest_to_os_from_xml import one_parse_xml
+from app.services import profiling
 
-from app.schemas.report import ReportListResponse
+from app.schemas.report import Report, ReportListResponse
 
 # 환경변수 설정
 from app.config import settings
 MY_API_BASE_URL = settings.MY_API_BASE_URL
 MY_API_CORE_REPORTS = settings.MY_API_CORE_REPORTS
 DART_API_KEY = settings.DART_API_KEY
+profiling.enable_from_settings()
 
 
 
 
 
 
-# 내 기업코드로 api에서 보고서 리스트 가져오기(json형태 안에 있음)
-def fetch_report_data_with_pydantic(code:str): # 테스트용 "01571107"
+# 내 기업코드로 api에서 보고서 리스트 한 페이지 가져오기(json형태 안에 있음)
+def fetch_report_data_with_pydantic(code:str, page_no: int = 1, session=None): # 테스트용 "01571107"
     # 파이썬 f-string 문법으로 수정
     url = MY_API_CORE_REPORTS+f"{code}"
-    response = requests.get(url)
+    response = (session or get_session()).get(
+        url,
+        params={"page_no": page_no, "page_count": settings.MY_API_PAGE_COUNT},
+        timeout=settings.DART_REQUEST_TIMEOUT,
+    )
     response.raise_for_status()
     
     json_data = response.json()
+    if json_data.get("status") == "013":  # 조회된 데이터 없음 (목록/페이지 필드가 빠져서 옴)
+        json_data = {**json_data, "list": [], "page_no": page_no, "page_count": 0, "total_count": 0, "total_page": 0}
     
     # Pydantic 모델을 사용하여 JSON 데이터를 객체로 변환하고 유효성을 검증
     return ReportListResponse(**json_data)
+
+# 기업코드의 보고서 리스트 전체 페이지 가져오기 (첫 페이지로 total_page를 알아낸 뒤 나머지는 동시에)
+def fetch_all_reports(code: str) -> List[Report]:
+    session = get_session()
+    first_page = fetch_report_data_with_pydantic(code, 1, session)
+    pages = [first_page]
+    if first_page.total_page > 1:
+        with ThreadPoolExecutor(max_workers=settings.MY_API_PAGE_CONCURRENCY) as executor:
+            pages += executor.map(
+                lambda page_no: fetch_report_data_with_pydantic(code, page_no, session),
+                range(2, first_page.total_page + 1),
+            )
+
+    # 페이지를 받는 사이에 새 공시가 들어오면 항목이 밀려 중복될 수 있어 접수번호로 중복 제거
+    reports = {}
+    for page in pages:
+        for report in page.list:
+            reports.setdefault(report.rcept_no, report)
+    return list(reports.values())
 """ 아래처럼 가져옴
 {
     "status": "000",
@@ -114,70 +145,144 @@ def fetch_report_data_with_pydantic(code:str): # 테스트용 "01571107"
 # 접수번호로 파일 다운로드(크롬이 아니라 .zip으로 받음)
 def rept_down_by_list(rcept_no: str):
     
-    """접수번호로 파일 다운로드"""
-    url = f"https://opendart.fss.or.kr/api/document.xml?crtfc_key={DART_API_KEY}&rcept_no={rcept_no}"
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.content
+    """접수번호로 파일 다운로드 (ZIP 캐시, 공유 연결 풀, 속도 제한, 재시도는 dart_client)"""
+    return fetch_document(rcept_no)
+
+# ZIP 안의 XML 문서 하나 (본문 또는 첨부). read()/open()을 부를 때 압축을 해제한다.
+class XmlMember:
+    __slots__ = ("file_name", "doc_id", "size", "_zip_file", "_info")
+
+    def __init__(self, zip_file, info):
+        self.file_name = os.path.basename(info.filename)  # 예: 20240813000002_00760.xml (첨부)
+        self.doc_id = self.file_name.split(".")[0]  # 파서가 만드는 doc_id와 같은 규칙
+        self.size = info.file_size
+        self._zip_file = zip_file
+        self._info = info
 
-# 압축 해제 기능(파일을 받아서 압축해제하여 dict로 반환)
-def extract_zip_file_to_dict(zip_data: bytes) -> Dict[str, str]:
+    def open(self):
+        """압축을 풀면서 읽는 스트림"""
+        return self._zip_file.open(self._info)
+
+    def read(self) -> bytes:
+        # 디코딩하지 않고 바이트 그대로 넘김 (인코딩은 파서가 판별, EUC-KR 문서도 처리)
+        with profiling.stage("unzip"):
+            xml_bytes = self._zip_file.read(self._info)
+        profiling.record(xml_bytes=len(xml_bytes))
+        return xml_bytes
+
+    def to_file_dict(self) -> Dict[str, Any]:
+        """one_parse_xml 입력 형식 { "rcept_no": "파일_이름", "content": XML 원문 bytes }"""
+        return {"rcept_no": self.file_name, "content": self.read()}
+
+
+# 압축 해제 기능(ZIP 안의 XML 문서를 하나씩 XmlMember로 yield)
+def iter_zip_xml_members(zip_data: bytes) -> Generator[XmlMember, None, None]:
     """
-    압축 파일을 해제하고 XML 파일의 이름과 내용을 딕셔너리로 반환합니다.
-    { "파일_이름": "XML_내용", ... } 형식입니다.
+    공시 하나의 ZIP에 든 XML 문서(본문 + 첨부)를 이름순으로 하나씩 yield 합니다.
+    압축 해제는 member.read()를 부를 때 하므로 메모리에는 한 번에 문서 하나만 올라갑니다.
+    member는 다음 항목으로 넘어가기 전에 사용해야 합니다 (제너레이터가 끝나면 ZIP이 닫힘).
     """
-    xml_files_dict = {}
-    
     try:
-        zip_buffer = io.BytesIO(zip_data)
-        with zipfile.ZipFile(zip_buffer, 'r') as zip_file:
-            for file_name in zip_file.namelist():
-                # 파일 확장자가 '.xml'인 경우에만 처리
-                if file_name.endswith('.xml'):
-                    with zip_file.open(file_name) as xml_file:
-                        try:
-                            # 파일을 읽고 UTF-8로 디코딩
-                            xml_content = xml_file.read().decode('utf-8')
-                            # 딕셔너리에 파일명을 키로, 내용을 값으로 추가
-                            xml_files_dict["rcept_no"] = file_name
-                            xml_files_dict["content"] = xml_content
-                        except UnicodeDecodeError:
-                            print(f"경고: {file_name} 파일을 UTF-8로 디코딩할 수 없습니다. 건너뜁니다.")
-                            continue
-            
-            return xml_files_dict
-
+        with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_file:
+            infos = [
+                info for info in zip_file.infolist()
+                if not info.is_dir() and info.filename.lower().endswith('.xml')  # XML만 처리
+            ]
+            for info in sorted(infos, key=lambda info: info.filename):
+                yield XmlMember(zip_file, info)
     except zipfile.BadZipFile:
         print("잘못된 ZIP 파일 형식입니다. 바이너리 데이터가 손상되었을 수 있습니다.")
-        return {}
 
-# 접수번호로 XML 파일을 파싱하는 함수
-def parse_xml_content(rcept_no: str) -> Dict:
-    file=rept_down_by_list(rcept_no) # 접수번호로 파일 다운로드
-    unzip_file=extract_zip_file_to_dict(file) # 압축 해제
-    print(unzip_file)
-    
-    try: # XML 파일을 파싱하여 OpenSearch에 적재
-        success, failed = bulk(
-            os_client,
-            one_parse_xml(unzip_file),
-            chunk_size=500,
-            stats_only=True
-        )
+# 다운로드가 끝난 공시부터 문서(ZIP 멤버)마다 압축 해제/파싱해 bulk 액션을 yield (다운로드 스레드와 겹쳐서 실행됨)
+# failed를 주면 다운로드에 실패한 접수번호를 모으고, rcept_by_id에는 bulk _id -> 접수번호를 기록한다.
+# progress를 주면 단계별(downloaded / parsed) 개수와 실패를 알린다.
+def iter_report_actions(rcept_nos, failed=None, rcept_by_id=None, progress=None):
+    for rcept_no, zip_data, download_record, error in iter_documents(rcept_nos):
+        if error is not None:
+            print(f"Failed to download {rcept_no}: {error}")
+            if failed is not None:
+                failed.add(rcept_no)
+            if progress is not None:
+                progress.fail("download", rcept_no, error)
+            continue
+        if progress is not None:
+            progress.add("downloaded")
+        members = 0
+        for member in iter_zip_xml_members(zip_data):
+            members += 1
+            with profiling.document(member.doc_id):
+                profiling.merge(download_record)  # 다운로드 스레드에서 잰 시간 (첫 문서에만)
+                download_record = None
+                print(f"Extracted {member.file_name} ({member.size} bytes) from {rcept_no}")
+                # 파싱과 전송 시간을 나눠 재기 위해 문서 단위로 액션을 먼저 만든다
+                actions = list(one_parse_xml(member.to_file_dict()))
+            if progress is not None:
+                if actions:
+                    progress.add("parsed")
+                else:
+                    progress.fail("parse", member.doc_id, "no valid data parsed")
+            if rcept_by_id is not None:
+                for action in actions:
+                    rcept_by_id[action["_id"]] = rcept_no
+            yield from actions
+        if not members:
+            print(f"Warning: No XML documents in zip for rcept_no '{rcept_no}'.")
+
+
+# 접수번호 목록을 내려받아 파싱하고 OpenSearch에 적재, 성공한 bulk 항목 수 반환
+# 다운로드(스레드 풀) -> 파싱(호출 스레드) -> bulk(전송 스레드)가 파이프라인으로 겹쳐서 진행된다.
+# failed_rcept_nos(set)를 주면 다운로드나 bulk 항목이 하나라도 실패한 접수번호를 모은다 (중간에 중단되면 전부).
+# progress를 주면 단계별 개수(downloaded / parsed / indexed)와 실패를 알린다 (작업 상태 조회용).
+# 끝나면 문서가 들어간 인덱스를 읽은 검색 캐시 결과를 무효화한다.
+def ingest_reports(rcept_nos, failed_rcept_nos=None, progress=None) -> int:
+    success = failed = 0
+    rcept_by_id = None
+    written = set()  # 쓰기가 일어난 인덱스 (검색 캐시 무효화)
+    if failed_rcept_nos is not None:
+        rcept_nos = list(rcept_nos)
+        rcept_by_id = {}
+    try:
+        with profiling.stage("bulk_total"):
+            actions = iter_report_actions(rcept_nos, failed_rcept_nos, rcept_by_id, progress)
+            actions = profiling.iter_stage(actions, "generate_actions")
+            for ok, item in send_bulk(os_client, actions):
+                op_result = next(iter(item.values()))
+                rcept_no = rcept_by_id.pop(op_result.get("_id"), None) if rcept_by_id is not None else None
+                if ok:
+                    success += 1
+                    written.add(op_result.get("_index"))
+                    if progress is not None:
+                        progress.add("indexed")
+                else:
+                    failed += 1
+                    print(f"Failed to index {op_result.get('_id')}: {op_result.get('error')}")
+                    if rcept_no is not None:
+                        failed_rcept_nos.add(rcept_no)
+                    if progress is not None:
+                        progress.fail("bulk", op_result.get("_id"), op_result.get("error"))
         print(f"Bulk ingestion completed. Succeeded: {success}, Failed: {failed}")
     except Exception as e:
         print(f"An error occurred during bulk ingestion: {e}")
-    
+        if progress is not None:
+            progress.fail("bulk", None, e)
+        if failed_rcept_nos is not None:
+            failed_rcept_nos.update(rcept_nos)
+    invalidate_indices(written)
     return success
 
+# 접수번호로 XML 파일을 파싱하는 함수
+def parse_xml_content(rcept_no: str) -> int:
+    return ingest_reports([rcept_no])
+
 # 기업코드로 보고서 리스트를 가져오고, 리스트 내의 보고서들을 접수번호로 XML 파일을 다운로드 및 파싱하는 테스트 함수 성공 수만큼 반환
 def repots_by_corp_code_parse_xml(corp_code: str):
-    report_list = fetch_report_data_with_pydantic(corp_code).list
+    report_list = fetch_all_reports(corp_code)
     
-    success_count = 0
+    # 각 보고서의 접수번호로 XML 파일을 동시에 다운로드하고 파싱/적재
+    success_count = ingest_reports(report.rcept_no for report in report_list)
     
-    for report in report_list:
-        success_count += parse_xml_content(report.rcept_no)  # 각 보고서의 접수번호로 XML 파일을 다운로드 및 파싱
+    profiling.report(reset=True)  # 측정이 켜져 있을 때만 출력
+    print(f"DART zip cache: {zip_cache_stats()}")
         
     return "sueccess: " + str(success_count)
         
@@ -0,0 +1,165 @@
+# filing_sync.py
+# 기업별 공시 목록 증분 동기화
+# 기업마다 마지막으로 적재한 접수번호(watermark)를 기록해 두고, 다음 실행에서는
+# watermark 이후 공시와 인덱스에 빠져 있는 공시만 내려받아 적재한다.
+#
+#   summary = sync_corps(["00126380", "01571107"])
+
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.models.parsing_schemas import REPORT_ALIASES, section_alias
+from app.opensearch_client import os_client
+from app.services import profiling
+from app.services.dart_service import fetch_all_reports, ingest_reports, zip_cache_stats
+
+# 한 번의 terms 집계로 확인할 doc_id 수 (terms 쿼리 기본 한도 65536보다 작게)
+_LOOKUP_BATCH = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS corp_watermarks (
+    corp_code  TEXT PRIMARY KEY,
+    rcept_no   TEXT,
+    rcept_dt   TEXT,
+    updated_at REAL
+);
+"""
+
+
+class FilingWatermarks:
+    """기업별 마지막 적재 접수번호 저장소 (SQLite). 접수번호는 접수일자로 시작해 문자열 비교가 곧 시간 순서입니다."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # 기업 목록 조회 스레드에서도 읽으므로 스레드 검사를 끄고 쓰기는 호출 스레드에서만 함
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def get(self, corp_code):
+        row = self.conn.execute("SELECT rcept_no FROM corp_watermarks WHERE corp_code = ?", (corp_code,)).fetchone()
+        return row[0] if row else None
+
+    def advance(self, corp_code, rcept_no, rcept_dt):
+        """watermark를 앞으로만 옮깁니다."""
+        self.conn.execute(
+            """
+            INSERT INTO corp_watermarks (corp_code, rcept_no, rcept_dt, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(corp_code) DO UPDATE SET
+                rcept_no = excluded.rcept_no, rcept_dt = excluded.rcept_dt, updated_at = excluded.updated_at
+            WHERE excluded.rcept_no > corp_watermarks.rcept_no
+            """,
+            (corp_code, rcept_no, rcept_dt, time.time()),
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def indexed_doc_ids(doc_ids):
+    """
+    doc_ids 중 보고서/섹션 인덱스에 이미 있는 것의 집합
+    공시마다 검색하지 않고 _LOOKUP_BATCH개씩 terms 집계 한 번으로 확인합니다.
+    """
+    doc_ids = list(doc_ids)
+    indices = ",".join(REPORT_ALIASES + [section_alias(alias) for alias in REPORT_ALIASES])
+    found = set()
+    for start in range(0, len(doc_ids), _LOOKUP_BATCH):
+        batch = doc_ids[start:start + _LOOKUP_BATCH]
+        response = os_client.search(
+            index=indices,
+            body={
+                "size": 0,
+                "query": {"terms": {"doc_id": batch}},
+                # 섹션 단위 문서는 doc_id 하나에 여러 개라 집계로 중복 제거
+                "aggs": {"doc_ids": {"terms": {"field": "doc_id", "size": len(batch)}}},
+            },
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        found.update(bucket["key"] for bucket in response["aggregations"]["doc_ids"]["buckets"])
+    return found
+
+
+def plan_corp_sync(corp_code, watermark, check_index=True, force=False):
+    """
+    기업의 전체 공시 목록을 받아 적재할 공시를 고릅니다. (전체 목록, 적재할 목록)을 반환합니다.
+    - watermark 이후 공시는 모두 적재
+    - watermark 이전(또는 watermark가 없을 때 전체) 공시는 인덱스에 없는 것만 적재
+      check_index=False면 watermark 이전 공시는 있다고 보고 건너뜀 (watermark가 없으면 전체 적재)
+    - force=True면 전체 공시를 다시 적재 (매핑 변경 후 재적재, 원문은 ZIP 캐시에서 읽음)
+    """
+    reports = fetch_all_reports(corp_code)
+    if force:
+        return reports, sorted(reports, key=lambda report: report.rcept_no)
+    newer = [report for report in reports if watermark and report.rcept_no > watermark]
+    older = [report for report in reports if not watermark or report.rcept_no <= watermark]
+    if not older:
+        missing = []
+    elif check_index:
+        existing = indexed_doc_ids(report.rcept_no for report in older)
+        missing = [report for report in older if report.rcept_no not in existing]
+    else:
+        missing = older if not watermark else []
+    return reports, sorted(newer + missing, key=lambda report: report.rcept_no)
+
+
+def sync_corps(corp_codes, check_index=True, force=False, progress=None):
+    """
+    여러 기업의 공시 목록을 동시에 받아 새 공시만 한 파이프라인으로 적재하고 기업별 watermark를 갱신합니다.
+    실패한 공시는 watermark를 넘겨도 다음 실행의 인덱스 확인에서 다시 잡힙니다.
+    progress(add(단계, 개수) / fail(단계, 키, 오류))를 주면 단계별 진행 상황을 알립니다.
+    기업별 {"total", "queued", "failed", "watermark"} 요약을 반환합니다.
+    """
+    corp_codes = list(dict.fromkeys(corp_codes))
+    watermarks = FilingWatermarks(settings.FILING_SYNC_STATE_PATH)
+    summary = {}
+    try:
+        with ThreadPoolExecutor(max_workers=settings.MY_API_PAGE_CONCURRENCY) as executor:
+            plans = executor.map(
+                lambda corp_code: plan_corp_sync(corp_code, watermarks.get(corp_code), check_index, force),
+                corp_codes,
+            )
+            plans = dict(zip(corp_codes, plans))
+
+        queue = [report.rcept_no for _, todo in plans.values() for report in todo]
+        print(f"Syncing {len(corp_codes)} corps: {len(queue)} filings to ingest")
+        if progress is not None:
+            progress.add("listed", sum(len(reports) for reports, _ in plans.values()))
+            progress.add("queued", len(queue))
+        failed = set()
+        if queue:
+            ingest_reports(queue, failed, progress)
+
+        for corp_code, (reports, todo) in plans.items():
+            # 실패한 공시를 뺀 나머지는 모두 인덱스에 있음 (이번에 적재했거나 원래 있었음)
+            done = [report for report in reports if report.rcept_no not in failed]
+            if done:
+                latest = max(done, key=lambda report: report.rcept_no)
+                watermarks.advance(corp_code, latest.rcept_no, latest.rcept_dt)
+            summary[corp_code] = {
+                "total": len(reports),
+                "queued": len(todo),
+                "failed": sum(report.rcept_no in failed for report in todo),
+                "watermark": watermarks.get(corp_code),
+            }
+        watermarks.commit()
+    finally:
+        watermarks.close()
+
+    profiling.report(reset=True)  # 측정이 켜져 있을 때만 출력
+    print(f"DART zip cache: {zip_cache_stats()}")
+    return summary
+
+
+def sync_corp(corp_code, check_index=True):
+    return sync_corps([corp_code], check_index)[corp_code]
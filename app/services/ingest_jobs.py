@@ -0,0 +1,291 @@
+# ingest_jobs.py
+# 기업 공시 적재 작업 큐
+# API 요청은 작업을 큐에 넣고 작업 ID만 바로 돌려준다. 정해진 수의 워커 스레드가 작업을 꺼내
+# filing_sync.sync_corps로 실행하고, 상태 조회 API는 단계별 개수와 실패 목록을 보여 준다.
+# 같은 기업이 이미 대기/실행 중인 작업에 있으면 새로 넣지 않고 기존 작업 ID를 알려 준다 (기업 단위 중복 제거).
+# INGEST_JOBS_DB_PATH를 주면 작업을 SQLite에 기록해 재시작 후 대기/실행 중이던 작업을 다시 실행한다.
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+from app.config import settings
+from app.services.filing_sync import sync_corps
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+_ACTIVE = (QUEUED, RUNNING)
+
+# 작업마다 보관할 실패 항목 수 (전체 실패 수는 따로 셈)
+_MAX_FAILURES = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    job_id      TEXT PRIMARY KEY,
+    payload     TEXT,   -- IngestJob.to_dict() JSON
+    status      TEXT,
+    created_at  REAL
+);
+CREATE INDEX IF NOT EXISTS ingest_jobs_status ON ingest_jobs (status);
+"""
+
+
+class IngestJob:
+    """적재 작업 하나의 요청 내용과 진행 상황. sync_corps의 progress로 넘겨 단계별 개수를 받습니다."""
+
+    def __init__(self, corp_codes, check_index=True, force=False, job_id=None):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.corp_codes = list(corp_codes)
+        self.check_index = check_index
+        self.force = force
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.counts = {}  # 단계 -> 개수 (listed / queued / downloaded / parsed / indexed)
+        self.failure_count = 0
+        self.failures = []  # 최근 _MAX_FAILURES개 {"stage", "key", "error"}
+        self.error = None
+        self.summary = None  # 기업별 sync_corps 결과
+        self._lock = threading.Lock()
+
+    def add(self, stage, count=1):
+        with self._lock:
+            self.counts[stage] = self.counts.get(stage, 0) + count
+
+    def fail(self, stage, key, error):
+        with self._lock:
+            self.failure_count += 1
+            self.counts[f"{stage}_failed"] = self.counts.get(f"{stage}_failed", 0) + 1
+            self.failures.append({"stage": stage, "key": key, "error": str(error)[:500]})
+            del self.failures[:-_MAX_FAILURES]
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "corp_codes": self.corp_codes,
+                "check_index": self.check_index,
+                "force": self.force,
+                "status": self.status,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "counts": dict(self.counts),
+                "failure_count": self.failure_count,
+                "failures": list(self.failures),
+                "error": self.error,
+                "summary": self.summary,
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data["corp_codes"], data["check_index"], data["force"], data["job_id"])
+        job.status = data["status"]
+        job.created_at = data["created_at"]
+        job.started_at = data["started_at"]
+        job.finished_at = data["finished_at"]
+        job.counts = data["counts"]
+        job.failure_count = data["failure_count"]
+        job.failures = data["failures"]
+        job.error = data["error"]
+        job.summary = data["summary"]
+        return job
+
+
+class JobStore:
+    """작업 기록 SQLite 저장소 (여러 워커 스레드에서 쓰므로 연결 하나를 잠금으로 보호)"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def save(self, job):
+        data = job.to_dict()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ingest_jobs (job_id, payload, status, created_at) VALUES (?, ?, ?, ?)",
+                (job.job_id, json.dumps(data, ensure_ascii=False, default=str), data["status"], data["created_at"]),
+            )
+            self.conn.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self.conn.execute("SELECT payload FROM ingest_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return IngestJob.from_dict(json.loads(row[0])) if row else None
+
+    def load_active(self):
+        """대기/실행 중이던 작업 (생성 순)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT payload FROM ingest_jobs WHERE status IN (?, ?) ORDER BY created_at", _ACTIVE
+            ).fetchall()
+        return [IngestJob.from_dict(json.loads(row[0])) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class JobManager:
+    """
+    적재 작업 큐와 워커 스레드 풀
+        manager = JobManager(workers=2, store_path=".cache/ingest_jobs.sqlite3")
+        manager.start()
+        job, deduplicated = manager.submit(["00126380"])
+    """
+
+    def __init__(self, workers=2, store_path=None, keep_finished=200):
+        self.workers = workers
+        self.keep_finished = keep_finished
+        self.store = JobStore(store_path) if store_path else None
+        self._queue = queue.Queue()
+        self._jobs = {}  # job_id -> IngestJob (생성 순)
+        self._active_corps = {}  # 대기/실행 중인 기업 -> job_id
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        """저장소에 남아 있던 대기/실행 중 작업을 다시 넣고 워커를 시작합니다."""
+        if self._threads:
+            return
+        if self.store is not None:
+            for job in self.store.load_active():
+                # 실행 중이던 작업은 처음부터 다시 (watermark/인덱스 확인으로 끝난 공시는 건너뜀)
+                job.status = QUEUED
+                job.started_at = None
+                self._register(job)
+                print(f"Restored ingest job {job.job_id} ({len(job.corp_codes)} corps)")
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"ingest-job-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """새 작업을 더 꺼내지 않고 워커를 멈춥니다. 실행 중인 작업은 끝날 때까지 기다립니다 (timeout초까지)."""
+        self._stopping = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        running = [thread.name for thread in self._threads if thread.is_alive()]
+        self._threads = []
+        if running:
+            # 실행 중인 작업이 끝나면 최종 상태를 저장해야 하므로 저장소를 열어 둠 (프로세스 종료 시 닫힘)
+            print(f"Warning: ingest job workers still running after {timeout}s: {', '.join(running)}")
+        elif self.store is not None:
+            self.store.close()
+
+    def submit(self, corp_codes, check_index=True, force=False):
+        """
+        작업을 큐에 넣고 (작업, 중복 제거된 기업 -> 기존 job_id)를 반환합니다.
+        모든 기업이 이미 다른 작업에 있으면 새 작업을 만들지 않고 그 작업을 반환합니다.
+        """
+        corp_codes = list(dict.fromkeys(corp_codes))
+        with self._lock:
+            deduplicated = {code: self._active_corps[code] for code in corp_codes if code in self._active_corps}
+            new_codes = [code for code in corp_codes if code not in deduplicated]
+            if not new_codes:
+                return self._jobs[next(iter(deduplicated.values()))], deduplicated
+            job = IngestJob(new_codes, check_index, force)
+            self._register(job)
+        return job, deduplicated
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get(job_id)
+        return job
+
+    def list(self, limit=50):
+        """최근 작업부터"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return jobs[::-1][:limit]
+
+    def _register(self, job):
+        # 호출하는 쪽에서 self._lock을 잡고 있거나 워커 시작 전
+        self._jobs[job.job_id] = job
+        for code in job.corp_codes:
+            self._active_corps[code] = job.job_id
+        if self.store is not None:
+            self.store.save(job)
+        self._queue.put(job)
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None or self._stopping:
+                return
+            self._run(job)
+
+    def _run(self, job):
+        job.status = RUNNING
+        job.started_at = time.time()
+        if self.store is not None:
+            self.store.save(job)
+        print(f"Ingest job {job.job_id} started: {len(job.corp_codes)} corps")
+        try:
+            job.summary = sync_corps(job.corp_codes, job.check_index, job.force, progress=job)
+            job.status = DONE
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = FAILED
+        job.finished_at = time.time()
+        print(f"Ingest job {job.job_id} {job.status} in {job.finished_at - job.started_at:.1f}s: {job.counts}")
+
+        with self._lock:
+            for code in job.corp_codes:
+                if self._active_corps.get(code) == job.job_id:
+                    del self._active_corps[code]
+            self._trim_finished()
+        if self.store is not None:
+            self.store.save(job)
+
+    def _trim_finished(self):
+        """끝난 작업은 최근 keep_finished개만 메모리에 둠 (나머지는 저장소에서 조회)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in _ACTIVE]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """설정에 따른 프로세스별 작업 관리자 (처음 부를 때 워커 시작)"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager(
+                workers=settings.INGEST_JOB_WORKERS,
+                store_path=settings.INGEST_JOBS_DB_PATH or None,
+                keep_finished=settings.INGEST_JOBS_KEEP_FINISHED,
+            )
+            _job_manager.start()
+        return _job_manager
+
+
+def shutdown_job_manager(timeout=None):
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is not None:
+            _job_manager.stop(timeout)
+            _job_manager = None
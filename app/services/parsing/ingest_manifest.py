@@ -0,0 +1,185 @@
+# ingest_manifest.py
+# 디렉터리 인제스트 체크포인트 (SQLite)
+# 파일별 내용 해시, 파싱 결과, 대상 인덱스, bulk 결과를 기록해 두고
+# 다시 실행하면 이미 성공한 문서는 건너뛰고 실패했거나 내용이 바뀐 문서만 처리한다.
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import time
+
+# 이 수만큼 기록이 쌓이면 커밋 (중간에 죽어도 최대 이만큼만 다시 처리)
+_COMMIT_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    file_path    TEXT PRIMARY KEY,
+    doc_id       TEXT,
+    content_hash TEXT,
+    size         INTEGER,
+    mtime_ns     INTEGER,
+    parse_status TEXT,   -- parsed / failed
+    target_index TEXT,
+    bulk_status  TEXT,   -- pending / success / failed
+    pending_actions INTEGER,  -- 응답을 기다리는 bulk 액션 수 (섹션 단위 색인은 문서당 여러 개)
+    error        TEXT,
+    updated_at   REAL
+);
+CREATE INDEX IF NOT EXISTS documents_doc_id ON documents (doc_id);
+"""
+
+
+def file_content_hash(file_path):
+    """파일 내용의 SHA-256 (mmap으로 읽어 복사본을 만들지 않음)"""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+    return hasher.hexdigest()
+
+
+class IngestManifest:
+    """
+    인제스트 체크포인트 매니페스트입니다. 부모 프로세스에서만 사용합니다 (워커는 해시만 계산).
+
+    - is_done(): 크기/수정 시각이 기록과 같고 bulk까지 성공한 파일이면 True (해시 계산 없이 건너뜀)
+    - success_hash(): 파일이 바뀐 것 같을 때 비교할 마지막 성공 해시
+    - record_parse() / record_unchanged() / record_bulk(): 처리 결과 기록
+    - high_water_mark() / unfinished_files(): 감시 모드 시작 시 따라잡을 범위
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(documents)")}
+        if "pending_actions" not in columns:  # 이전 버전 매니페스트
+            self.conn.execute("ALTER TABLE documents ADD COLUMN pending_actions INTEGER")
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def is_done(self, file_path):
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, bulk_status FROM documents WHERE file_path = ?", (file_path,)
+        ).fetchone()
+        if row is None or row[2] != "success":
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return row[0] == stat.st_size and row[1] == stat.st_mtime_ns
+
+    def success_hash(self, file_path):
+        row = self.conn.execute(
+            "SELECT content_hash FROM documents WHERE file_path = ? AND bulk_status = 'success'", (file_path,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def record_parse(self, file_path, doc_id, content_hash, size, mtime_ns, target_index=None, error=None,
+                     action_count=1):
+        """
+        파싱 결과 기록. 성공이면 action_count개의 bulk 결과를 기다리는 pending 상태가 됩니다.
+        보낼 액션이 없으면(섹션이 없는 문서) 바로 성공으로 기록합니다.
+        """
+        if error:
+            bulk_status = None
+        else:
+            bulk_status = "pending" if action_count else "success"
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO documents
+                (file_path, doc_id, content_hash, size, mtime_ns, parse_status, target_index, bulk_status,
+                 pending_actions, error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                file_path, doc_id, content_hash, size, mtime_ns,
+                "failed" if error else "parsed",
+                target_index,
+                bulk_status,
+                action_count,
+                error,
+                time.time(),
+            ),
+        )
+        self._maybe_commit()
+
+    def record_unchanged(self, file_path, size, mtime_ns):
+        """내용은 같고 수정 시각만 바뀐 파일: 다음 실행부터 해시 없이 건너뛰도록 stat만 갱신"""
+        self.conn.execute(
+            "UPDATE documents SET size = ?, mtime_ns = ?, updated_at = ? WHERE file_path = ?",
+            (size, mtime_ns, time.time(), file_path),
+        )
+        self._maybe_commit()
+
+    def record_bulk(self, file_path, ok, error=None):
+        """
+        bulk 응답 항목 하나의 결과를 그 액션을 만든 파일(pending 상태)에 기록
+        모든 액션이 성공해야 success가 되고, 하나라도 실패하면 failed가 됩니다.
+        """
+        if ok:
+            self.conn.execute(
+                """
+                UPDATE documents
+                SET pending_actions = pending_actions - 1,
+                    bulk_status = CASE WHEN pending_actions <= 1 THEN 'success' ELSE bulk_status END,
+                    updated_at = ?
+                WHERE file_path = ? AND bulk_status = 'pending'
+                """,
+                (time.time(), file_path),
+            )
+        else:
+            self.conn.execute(
+                """
+                UPDATE documents SET bulk_status = 'failed', error = ?, updated_at = ?
+                WHERE file_path = ? AND bulk_status = 'pending'
+                """,
+                (str(error)[:2000], time.time(), file_path),
+            )
+        self._maybe_commit()
+
+    def high_water_mark(self):
+        """적재에 성공한 문서 중 가장 큰 접수번호(14자리 doc_id). 없으면 None"""
+        row = self.conn.execute(
+            """
+            SELECT MAX(doc_id) FROM documents
+            WHERE bulk_status = 'success' AND length(doc_id) = 14 AND doc_id NOT GLOB '*[^0-9]*'
+            """
+        ).fetchone()
+        return row[0]
+
+    def unfinished_files(self):
+        """파싱 또는 bulk가 실패했거나 결과를 받지 못한 파일 경로 목록 (다시 처리할 대상)"""
+        rows = self.conn.execute(
+            """
+            SELECT file_path FROM documents
+            WHERE parse_status = 'failed' OR bulk_status IN ('pending', 'failed')
+            """
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def summary(self):
+        rows = self.conn.execute(
+            "SELECT parse_status, bulk_status, COUNT(*) FROM documents GROUP BY parse_status, bulk_status"
+        ).fetchall()
+        return {f"{parse_status}/{bulk_status}": count for parse_status, bulk_status, count in rows}
+
+    def commit(self):
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def _maybe_commit(self):
+        self._uncommitted += 1
+        if self._uncommitted >= _COMMIT_EVERY:
+            self.commit()
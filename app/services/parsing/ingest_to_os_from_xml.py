@@ -1,17 +1,39 @@
 # ingest_to_os.py  (기존 ingest_to_es.py 대체)
 
 import os
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
-from .parse_xml import parse_darter_xml
-import codecs
+from opensearchpy.exceptions import RequestError
+from .ingest_manifest import IngestManifest, file_content_hash
+from .parse_cache import parse_content_cached, parse_file_cached
+from .passages import build_passages
 
+from app.config import settings
 from app.opensearch_client import os_client
+from app.services import profiling
+from app.services.bulk_sender import send_bulk
+from app.services.search_cache import invalidate_indices
 
 from typing import Dict, Any, Generator
 
 # 파싱 데이터 OpenSearch 인덱스 매핑 정의
-from app.models.parsing_schemas import INDEX_MAPPINGS
+from app.models.parsing_schemas import (
+    PASSAGE_COMPONENT_TEMPLATE,
+    PASSAGE_INDEX_MAPPINGS,
+    REPORT_ALIASES,
+    REPORT_COMPONENT_TEMPLATE,
+    REPORT_INDEX_SETTINGS,
+    SECTION_COMPONENT_TEMPLATE,
+    SECTION_INDEX_MAPPINGS,
+    UNKNOWN_PARTITION,
+    component_template_body,
+    index_template_body,
+    partition_index_name,
+    passage_alias,
+    section_alias,
+)
 
 DOC_CODE_INDEX_MAP = {
     "11013": "rpt_qt", # 분기보고서
@@ -26,67 +48,470 @@ DOC_CODE_INDEX_MAP = {
 
 
 def create_indices():
-    """사전 정의 인덱스 생성(있으면 skip)"""
-    for index_name, mapping in INDEX_MAPPINGS.items():
-        if not os_client.indices.exists(index=index_name):
-            print(f"Creating index '{index_name}' with mapping...")
-            body = {
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 0,
-                    **mapping.get("settings", {}),
-                },
-                "mappings": mapping.get("mappings", {}),
-            }
-            os_client.indices.create(index=index_name, body=body)
-        else:
-            print(f"Index '{index_name}' already exists.")
+    """
+    보고서 인덱스 템플릿 등록 (공통 component template + 보고서 종류별 index template)
+    연도별 인덱스("{alias}-{연도}")는 첫 문서가 들어올 때 템플릿으로 만들어지고 읽기 alias가 붙습니다.
+    섹션 단위 문서용("{alias}_sec-{연도}")과 패시지 문서용("{alias}_psg-{연도}") 템플릿도 함께 등록합니다.
+    """
+    print(
+        f"Putting component templates '{REPORT_COMPONENT_TEMPLATE}', '{SECTION_COMPONENT_TEMPLATE}', "
+        f"'{PASSAGE_COMPONENT_TEMPLATE}'..."
+    )
+    os_client.cluster.put_component_template(name=REPORT_COMPONENT_TEMPLATE, body=component_template_body())
+    os_client.cluster.put_component_template(
+        name=SECTION_COMPONENT_TEMPLATE, body=component_template_body(SECTION_INDEX_MAPPINGS)
+    )
+    os_client.cluster.put_component_template(
+        name=PASSAGE_COMPONENT_TEMPLATE, body=component_template_body(PASSAGE_INDEX_MAPPINGS)
+    )
+    for alias in REPORT_ALIASES:
+        os_client.indices.put_index_template(
+            name=section_alias(alias),
+            body=index_template_body(section_alias(alias), SECTION_COMPONENT_TEMPLATE),
+        )
+        os_client.indices.put_index_template(
+            name=passage_alias(alias),
+            body=index_template_body(passage_alias(alias), PASSAGE_COMPONENT_TEMPLATE),
+        )
+        os_client.indices.put_index_template(name=alias, body=index_template_body(alias))
+        if os_client.indices.exists(index=alias) and not os_client.indices.exists_alias(name=alias):
+            # alias와 같은 이름의 이전 단일 인덱스가 있으면 alias를 만들 수 없음
+            print(
+                f"Warning: '{alias}'는 이전 단일 인덱스입니다. "
+                f"migrate_legacy_index('{alias}', delete_source=True)로 연도별 인덱스로 옮기세요."
+            )
+
+
+def migrate_legacy_index(alias, delete_source=False):
+    """
+    이전 단일 인덱스(alias와 같은 이름)의 문서를 pub_date 연도별 인덱스로 reindex 합니다.
+    delete_source=True면 reindex 후 이전 인덱스를 지우고 같은 이름의 읽기 alias를 연도별 인덱스에 붙입니다.
+    """
+    print(f"Reindexing '{alias}' into yearly partitions...")
+    response = os_client.reindex(
+        body={
+            "source": {"index": alias},
+            "dest": {"index": f"{alias}-{UNKNOWN_PARTITION}"},
+            "script": {
+                "lang": "painless",
+                "source": (
+                    "String d = ctx._source.pub_date;"
+                    "ctx._index = params.alias + '-' + "
+                    "(d != null && d.length() >= 4 ? d.substring(0, 4) : params.unknown);"
+                ),
+                "params": {"alias": alias, "unknown": UNKNOWN_PARTITION},
+            },
+        },
+        wait_for_completion=True,
+        request_timeout=settings.INGEST_FORCE_MERGE_TIMEOUT,
+    )
+    failures = response.get("failures") or []
+    print(f"Reindexed {response.get('total', 0)} documents ({len(failures)} failures)")
+    if failures or not delete_source:
+        return response
+
+    os_client.indices.delete(index=alias)
+    os_client.indices.put_alias(index=f"{alias}-*", name=alias)
+    print(f"Deleted legacy index '{alias}' and added read alias over '{alias}-*'")
+    return response
+
+
+# 벌크 적재 모드에서 바꾸는 인덱스 설정과 적재 중 값
+BULK_LOAD_SETTINGS = {
+    "refresh_interval": "-1",
+    "number_of_replicas": "0",
+    "translog.durability": "async",
+}
+
+# 적재 중 새로 만든 인덱스를 되돌릴 값 (템플릿 설정, None은 기본값)
+_TEMPLATE_RESTORE_SETTINGS = {
+    "refresh_interval": None,
+    "number_of_replicas": str(REPORT_INDEX_SETTINGS["number_of_replicas"]),
+    "translog.durability": None,
+}
+
+
+class BulkLoadMode:
+    """
+    대량 적재 동안 refresh를 끄고 replica/translog 내구성을 낮췄다가, 끝나면(실패해도) 원래 설정으로 되돌립니다.
+    적재 중 처음 보는 연도별 인덱스는 ensure_index()가 적재 모드 설정으로 미리 만듭니다.
+    force_merge_segments를 주면 성공적으로 끝난 뒤 touched에 모인 인덱스를 그 세그먼트 수까지 force merge 합니다.
+
+        with BulkLoadMode(["rpt_qt-*"], force_merge_segments=1) as load_mode:
+            for action in actions:
+                load_mode.ensure_index(action["_index"])
+                ...
+                load_mode.touched.add(index_name)
+    """
+
+    def __init__(self, index_patterns, force_merge_segments=None):
+        self.index_patterns = index_patterns
+        self.force_merge_segments = force_merge_segments
+        self.original = {}  # 인덱스 -> 복구할 설정
+        self.touched = set()
+
+    def __enter__(self):
+        try:
+            existing = os_client.indices.get_settings(
+                index=",".join(self.index_patterns), flat_settings=True, allow_no_indices=True
+            )
+            for index_name, data in existing.items():
+                self._apply(index_name, data.get("settings", {}))
+        except Exception:
+            self._restore()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._restore()
+        if exc_type is None and self.force_merge_segments:
+            self._force_merge()
+        return False
+
+    def ensure_index(self, index_name):
+        """적재 대상 인덱스가 처음 나오면 적재 모드 설정을 적용 (없으면 그 설정으로 생성)"""
+        if index_name in self.original:
+            return
+        try:
+            os_client.indices.create(index=index_name, body={"settings": {"index": BULK_LOAD_SETTINGS}})
+            self.original[index_name] = dict(_TEMPLATE_RESTORE_SETTINGS)
+            print(f"Created '{index_name}' in bulk-load mode")
+        except RequestError as e:
+            if e.error != "resource_already_exists_exception":
+                raise
+            index_settings = (
+                os_client.indices.get_settings(index=index_name, flat_settings=True)
+                .get(index_name, {})
+                .get("settings", {})
+            )
+            self._apply(index_name, index_settings)
+
+    def _apply(self, index_name, index_settings):
+        # 설정되지 않은 값은 None으로 되돌려 기본값으로 복구
+        self.original[index_name] = {key: index_settings.get(f"index.{key}") for key in BULK_LOAD_SETTINGS}
+        print(f"Bulk-load mode on for '{index_name}' (saved: {self.original[index_name]})")
+        os_client.indices.put_settings(index=index_name, body={"index": BULK_LOAD_SETTINGS})
+
+    def _restore(self):
+        for index_name, index_settings in self.original.items():
+            try:
+                os_client.indices.put_settings(index=index_name, body={"index": index_settings})
+                os_client.indices.refresh(index=index_name)
+                print(f"Bulk-load mode off for '{index_name}' (restored)")
+            except Exception as e:
+                print(f"Error: '{index_name}' 인덱스 설정 복구 실패, 수동 확인 필요 ({index_settings}): {e}")
+        self.original = {}
+
+    def _force_merge(self):
+        for index_name in sorted(self.touched):
+            print(f"Force merging '{index_name}' to {self.force_merge_segments} segment(s)...")
+            try:
+                os_client.indices.forcemerge(
+                    index=index_name,
+                    max_num_segments=self.force_merge_segments,
+                    request_timeout=settings.INGEST_FORCE_MERGE_TIMEOUT,
+                )
+            except Exception as e:
+                print(f"Warning: '{index_name}' force merge 실패: {e}")
+
+
+def build_actions(parsed_data):
+    """
+    INGEST_INDEX_MODE에 따라 파싱 결과 하나의 bulk 액션 목록을 만듭니다.
+    report: 보고서 문서 하나 (섹션은 nested), section: 섹션별 문서, both: 둘 다
+    PASSAGE_CHUNKING_ENABLED면 어느 모드든 패시지 문서도 함께 만듭니다.
+    """
+    mode = settings.INGEST_INDEX_MODE
+    actions = []
+    if mode in ("report", "both"):
+        actions.append(build_action(parsed_data))
+    if mode in ("section", "both"):
+        actions.extend(build_section_actions(parsed_data))
+    if settings.PASSAGE_CHUNKING_ENABLED:
+        with profiling.stage("passages"):
+            actions.extend(build_passage_actions(parsed_data, settings.PASSAGE_MAX_CHARS))
+    return actions
+
+
+def build_section_actions(parsed_data):
+    """
+    섹션마다 보고서 메타데이터를 복제한 독립 문서로 만드는 bulk 액션 목록
+    _id는 "{doc_id}_{sec_id}"라 같은 섹션을 다시 넣으면 덮어쓰고(부분 갱신),
+    corp_code로 라우팅해 같은 회사의 섹션은 같은 샤드에 모읍니다.
+    """
+    doc_code = parsed_data.get("doc_code", "99999")
+    alias = section_alias(DOC_CODE_INDEX_MAP.get(doc_code, "rpt_other"))
+    target_index = partition_index_name(alias, parsed_data.get("pub_date"))
+    report_fields = {key: value for key, value in parsed_data.items() if key != "sections"}
+    routing = parsed_data.get("corp_code") or parsed_data["doc_id"]
+
+    return [
+        {
+            "_index": target_index,
+            "_id": f"{parsed_data['doc_id']}_{section['sec_id']}",
+            "_routing": routing,
+            "_source": {**report_fields, **section},
+        }
+        for section in parsed_data.get("sections", [])
+    ]
+
+
+def build_passage_actions(parsed_data, max_chars):
+    """
+    섹션 본문을 나눈 패시지마다 보고서 메타데이터를 복제한 문서로 만드는 bulk 액션 목록 (rpt_*_psg)
+    _id는 passage_id, 라우팅은 섹션 문서와 같이 corp_code
+    """
+    doc_code = parsed_data.get("doc_code", "99999")
+    alias = passage_alias(DOC_CODE_INDEX_MAP.get(doc_code, "rpt_other"))
+    target_index = partition_index_name(alias, parsed_data.get("pub_date"))
+    report_fields = {key: value for key, value in parsed_data.items() if key != "sections"}
+    routing = parsed_data.get("corp_code") or parsed_data["doc_id"]
+
+    return [
+        {
+            "_index": target_index,
+            "_id": passage["passage_id"],
+            "_routing": routing,
+            "_source": {**report_fields, **passage},
+        }
+        for passage in build_passages(parsed_data, max_chars)
+    ]
+
+
+def build_action(parsed_data):
+    """
+    파싱 결과를 doc_code에 맞는 보고서 종류의 pub_date 연도별 인덱스로 보내는 bulk 액션으로 변환
+    (예: 2024년 분기보고서 -> rpt_qt-2024, 검색은 alias rpt_qt로)
+    """
+    doc_code = parsed_data.get("doc_code", "99999")
+    alias = DOC_CODE_INDEX_MAP.get(doc_code, "rpt_other")
+    target_index = partition_index_name(alias, parsed_data.get("pub_date"))
 
-def generate_actions(data_dir):
-    """디렉터리 하위 XML들을 파싱하고 bulk 액션 생성"""
-    root_dirs = ["분기", "반기", "사업", "증권"]
+    return {
+        "_index": target_index,
+        "_id": parsed_data["doc_id"],
+        "_source": parsed_data,
+    }
 
-    for folder_name in root_dirs: # 종류별로 시도
+
+# 데이터 루트 아래 보고서 종류별 폴더
+REPORT_FOLDERS = ["분기", "반기", "사업", "증권"]
+
+
+def _is_rcept_no(name):
+    return len(name) == 14 and name.isdigit()
+
+
+def iter_xml_files(data_dir, since_date=None):
+    """
+    보고서 종류별 폴더를 순회하며 (폴더명, XML 파일 경로)를 yield
+    since_date(yyyyMMdd)를 주면 접수번호 이름의 폴더 중 그 날짜보다 이전 폴더는 들어가지 않습니다.
+    """
+    for folder_name in REPORT_FOLDERS: # 종류별로 시도
         full_dir_path = os.path.join(data_dir, folder_name) #경로를 data_dir/보고서종류로 설정
         if not os.path.isdir(full_dir_path): # 존재하지않으면
             print(f"Directory not found: {full_dir_path}")
             continue
 
         print(f"Processing directory: {full_dir_path}")
-        file_count = 0
-
         for root, dirs, files in os.walk(full_dir_path): # 해당 경로에 있는 파일 작업 시작
-            if file_count >= 10:
-                print(f"Reached file limit (10) for folder: {folder_name}. Skipping remaining files.")
-                break
-
+            if since_date:
+                dirs[:] = [name for name in dirs if not _is_rcept_no(name) or name[:8] >= since_date]
             for file_name in files:
-                if file_count >= 10:
-                    break
-
                 if file_name.endswith(".xml"):
-                    file_path = os.path.join(root, file_name) # 해당 경로의 해당 파일로 설정
-
-                    try:
-                        with codecs.open(file_path, "r", encoding="utf-8") as f:
-                            xml_content = f.read()
-
-                        parsed_data = parse_darter_xml(xml_content, file_name)
-                        if parsed_data:
-                            doc_code = parsed_data.get("doc_code", "99999")
-                            target_index = DOC_CODE_INDEX_MAP.get(doc_code, "rpt_other")
-
-                            yield {
-                                "_index": target_index,
-                                "_id": parsed_data["doc_id"],
-                                "_source": parsed_data,
-                            }
-                            file_count += 1
-
-                    except Exception as e:
-                        print(f"Error processing file {file_path}: {e}")
+                    yield folder_name, os.path.join(root, file_name) # 해당 경로의 해당 파일로 설정
+
+
+def parse_file_to_action(file_path, with_hash=False, unchanged_hash=None):
+    """
+    XML 파일 하나를 파싱해 bulk 액션으로 변환 (프로세스 풀 작업 단위)
+    결과 dict를 반환합니다.
+      actions: bulk 액션 목록 (build_actions, 실패 시 빈 목록), error: 실패 사유
+      content_hash / size / mtime_ns: with_hash=True일 때 매니페스트 기록용
+      unchanged: 내용 해시가 unchanged_hash와 같아 파싱을 건너뜀
+      profile: 측정 기록 (워커 프로세스에서 만들어지므로 부모가 받아서 모음)
+    """
+    result = {"file_path": file_path, "actions": [], "error": None, "content_hash": None,
+              "size": None, "mtime_ns": None, "unchanged": False, "profile": None}
+    with profiling.document(os.path.basename(file_path), collect=False) as record:
+        try:
+            stat = os.stat(file_path)
+            result["size"], result["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+            profiling.record(xml_bytes=stat.st_size)
+            if with_hash:
+                with profiling.stage("hash"):
+                    result["content_hash"] = file_content_hash(file_path)
+                result["unchanged"] = unchanged_hash is not None and result["content_hash"] == unchanged_hash
+            if not result["unchanged"]:
+                # 캐시에 없으면 파일 전체를 문자열로 만들지 않고 파싱
+                parsed_data = parse_file_cached(file_path)
+                if parsed_data:
+                    result["actions"] = build_actions(parsed_data)
+                else:
+                    result["error"] = "parse failed"
+        except Exception as e:
+            print(f"Error processing file {file_path}: {e}")
+            result["error"] = str(e)
+    if record is not None:
+        result["profile"] = record.to_dict()
+    return result
+
+
+def generate_actions(data_dir, workers=None, max_in_flight=None, max_files_per_folder=10, manifest=None, files=None):
+    """
+    디렉터리 하위 XML들을 파싱하고 bulk 액션 생성
+    files((폴더명, 경로) 목록)를 주면 디렉터리를 순회하지 않고 그 파일들만 처리합니다.
+    workers가 2 이상이면 프로세스 풀에서 병렬로 파싱하고 완료되는 순서대로 yield 합니다.
+    동시에 처리 중인 파일 수는 max_in_flight(기본값: workers * 2)로 제한해 메모리를 묶어 둡니다.
+    manifest(IngestManifest)를 넘기면 이미 성공한 파일은 건너뛰고 파싱 결과를 기록합니다.
+    """
+    if workers is None:
+        workers = settings.PARSE_WORKERS or os.cpu_count() or 1
+    file_counts = {}  # 폴더별 파싱에 성공한 파일 수
+    in_flight_counts = {}  # 폴더별 처리 중인 파일 수 (파일 제한을 넘겨 제출하지 않도록)
+    skipped = 0
+    profiler = profiling.get_profiler()
+
+    def under_limit(folder_name):
+        if max_files_per_folder is None:
+            return True
+        count = file_counts.get(folder_name, 0) + in_flight_counts.get(folder_name, 0)
+        return count < max_files_per_folder
+
+    def iter_pending_files():
+        """(폴더명, 경로, 작업 인자)를 yield. 매니페스트상 끝난 파일은 해시 계산 없이 건너뜀"""
+        nonlocal skipped
+        for folder_name, file_path in files if files is not None else iter_xml_files(data_dir):
+            if manifest is None:
+                yield folder_name, file_path, (file_path,)
+            elif manifest.is_done(file_path):
+                skipped += 1
+            else:
+                yield folder_name, file_path, (file_path, True, manifest.success_hash(file_path))
+
+    def handle_result(folder_name, result):
+        """결과를 매니페스트/측정에 반영하고 보낼 액션 목록을 반환"""
+        nonlocal skipped
+        if result["profile"] and profiler:
+            profiler.add_record(result["profile"])
+        actions = result["actions"]
+        if manifest is not None:
+            if result["unchanged"]:
+                skipped += 1
+                manifest.record_unchanged(result["file_path"], result["size"], result["mtime_ns"])
+                return []
+            manifest.record_parse(
+                result["file_path"],
+                actions[0]["_source"]["doc_id"] if actions else None,
+                result["content_hash"],
+                result["size"],
+                result["mtime_ns"],
+                target_index=actions[0]["_index"] if actions else None,
+                error=result["error"],
+                action_count=len(actions),
+            )
+            # bulk 결과를 이 파일의 매니페스트 기록에 맞추기 위한 태그 (send_bulk가 응답 항목에 붙여 돌려줌)
+            for action in actions:
+                action["_tag"] = result["file_path"]
+        if actions:
+            file_counts[folder_name] = file_counts.get(folder_name, 0) + 1
+        return actions
+
+    if workers <= 1:
+        for folder_name, file_path, args in iter_pending_files():
+            if not under_limit(folder_name):
+                continue
+            yield from handle_result(folder_name, parse_file_to_action(*args))
+    else:
+        max_in_flight = max_in_flight or workers * 2
+        pending = {}  # future -> 폴더명
+        # 처리 중인 파일만으로 폴더 한도가 찬 동안 미뤄 둔 파일 (처리 중인 파일이 실패하면 순서대로 제출)
+        deferred = {}  # 폴더명 -> deque[(폴더명, 경로, 작업 인자)]
+
+        def pop_deferred():
+            for folder_name, queue in deferred.items():
+                if file_counts.get(folder_name, 0) >= max_files_per_folder:
+                    queue.clear()  # 성공한 파일로 한도가 참 (순차 처리와 같이 나머지는 건너뜀)
+                elif queue and under_limit(folder_name):
+                    return queue.popleft()
+            return None
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=profiling.init_worker,
+            initargs=(profiler.config() if profiler else None,),
+        ) as executor:
+            pending_files = iter_pending_files()
+            exhausted = False
+            while True:
+                # 처리 중인 파일 수가 한도보다 작으면 다음 파일 제출
+                while len(pending) < max_in_flight:
+                    next_file = pop_deferred()
+                    if next_file is None and not exhausted:
+                        next_file = next(pending_files, None)
+                        exhausted = next_file is None
+                    if next_file is None:
+                        break
+                    folder_name, file_path, args = next_file
+                    if not under_limit(folder_name):
+                        if file_counts.get(folder_name, 0) < max_files_per_folder:
+                            deferred.setdefault(folder_name, deque()).append(next_file)
                         continue
-    print("All folders have been processed up to the file limit.")
+                    pending[executor.submit(parse_file_to_action, *args)] = folder_name
+                    in_flight_counts[folder_name] = in_flight_counts.get(folder_name, 0) + 1
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder_name = pending.pop(future)
+                    in_flight_counts[folder_name] -= 1
+                    yield from handle_result(folder_name, future.result())
+
+    if manifest is not None:
+        manifest.commit()
+        if skipped:
+            print(f"Skipped {skipped} files already ingested (manifest: {manifest.path})")
+    if files is None:
+        print("All folders have been processed up to the file limit.")
+
+def _prepare_actions(actions, load_mode=None):
+    """bulk로 보내기 전 액션 처리 (load_mode: 새 연도별 인덱스를 첫 문서를 보내기 전에 적재 모드 설정으로 만듦)"""
+    for action in actions:
+        if load_mode is not None:
+            load_mode.ensure_index(action["_index"])
+        yield action
+
+
+def bulk_ingest(actions, manifest=None, load_mode=None):
+    """
+    액션을 bulk로 보내고 항목별 결과를 매니페스트에 남깁니다. (성공 수, 실패 수)를 반환합니다.
+    load_mode(BulkLoadMode)를 주면 새 인덱스를 적재 모드로 만들고 적재된 인덱스를 touched에 모읍니다.
+    끝나면(중간에 실패해도) 문서가 들어간 인덱스를 읽은 검색 캐시 결과를 무효화합니다.
+    """
+    success = failed = 0
+    written = set()  # 쓰기가 일어난 인덱스 (검색 캐시 무효화)
+    actions = _prepare_actions(actions, load_mode)
+    try:
+        # 바이트 기준 청크를 병렬로 보내고 bulk 전체 시간에서 액션 생성(파싱) 대기 시간을 분리해서 측정
+        for ok, item in send_bulk(os_client, profiling.iter_stage(actions, "generate_actions")):
+            op_result = next(iter(item.values()))
+            if ok:
+                success += 1
+                written.add(op_result.get("_index"))
+                if load_mode is not None:
+                    load_mode.touched.add(op_result.get("_index"))
+            else:
+                failed += 1
+                print(f"Failed to index {op_result.get('_id')}: {op_result.get('error')}")
+            if manifest is not None and op_result.get("_tag"):
+                # generate_actions가 액션에 붙인 원본 파일 경로 (같은 doc_id의 파일이 여럿이어도 구분됨)
+                manifest.record_bulk(op_result["_tag"], ok, op_result.get("error"))
+    finally:
+        invalidate_indices(written)
+    return success, failed
+
 
 # 하나만 파싱해서 오픈서치에 넣기
 def one_parse_xml(file_dict: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
@@ -101,19 +526,12 @@ def one_parse_xml(file_dict: Dict[str, Any]) -> Generator[Dict[str, Any], None,
             return
 
         # XML 파싱
-        parsed_data = parse_darter_xml(xml_content, rcept_no)
+        parsed_data = parse_content_cached(xml_content, rcept_no)
         
         # 파싱된 데이터가 유효한지 확인
         if parsed_data and parsed_data.get("doc_id"):
-            doc_code = parsed_data.get("doc_code", "99999")
-            target_index = DOC_CODE_INDEX_MAP.get(doc_code, "rpt_other")
-
             # OpenSearch에 보낼 데이터를 yield
-            yield {
-                "_index": target_index,
-                "_id": parsed_data["doc_id"],
-                "_source": parsed_data,
-            }
+            yield from build_actions(parsed_data)
         else:
             print(f"Warning: No valid data or doc_id parsed from rcept_no '{rcept_no}'.")
     
@@ -121,25 +539,55 @@ def one_parse_xml(file_dict: Dict[str, Any]) -> Generator[Dict[str, Any], None,
         print(f"Critical Error during XML parsing for rcept_no '{rcept_no}': {e}")
 
 
-def main():
+def main(workers=None, profile=False, resume=True, bulk_load=None, force_merge_segments=None):
+    """
+    resume=True(기본값)면 체크포인트 매니페스트(INGEST_MANIFEST_PATH)를 사용해
+    이전 실행에서 성공한 문서는 건너뛰고 실패했거나 바뀐 문서만 다시 처리합니다.
+    bulk_load=True면 적재 동안 벌크 적재 모드(BulkLoadMode)를 사용하고,
+    force_merge_segments를 주면 끝난 뒤 적재된 인덱스를 force merge 합니다.
+    생략하면 INGEST_BULK_LOAD_MODE / INGEST_FORCE_MERGE_SEGMENTS 설정을 따릅니다.
+    """
+    if bulk_load is None:
+        bulk_load = settings.INGEST_BULK_LOAD_MODE
+    if force_merge_segments is None:
+        force_merge_segments = settings.INGEST_FORCE_MERGE_SEGMENTS
+    if profile:
+        profiling.enable_profiling()
+    else:
+        profiling.enable_from_settings()
     create_indices()
 
-    data_raw_path = "C:/01571107"
+    data_raw_path = os.path.abspath(settings.INGEST_DATA_DIR)
     if not os.path.isdir(data_raw_path):
         print(f"Error: The directory '{data_raw_path}' does not exist.")
         return
 
+    manifest = IngestManifest(settings.INGEST_MANIFEST_PATH) if resume else None
+
     print("Starting data ingestion using bulk API...")
+    index_patterns = [f"{alias}-*" for alias in REPORT_ALIASES]
+    index_patterns += [f"{section_alias(alias)}-*" for alias in REPORT_ALIASES]
+    index_patterns += [f"{passage_alias(alias)}-*" for alias in REPORT_ALIASES]
+    load_mode = BulkLoadMode(index_patterns, force_merge_segments) if bulk_load else nullcontext()
     try:
-        success, failed = bulk(
-            os_client,
-            generate_actions(data_raw_path),
-            chunk_size=500,
-            stats_only=True
-        )
+        with load_mode:
+            actions = generate_actions(
+                data_raw_path,
+                workers=workers,
+                max_files_per_folder=settings.INGEST_MAX_FILES_PER_FOLDER or None,
+                manifest=manifest,
+            )
+            with profiling.stage("bulk_total"):
+                success, failed = bulk_ingest(actions, manifest, load_mode if bulk_load else None)
         print(f"Bulk ingestion completed. Succeeded: {success}, Failed: {failed}")
     except Exception as e:
         print(f"An error occurred during bulk ingestion: {e}")
+    finally:
+        if manifest is not None:
+            print(f"Manifest summary: {manifest.summary()}")
+            manifest.close()
+
+    profiling.report()
 
 if __name__ == "__main__":
     main()
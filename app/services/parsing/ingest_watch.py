@@ -0,0 +1,160 @@
+# ingest_watch.py
+# 공시 XML 폴더 감시 모드: 새로 들어오거나 바뀐 XML만 작은 묶음으로 파싱해 바로 적재한다.
+#
+#   python -m app.services.parsing.ingest_watch
+#
+# 시작할 때는 전체를 다시 순회하지 않고 매니페스트의 마지막 적재 접수번호(high-water mark) 날짜 이후 폴더와
+# 이전에 실패한 파일만 따라잡은 뒤, watchfiles로 변경 이벤트를 받는다.
+# 쓰는 중인 파일은 크기/수정 시각이 INGEST_WATCH_STABLE_SEC 동안 그대로일 때까지 기다렸다가 처리한다.
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from watchfiles import Change, watch
+
+from .ingest_manifest import IngestManifest
+from .ingest_to_os_from_xml import REPORT_FOLDERS, bulk_ingest, create_indices, generate_actions, iter_xml_files
+
+from app.config import settings
+
+
+def _folder_of(data_dir, file_path):
+    """데이터 루트 기준 보고서 종류 폴더명 (감시 대상 폴더가 아니면 None)"""
+    relative = os.path.relpath(file_path, data_dir)
+    folder_name = relative.split(os.sep, 1)[0]
+    return folder_name if folder_name in REPORT_FOLDERS else None
+
+
+def _xml_filter(change, path):
+    return path.endswith(".xml")
+
+
+def _since_date(high_water_mark, rescan_days):
+    """high-water mark 접수번호의 날짜에서 rescan_days를 뺀 yyyyMMdd (없으면 None: 전체 순회)"""
+    if not high_water_mark:
+        return None
+    date = datetime.strptime(high_water_mark[:8], "%Y%m%d") - timedelta(days=rescan_days)
+    return date.strftime("%Y%m%d")
+
+
+def ingest_files(data_dir, file_paths, manifest, workers=None):
+    """파일 목록을 파싱해 bulk로 보내고 매니페스트에 기록합니다. (성공 수, 실패 수)를 반환합니다."""
+    files = []
+    for file_path in file_paths:
+        folder_name = _folder_of(data_dir, file_path)
+        if folder_name is not None:
+            files.append((folder_name, file_path))
+    if not files:
+        return 0, 0
+
+    actions = generate_actions(
+        data_dir,
+        workers=workers or settings.INGEST_WATCH_WORKERS,
+        max_files_per_folder=None,
+        manifest=manifest,
+        files=files,
+    )
+    success, failed = bulk_ingest(actions, manifest)
+    manifest.commit()
+    print(f"Ingested {len(files)} files: {success} succeeded, {failed} failed")
+    return success, failed
+
+
+def catch_up(data_dir, manifest, batch_size=None, workers=None):
+    """
+    감시를 시작하기 전 놓친 파일 처리
+    - 이전 실행에서 실패했거나 bulk 결과를 받지 못한 파일
+    - high-water mark 날짜(INGEST_WATCH_RESCAN_DAYS일 여유) 이후 접수번호 폴더의 파일 (끝난 파일은 매니페스트로 건너뜀)
+    high-water mark가 없으면(첫 실행) 전체를 순회합니다.
+    """
+    batch_size = batch_size or settings.INGEST_WATCH_BATCH_SIZE
+    high_water_mark = manifest.high_water_mark()
+    since_date = _since_date(high_water_mark, settings.INGEST_WATCH_RESCAN_DAYS)
+    print(f"Catching up from high-water mark {high_water_mark} (folders since {since_date or 'the beginning'})")
+
+    retry = [path for path in manifest.unfinished_files() if os.path.isfile(path)]
+    seen = set(retry)
+    batch = list(retry)
+    for _, file_path in iter_xml_files(data_dir, since_date):
+        if file_path in seen or manifest.is_done(file_path):
+            continue
+        seen.add(file_path)
+        batch.append(file_path)
+        if len(batch) >= batch_size:
+            ingest_files(data_dir, batch, manifest, workers)
+            batch = []
+    while batch:
+        ingest_files(data_dir, batch[:batch_size], manifest, workers)
+        batch = batch[batch_size:]
+
+
+def _pop_stable(pending, stable_sec):
+    """
+    pending(경로 -> (크기, 수정 시각, 마지막 변화 시각))에서 stable_sec 동안 바뀌지 않은 파일을 꺼내 반환
+    사라진 파일은 버리고, 아직 쓰는 중인 파일은 남겨 둡니다.
+    """
+    now = time.monotonic()
+    ready = []
+    for file_path, state in list(pending.items()):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            del pending[file_path]
+            continue
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if state is None or state[:2] != signature:
+            pending[file_path] = (*signature, now)
+        elif now - state[2] >= stable_sec:
+            del pending[file_path]
+            ready.append(file_path)
+    return ready
+
+
+def watch_and_ingest(data_dir=None, batch_size=None, workers=None, stop_event=None):
+    """
+    데이터 루트를 감시하며 새로 들어오거나 바뀐 XML을 적재합니다 (Ctrl+C 또는 stop_event로 종료).
+    이미 적재한 내용과 같은 파일은 매니페스트 해시 비교로 다시 보내지 않습니다.
+    """
+    data_dir = os.path.abspath(data_dir or settings.INGEST_DATA_DIR)
+    if not os.path.isdir(data_dir):
+        print(f"Error: The directory '{data_dir}' does not exist.")
+        return
+    batch_size = batch_size or settings.INGEST_WATCH_BATCH_SIZE
+    stable_sec = settings.INGEST_WATCH_STABLE_SEC
+
+    create_indices()
+    manifest = IngestManifest(settings.INGEST_MANIFEST_PATH)
+    pending = {}
+    try:
+        catch_up(data_dir, manifest, batch_size, workers)
+        print(f"Watching {data_dir} for new XML files...")
+        for changes in watch(
+            data_dir,
+            watch_filter=_xml_filter,
+            debounce=settings.INGEST_WATCH_DEBOUNCE_MS,
+            # 새 이벤트가 없어도 쓰기가 끝난 파일을 처리하도록 주기적으로 깨어남
+            rust_timeout=max(100, int(stable_sec * 500)),
+            yield_on_timeout=True,
+            stop_event=stop_event,
+            raise_interrupt=False,
+        ):
+            for change, file_path in changes:
+                if change == Change.deleted:
+                    pending.pop(file_path, None)
+                else:
+                    pending[file_path] = None
+            ready = _pop_stable(pending, stable_sec)
+            for start in range(0, len(ready), batch_size):
+                try:
+                    ingest_files(data_dir, ready[start:start + batch_size], manifest, workers)
+                except Exception as e:
+                    # 실패한 파일은 매니페스트에 남아 다음 시작 때 다시 처리됨
+                    print(f"An error occurred during watch ingestion: {e}")
+    finally:
+        print(f"Manifest summary: {manifest.summary()}")
+        manifest.close()
+
+
+if __name__ == "__main__":
+    watch_and_ingest()
@@ -0,0 +1,184 @@
+# parse_cache.py
+# 원본 XML 해시 기반 파싱 결과 디스크 캐시
+# DART 공시 문서는 접수번호별로 바뀌지 않으므로 같은 XML은 다시 파싱하지 않는다.
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import zlib
+
+from app.config import settings
+from .parse_xml import PARSER_VERSION, parse_darter_xml, parse_darter_xml_bytes
+
+_ENTRY_SUFFIX = ".json.z"
+
+
+class ParseCache:
+    """
+    parse_darter_xml 결과를 zlib으로 압축한 JSON 파일로 저장하는 디스크 캐시입니다.
+    키는 파서 버전, 파일명, 원본 XML 바이트의 SHA-256이며, 파서 버전별 디렉터리를 사용해
+    PARSER_VERSION을 올리면 이전 결과는 자동으로 무효화되고 삭제됩니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, cache_dir, max_bytes, version=PARSER_VERSION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        self.version_dir = os.path.join(cache_dir, f"v{version}")
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.version_dir, exist_ok=True)
+        self._remove_stale_versions()
+        self._total_bytes = sum(size for _, size, _ in self._iter_entries())
+
+    def new_hasher(self, file_name):
+        """원본 XML 바이트를 넣어 키를 만들 해시 객체를 반환합니다."""
+        hasher = hashlib.sha256()
+        hasher.update(f"{self.version}\0{file_name}\0".encode("utf-8"))
+        return hasher
+
+    def get(self, key):
+        """
+        캐시된 파싱 결과를 반환합니다. 없으면 (False, None),
+        있으면 (True, 결과)이며 파싱 실패도 None 결과로 캐시됩니다.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            parsed_data = json.loads(zlib.decompress(payload))
+        except FileNotFoundError:
+            self.misses += 1
+            return False, None
+        except (OSError, zlib.error, ValueError) as e:
+            print(f"Warning: 손상된 파싱 캐시 항목을 무시합니다 ({path}): {e}")
+            self.misses += 1
+            return False, None
+
+        # LRU 판단을 위해 사용 시각 갱신
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return True, parsed_data
+
+    def put(self, key, parsed_data):
+        """파싱 결과를 원자적으로 저장합니다 (임시 파일에 쓴 뒤 rename)."""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = zlib.compress(
+            json.dumps(parsed_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        )
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: 파싱 캐시 저장 실패 ({path}): {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self._total_bytes += len(payload)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _entry_path(self, key):
+        return os.path.join(self.version_dir, key[:2], key + _ENTRY_SUFFIX)
+
+    def _iter_entries(self):
+        """(경로, 크기, 마지막 사용 시각)을 yield 합니다."""
+        for shard in os.scandir(self.version_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(_ENTRY_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """다른 프로세스가 쓴 항목까지 다시 집계한 뒤 용량의 90% 이하가 될 때까지 오래된 항목 삭제"""
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
+
+    def _remove_stale_versions(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and entry.name.startswith("v") and entry.path != self.version_dir:
+                print(f"Removing stale parse cache: {entry.path}")
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+
+_parse_cache = None
+
+
+def get_parse_cache():
+    """설정에 따른 프로세스별 캐시 인스턴스 (비활성화 시 None)"""
+    global _parse_cache
+    if not settings.PARSE_CACHE_ENABLED:
+        return None
+    if _parse_cache is None:
+        _parse_cache = ParseCache(settings.PARSE_CACHE_DIR, settings.PARSE_CACHE_MAX_BYTES)
+    return _parse_cache
+
+
+def parse_file_cached(file_path):
+    """
+    XML 파일을 캐시를 거쳐 파싱합니다 (디렉터리 인제스트용).
+    파일은 mmap으로 열어 해시 계산과 파싱 모두 힙에 복사본을 만들지 않습니다.
+    """
+    file_name = os.path.basename(file_path)
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:  # 빈 파일은 mmap 불가
+            return parse_content_cached(b"", file_name)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return parse_content_cached(mapped, file_name)
+
+
+def parse_content_cached(xml_content, file_name):
+    """
+    XML 원문을 캐시를 거쳐 파싱합니다 (API 다운로드 경로용).
+    xml_content는 bytes 계열(bytes, memoryview, mmap)이면 디코딩 없이 바이트 경로로,
+    str이면 기존 문자열 경로로 파싱합니다. 같은 문서는 두 경우 모두 같은 키를 씁니다 (UTF-8 기준).
+    """
+    is_text = isinstance(xml_content, str)
+    cache = get_parse_cache()
+    if cache is None:
+        return _parse(xml_content, file_name, is_text)
+
+    hasher = cache.new_hasher(file_name)
+    hasher.update(xml_content.encode("utf-8") if is_text else xml_content)
+    key = hasher.hexdigest()
+
+    found, parsed_data = cache.get(key)
+    if found:
+        return parsed_data
+    parsed_data = _parse(xml_content, file_name, is_text)
+    cache.put(key, parsed_data)
+    return parsed_data
+
+
+def _parse(xml_content, file_name, is_text):
+    if is_text:
+        return parse_darter_xml(xml_content, file_name)
+    return parse_darter_xml_bytes(xml_content, file_name)
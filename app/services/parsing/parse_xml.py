@@ -6,80 +6,255 @@ import json
 import codecs
 from bs4 import BeautifulSoup
 
+from app.services import profiling
+
+
+# 파싱 결과(섹션 구성, 정제 규칙 등)가 바뀌는 수정을 하면 올릴 것 (파싱 캐시 무효화)
+PARSER_VERSION = "2"
+
+# 허용되는 태그 이름 리스트
+WHITELIST = frozenset({
+    "DOCUMENT", "DOCUMENT-NAME", "FORMULA-VERSION", "COMPANY-NAME", "SUMMARY",
+    "LIBRARY", "BODY", "EXTRACTION", "COVER", "COVER-TITLE",
+    "IMAGE", "IMG", "IMG-CAPTION",  "P", "A", "SPAN",
+    "TR", "TD", "TH", "TE", "TU", "SECTION-1", "SECTION-2", "SECTION-3",
+    "TITLE", "TABLE", "TABLE-GROUP", "COLGROUP", "COL", "THEAD",
+    "TBODY", "PGBRK", "PART", "CORRECTION"
+})
+# 화이트리스트에 있지만 결과에서는 제거하는 태그 (SPAN: 스타일, A: 링크)
+REMOVED_TAGS = frozenset({"SPAN", "A"})
+
+# XML 1.0 사양에서 허용되지 않는 제어 문자
+_CONTROL_CHARS = "".join(chr(c) for c in [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+_CONTROL_TABLE = dict.fromkeys(map(ord, _CONTROL_CHARS))
+_WS_CONTROL_CHARS = frozenset(c for c in _CONTROL_CHARS if c.isspace())
+
+_XML_DECL_RE = re.compile(r"<\?xml[^>]*\?>\s*")
+_CONTROL_CLASS = r"\x00-\x08\x0b\x0c\x0e-\x1f\x7f"
+# 그대로 출력되는 대문자 화이트리스트 태그 (긴 이름이 먼저 매치되도록 정렬)
+_VERBATIM_TAG = (
+    r"</?(?:" + "|".join(sorted(WHITELIST - REMOVED_TAGS, key=len, reverse=True)) + r")"
+    r"(?!\w|-\w)[^&<>" + _CONTROL_CLASS + r"]*>"
+)
+# 한 번의 스캔으로 처리할 토큰들. 토큰 사이의 일반 텍스트는 그대로 복사된다.
+# - run : 변경 없이 출력되는 태그와 일반 텍스트의 연속 구간 (대부분의 문서 내용)
+# - tag : 원본 '<' 또는 이미 이스케이프된 '&lt;'로 시작하는 태그 후보
+# - amp/lt/gt : 태그가 되지 못한 '&', '<', '>'
+# - ctrl : 제어 문자 묶음
+_TOKEN_RE = re.compile(
+    r"(?P<run>(?:" + _VERBATIM_TAG + r"[^&<>" + _CONTROL_CLASS + r"]*)+)"
+    r"|(?P<tag>(?:<|&lt;)(?P<slash>/?)(?P<name>\w+(?:-\w+)*)(?P<attrs>[^&<>]*)(?:>|&gt;))"
+    r"|(?P<amp>&)"
+    r"|(?P<lt><)"
+    r"|(?P<gt>>)"
+    r"|(?P<ctrl>[" + _CONTROL_CLASS + r"]+)"
+)
+
+
+class XmlSanitizer:
+    """
+    DART XML을 ElementTree가 읽을 수 있도록 정제하는 단일 패스 정제기입니다.
+    화이트리스트 태그 복원, SPAN/A 태그 제거, 제어 문자 제거, '&' 이스케이프를
+    한 번의 스캔으로 처리하며 결과는 기존 다단계 정규식 파이프라인과 바이트 단위로 같습니다.
+    feed()로 조각 단위 입력을 받을 수 있어 전체 문서를 메모리에 올리지 않아도 됩니다.
+    """
 
-def preprocess_xml_content(xml_string):
-    # 허용되는 태그 이름 리스트
-    WHITELIST = {
-        "DOCUMENT", "DOCUMENT-NAME", "FORMULA-VERSION", "COMPANY-NAME", "SUMMARY",
-        "LIBRARY", "BODY", "EXTRACTION", "COVER", "COVER-TITLE",
-        "IMAGE", "IMG", "IMG-CAPTION",  "P", "A", "SPAN",
-        "TR", "TD", "TH", "TE", "TU", "SECTION-1", "SECTION-2", "SECTION-3",
-        "TITLE", "TABLE", "TABLE-GROUP", "COLGROUP", "COL", "THEAD",
-        "TBODY", "PGBRK", "PART", "CORRECTION"
-    }
-    # TAG_RE = re.compile(
-    #     r"<(/?)([A-Za-z0-9\-]+)"               # 그룹 1: 슬래시?, 그룹 2: 태그명
-    #     r"([^>]*)"                             # 그룹 3: 속성 등
-    #     r">"
-    # )
-    # 태그 이름만 추출하는 정규식: &lt;/TD&gt; -> /TD, &lt;TD ...&gt; -> TD ...
-    TAG_RE = re.compile(r"&lt;(/?)(\w+(?:-\w+)*)([^&]*)&gt;")
-    def restore_whitelisted_tags(match):
-        slash, tag, attrs = match.groups()
-        if tag.upper() in WHITELIST:
-            return f"<{slash}{tag}{attrs}>"
-        return match.group(0) # 화이트리스트에 없으면 그대로 둠
-    
-    def repl(m):
-        slash, tag, attrs = m.group(1), m.group(2), m.group(3)
-        if tag not in WHITELIST:
-            # 전체 태그 엔티티 처리
-            inner = m.group(0)[1:-1]  # "<...>" 사이 문자열
-            return "&lt;" + inner + "&gt;"
+    def __init__(self):
+        self._buffer = ""
+        self._decl_decided = False
+        self._lstrip_output = False  # XML 선언이 있으면 최종 결과 기준으로 lstrip
+        self._started = False  # 앞쪽 공백 제거가 끝났는지
+        self._held = []  # 마지막 내용 뒤의 공백 (뒤쪽 strip을 위해 보류)
+        self._amp = None  # 판정 대기 중인 '&' 뒤에 이어진 문자열
+        self._out = []
+
+    def feed(self, data):
+        """문자열 조각을 받아 지금까지 확정된 정제 결과를 반환합니다."""
+        self._consume(data, final=False)
+        return self._drain()
+
+    def close(self):
+        """남은 입력을 처리하고 마지막 정제 결과를 반환합니다."""
+        self._consume("", final=True)
+        return self._drain()
+
+    def _drain(self):
+        result = "".join(self._out)
+        self._out.clear()
+        return result
+
+    def _consume(self, data, final):
+        buffer = self._buffer + data if self._buffer else data
+        pos = 0
+
+        if not self._decl_decided:
+            # 1. XML 선언 (Processing Instruction) 추출 및 보호
+            match = _XML_DECL_RE.match(buffer)
+            if not final and self._decl_pending(buffer, match):
+                self._buffer = buffer
+                return
+            self._decl_decided = True
+            if match:
+                # 원래 선언 뒤에 개행을 넣어 줄 맞춤
+                self._out.append(match.group(0) + "\n")
+                self._lstrip_output = True
+                pos = match.end()
+
+        if final:
+            end = len(buffer)
         else:
+            # 마지막 '>' 이후는 태그가 끝나지 않았을 수 있으므로 다음 조각과 함께 처리
+            end = buffer.rfind(">", pos) + 1
+            if end == 0:
+                self._buffer = buffer[pos:] if pos else buffer
+                return
+
+        for match in _TOKEN_RE.finditer(buffer, pos, end):
+            start = match.start()
+            if start > pos:
+                self._text(buffer[pos:start])
+            kind = match.lastgroup
+            if kind == "run":
+                self._text(match.group())
+            elif kind == "tag":
+                self._tag(match)
+            elif kind == "amp":
+                self._ampersand()
+            elif kind == "lt":
+                self._content("&amp;lt;")
+            elif kind == "gt":
+                self._content("&amp;gt;")
+            else:
+                self._control(match.group("ctrl"))
+            pos = match.end()
+        if end > pos:
+            self._text(buffer[pos:end])
+
+        self._buffer = buffer[end:]
+        if final:
+            # 2. 전체 문자열 뒤쪽의 공백 제거: 보류 중인 공백은 버림
+            self._held.clear()
+            if self._amp is not None:
+                self._out.append("&amp;" + self._amp)
+                self._amp = None
+
+    @staticmethod
+    def _decl_pending(buffer, match):
+        """XML 선언 여부를 판단하기에 입력이 아직 부족한지 확인합니다."""
+        if match:
+            # 선언 뒤 공백이 다음 조각으로 이어질 수 있음
+            return match.end() == len(buffer)
+        if len(buffer) < 5:
+            return "<?xml".startswith(buffer)
+        return buffer.startswith("<?xml") and ">" not in buffer
+
+    def _tag(self, match):
+        slash, tag, attrs = match.group("slash", "name", "attrs")
+        if attrs:
+            attrs = attrs.translate(_CONTROL_TABLE)
+        upper_tag = tag.upper()
+        if upper_tag not in WHITELIST:
+            # 화이트리스트에 없으면 이스케이프된 텍스트로 남김 ('&'도 다시 이스케이프됨)
+            self._content(f"&amp;lt;{slash}{tag}{attrs}&amp;gt;")
+        elif upper_tag not in REMOVED_TAGS:
             # 허용된 태그: 속성은 그대로 유지
-            return f"<{slash}{tag}{attrs}>"
-
-    # 1. XML 선언 (Processing Instruction) 추출 및 보호
-    xml_declaration_match = re.match(r"<\?xml[^>]*\?>\s*", xml_string)
-    xml_declaration = ""
-    remaining_xml_string = xml_string
-
-    if xml_declaration_match:
-        xml_declaration = xml_declaration_match.group(
-            0
-        )  # 매치된 선언과 뒤따르는 공백 포함
-        remaining_xml_string = xml_string[
-            xml_declaration_match.end() :
-        ]  # 선언 부분 제거
-
-    encoded_xml = remaining_xml_string.replace("<", "&lt;").replace(">", "&gt;")
-    cleaned_xml = TAG_RE.sub(restore_whitelisted_tags, encoded_xml)
-
-    # SPAN(스타일), A(링크) 태그 제거
-    span_pattern = re.compile(r'</?SPAN\b[^>]*?>', re.IGNORECASE)
-    cleaned_xml_string = span_pattern.sub('', cleaned_xml)
-    a_pattern = re.compile(r'</?A\b[^>]*?>', re.IGNORECASE)
-    cleaned_xml_string = a_pattern.sub('', cleaned_xml_string)
-
-    # 2. 전체 문자열 앞뒤의 공백 및 개행 문자 제거 (XML 선언 제외한 나머지 부분에 적용)
-    cleaned_xml_string = cleaned_xml_string.strip()
-
-    # 3. XML 1.0 사양에서 허용되지 않는 제어 문자 제거 (ParseError 방지)
-    cleaned_xml_string = re.sub(
-        r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", cleaned_xml_string
-    )
-
-    # 4. 이스케이프되지 않은 '&' 문자를 '&amp;'로 변환
-    cleaned_xml_string = re.sub(r'&(?!#|amp;)', r'&amp;', cleaned_xml_string)
+            self._content(f"<{slash}{tag}{attrs}>")
+
+    def _text(self, text):
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+        if text[-1].isspace():
+            body = text.rstrip()
+            if body:
+                self._content(body)
+            self._held.append(text[len(body):])
+        else:
+            self._content(text)
+
+    def _control(self, chars):
+        # 3. 제어 문자는 출력하지 않지만, 공백이 아닌 제어 문자는 strip 기준으로는 내용에 해당
+        if self._lstrip_output and not self._started:
+            return
+        if not _WS_CONTROL_CHARS.issuperset(chars):
+            self._content("")
+
+    def _ampersand(self):
+        # 4. '&' 뒤가 '#' 또는 'amp;'가 아니면 '&amp;'로 변환 (뒤따르는 출력으로 판정)
+        self._content("")
+        if self._amp is not None:
+            self._out.append("&amp;" + self._amp)
+        self._amp = ""
+
+    def _content(self, piece):
+        self._started = True
+        if self._held:
+            held = self._held
+            self._held = []
+            for text in held:
+                self._emit(text)
+        if piece:
+            self._emit(piece)
+
+    def _emit(self, piece):
+        if self._amp is None:
+            self._out.append(piece)
+            return
+        head = self._amp + piece[:4]
+        if head[0] == "#" or head.startswith("amp;"):
+            ampersand = "&"
+        elif len(head) < 4 and "amp;".startswith(head):
+            self._amp = head
+            return
+        else:
+            ampersand = "&amp;"
+        self._out.append(ampersand + self._amp)
+        self._out.append(piece)
+        self._amp = None
 
-    if xml_declaration:
-        # 원래 선언 뒤에 공백이나 개행이 있었다면 그것을 유지
-        # 새로운 시작 문자열 앞에도 개행을 넣어 줄 맞춤을 시도합니다.
-        cleaned_xml_string = xml_declaration + "\n" + cleaned_xml_string.lstrip()
-    # print(cleaned_xml_string)
 
-    return cleaned_xml_string
+def preprocess_xml_content(xml_string):
+    """
+    DART XML 문자열을 파싱 가능한 형태로 정제합니다.
+    화이트리스트 외 태그와 '<', '>'는 이스케이프하고 SPAN/A 태그와 제어 문자는 제거합니다.
+    """
+    with profiling.stage("preprocess"):
+        sanitizer = XmlSanitizer()
+        return sanitizer.feed(xml_string) + sanitizer.close()
+
+
+# 불필요한 속성 제거 목록 (소문자로 비교)
+# LLM에게는 불필요하거나 시각적 정보인 속성들
+TABLE_ATTRS_TO_REMOVE = frozenset([
+    "width",
+    "height",
+    "align",
+    "valign",
+    "aclass",
+    "afixtable",
+    "acopy",
+    "adelete",
+    "aupdatecont",
+    "acopycol",
+    "amovecol",
+    "adeletecol",
+    "usermark",
+    "acode",
+    "aunit",
+    "aunitvalue",
+    "refno",
+    "aassocnote",
+    "atoc",
+    "atocid",
+    "adelim",  # DART 특유의 메타데이터 속성들
+    "border",
+    "frame",
+    "rules",  # 요청에 따라 추가
+    "style",
+    "class",
+    "id",  # 일반적으로 HTML에서 불필요한 속성 추가
+])
 
 
 def clean_table_html_for_llm(html_string):
@@ -91,38 +266,6 @@ def clean_table_html_for_llm(html_string):
     """
     soup = BeautifulSoup(html_string, "html.parser")
 
-    # 불필요한 속성 제거 목록 (소문자로 비교)
-    # LLM에게는 불필요하거나 시각적 정보인 속성들
-    attrs_to_remove = [
-        "width",
-        "height",
-        "align",
-        "valign",
-        "aclass",
-        "afixtable",
-        "acopy",
-        "adelete",
-        "aupdatecont",
-        "acopycol",
-        "amovecol",
-        "adeletecol",
-        "usermark",
-        "acode",
-        "aunit",
-        "aunitvalue",
-        "refno",
-        "aassocnote",
-        "atoc",
-        "atocid",
-        "adelim",  # DART 특유의 메타데이터 속성들
-        "border",
-        "frame",
-        "rules",  # 요청에 따라 추가
-        "style",
-        "class",
-        "id",  # 일반적으로 HTML에서 불필요한 속성 추가
-    ]
-
     for tag in soup.find_all(True):  # 모든 태그 순회 (자신 포함)
         # 비표준 태그 (TE, TU)를 표준 TD로 변환
         if tag.name == "te" or tag.name == "tu":
@@ -130,7 +273,7 @@ def clean_table_html_for_llm(html_string):
 
         # 불필요한 속성 제거
         for attr_name in list(tag.attrs.keys()):
-            if attr_name.lower() in attrs_to_remove:
+            if attr_name.lower() in TABLE_ATTRS_TO_REMOVE:
                 del tag.attrs[attr_name]
 
     cleaned_html = str(soup)
@@ -141,6 +284,107 @@ def clean_table_html_for_llm(html_string):
     return cleaned_html.strip()  # 최종적으로 앞뒤 공백 제거
 
 
+# BeautifulSoup(html.parser)가 빈 요소(<col/>)로 출력하는 태그
+_VOID_TAGS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr",
+    "image", "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid",
+    "param", "source", "spacer", "track", "wbr",
+})
+# BeautifulSoup가 공백 기준 리스트로 다루는 속성 (값의 연속 공백이 하나로 합쳐짐)
+_LIST_ATTRS = frozenset({"class", "accesskey", "dropzone"})
+_CELL_LIST_ATTRS = frozenset({"headers"})
+# BeautifulSoup가 하나의 공백/개행으로 줄이는 공백 문자
+_ASCII_SPACES = frozenset("\x20\x0a\x09\x0c\x0d")
+
+
+def clean_table_element_for_llm(element):
+    """
+    파싱된 TABLE 엘리먼트를 직접 직렬화하며 clean_table_html_for_llm과 같은 HTML을 만듭니다.
+    문자열로 변환한 뒤 BeautifulSoup로 다시 파싱하는 과정을 생략합니다.
+    """
+    parts = []
+    if not _serialize_table_element(element, parts):
+        # 빈 요소 태그에 내용이 있는 등 BeautifulSoup가 구조를 바꾸는 경우는 기존 경로로 처리
+        table_html = ET.tostring(element, encoding="utf-8").decode("utf-8").strip()
+        return clean_table_html_for_llm(table_html)
+
+    # ET.tostring은 TABLE 뒤의 tail 텍스트까지 포함하므로 동일하게 붙임
+    if element.tail:
+        _append_table_text(element.tail.rstrip(), parts)
+
+    cleaned_html = "".join(parts)
+    cleaned_html = cleaned_html.replace("\n", "")  # 모든 줄바꿈 제거
+    cleaned_html = cleaned_html.replace('\\', '')  # 모든 역슬래시 제거
+    return cleaned_html.strip()
+
+
+def _serialize_table_element(element, parts):
+    """엘리먼트를 정제된 HTML로 parts에 추가합니다. 기존 경로가 필요하면 False를 반환합니다."""
+    name = element.tag.lower()
+    is_void = name in _VOID_TAGS
+    if (is_void and (element.text or len(element))) or (name == "title" and len(element)):
+        return False
+
+    attrs = {}
+    for attr_name, value in element.items():
+        attr_name = attr_name.lower()
+        if attr_name in _LIST_ATTRS or (attr_name in _CELL_LIST_ATTRS and name in ("td", "th")):
+            value = " ".join(value.split())
+        attrs[attr_name] = value
+
+    # 비표준 태그 (TE, TU)를 표준 TD로 변환
+    if name == "te" or name == "tu":
+        name = "td"
+
+    start_tag = ["<", name]
+    for attr_name, value in sorted(attrs.items()):
+        if attr_name in TABLE_ATTRS_TO_REMOVE:
+            continue
+        start_tag.append(f" {attr_name}={_quote_attr_value(_escape_html(value))}")
+
+    if is_void:
+        start_tag.append("/>")
+        parts.append("".join(start_tag))
+        return True
+
+    start_tag.append(">")
+    parts.append("".join(start_tag))
+    _append_table_text(element.text, parts)
+    for child in element:
+        if not _serialize_table_element(child, parts):
+            return False
+        _append_table_text(child.tail, parts)
+    parts.append(f"</{name}>")
+    return True
+
+
+def _append_table_text(text, parts):
+    if not text:
+        return
+    # 공백 문자로만 이루어진 텍스트는 BeautifulSoup처럼 개행 또는 공백 하나로 줄임
+    if _ASCII_SPACES.issuperset(text):
+        text = "\n" if "\n" in text else " "
+    parts.append(_escape_html(text))
+
+
+def _escape_html(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _quote_attr_value(value):
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', "&quot;") + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
 def extract_content_recursive(element, collected_items):
     """
     주어진 Element와 그 하위 Element들을 재귀적으로 탐색하여
@@ -148,9 +392,8 @@ def extract_content_recursive(element, collected_items):
     """
     # BORDER="1"인 TABLE을 발견하면 HTML로 추출하고 이 가지의 탐색은 중단
     if element.tag == "TABLE" and element.get("BORDER") == "1":
-        table_html = ET.tostring(element, encoding="utf-8").decode("utf-8").strip()
-        cleaned_table_html = clean_table_html_for_llm(
-            table_html
+        cleaned_table_html = clean_table_element_for_llm(
+            element
         )  # LLM을 위해 HTML 정제
         collected_items.append(
             {"type": "table", "content": cleaned_table_html}
@@ -185,99 +428,307 @@ def parse_darter_xml(xml_content, file_name):
     processed_xml_content = preprocess_xml_content(xml_content)
 
     try:
-        root = ET.fromstring(processed_xml_content)
+        with profiling.stage("tree_parse"):
+            root = ET.fromstring(processed_xml_content)
     except ET.ParseError as e:
         # 오류 처리 로직은 기존과 동일
         print(f"XML 파싱 오류 발생: {e}")
         return None
 
-    # 최상위 레벨 데이터 추출 (기존 코드와 동일)
-    doc_id = file_name.split(".")[0]
-    pub_date = file_name[:8]
-
     # ... (doc_name, doc_code, corp_code, corp_name 추출 로직) ...
+    header = {}
     doc_name_element = root.find("DOCUMENT-NAME")
-    doc_name = doc_name_element.text.strip() if doc_name_element is not None else ""
-    doc_code = doc_name_element.get("ACODE") if doc_name_element is not None else ""
+    if doc_name_element is not None:
+        _read_header_element(doc_name_element, header)
     company_name_element = root.find("COMPANY-NAME")
-    corp_code = (
-        company_name_element.get("AREGCIK") if company_name_element is not None else ""
-    )
-    corp_name = (
-        company_name_element.text.strip() if company_name_element is not None else ""
-    )
-    # ...
-
-    report_data = {
-        "doc_id": doc_id,
-        "doc_name": doc_name,
-        "doc_code": doc_code,
-        "pub_date": pub_date,
-        "corp_code": corp_code,
-        "corp_name": corp_name,
-        "sections": [],
-    }
+    if company_name_element is not None:
+        _read_header_element(company_name_element, header)
 
+    sections = []
     sec_id_counter = 0
 
     # 1. SECTION-1 엘리먼트를 찾아서 순회
-    section1_elements = root.findall(".//SECTION-1")
-
-    for section1_element in section1_elements:
-        # SECTION-1의 제목을 추출
-        title1_element = section1_element.find("TITLE")
-
-        if title1_element is not None and title1_element.text and title1_element.text.strip():
-            sec_id_counter += 1
-            section1_data = {
-                "sec_id": f"{sec_id_counter}",
-                "sec_title": title1_element.text.strip(),
-                "sec_content": "",
-            }
-
-            collected_items_for_section1 = []
-            
-            # SECTION-1의 자식들을 순회 (SECTION-2 제외)
-            for child_of_section1 in section1_element:
-                if child_of_section1.tag == "SECTION-2":
-                    # SECTION-2는 별도로 처리하므로 건너뛰기
-                    continue
-                if child_of_section1.tag == "TITLE":
+    with profiling.stage("extract"):
+        for section1_element in root.findall(".//SECTION-1"):
+            for sec_title, sec_content in _iter_section1_items(section1_element):
+                sec_id_counter += 1
+                sections.append(_section_data(sec_id_counter, sec_title, sec_content))
+
+    return _report_data(file_name, header, sections)
+
+
+# 스트리밍 파싱 시 한 번에 읽는 바이트 수
+STREAM_CHUNK_SIZE = 1 << 20
+
+# 인코딩 판별에 사용하는 앞부분 바이트 수 / XML 선언의 encoding 속성
+_ENCODING_DETECT_BYTES = 1024
+_XML_DECL_ENCODING_RE = re.compile(rb"""^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._-]+)["']""")
+# UTF-8로 디코딩되지 않는 문서에 시도할 인코딩 (cp949는 EUC-KR의 상위 집합)
+FALLBACK_ENCODING = "cp949"
+
+
+def detect_xml_encoding(head):
+    """
+    문서 앞부분 바이트로 인코딩을 판별합니다. BOM, XML 선언의 encoding 속성 순으로 보고
+    둘 다 없으면 UTF-8로 봅니다. EUC-KR 계열은 확장 완성형까지 읽도록 cp949로 바꿉니다.
+    """
+    head = bytes(head[:_ENCODING_DETECT_BYTES])
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+
+    match = _XML_DECL_ENCODING_RE.match(head)
+    if match:
+        try:
+            name = codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            print(f"Warning: 알 수 없는 XML 인코딩 '{match.group(1).decode('ascii')}', UTF-8로 처리합니다.")
+            return "utf-8"
+        return FALLBACK_ENCODING if name == "euc_kr" else name
+    return "utf-8"
+
+
+def parse_darter_xml_bytes(data, file_name, chunk_size=None):
+    """
+    bytes, bytearray, memoryview, mmap 등 메모리에 있는 원문 바이트를 파싱합니다.
+    원문 전체를 문자열로 디코딩하지 않고 조각 단위로 디코딩하며 정제/파싱하고
+    결과는 parse_darter_xml과 같습니다.
+    인코딩은 detect_xml_encoding으로 판별하고, UTF-8 디코딩에 실패하면 cp949로 다시 시도합니다.
+    """
+    with memoryview(data) as view:
+        encoding = detect_xml_encoding(view)
+        candidates = [encoding]
+        if encoding in ("utf-8", "utf-8-sig"):
+            candidates.append(FALLBACK_ENCODING)
+        return _parse_view(view, file_name, candidates, chunk_size)
+
+
+def _parse_view(view, file_name, candidates, chunk_size):
+    for candidate in candidates:
+        header = {}
+        try:
+            with profiling.stage("parse_bytes"):
+                sections = list(iter_darter_sections(view, header, chunk_size, encoding=candidate))
+        except UnicodeDecodeError as e:
+            print(f"Warning: {file_name}을(를) {candidate}로 디코딩할 수 없습니다: {e}")
+            continue
+        except ET.ParseError as e:
+            print(f"XML 파싱 오류 발생: {e}")
+            return None
+        profiling.record(encoding=candidate)
+        return _report_data(file_name, header, sections)
+
+    print(f"Error: {file_name}의 인코딩을 판별할 수 없어 건너뜁니다.")
+    return None
+
+
+def parse_darter_xml_stream(source, file_name, chunk_size=None):
+    """
+    파일 경로나 바이트 스트림에서 DART 공시보고서를 조각 단위로 읽어 파싱합니다.
+    원문 문자열, 정제된 문자열, 전체 트리를 동시에 메모리에 올리지 않으며
+    결과는 parse_darter_xml과 같습니다.
+    인코딩은 첫 조각으로 판별합니다 (되돌려 읽을 수 없어 다른 인코딩으로 재시도하지 않음).
+    """
+    header = {}
+    try:
+        # 정제/트리 파싱/추출이 조각 단위로 섞여 있어 한 단계로 측정
+        with profiling.stage("parse_stream"):
+            sections = list(iter_darter_sections(source, header, chunk_size))
+    except ET.ParseError as e:
+        print(f"XML 파싱 오류 발생: {e}")
+        return None
+    except UnicodeDecodeError as e:
+        print(f"Warning: {file_name}을(를) 디코딩할 수 없습니다: {e}")
+        return None
+
+    return _report_data(file_name, header, sections)
+
+
+def iter_darter_sections(source, header=None, chunk_size=None, encoding=None):
+    """
+    파일 경로, 바이트 스트림 또는 bytes 계열 버퍼를 점진적으로 파싱하며 섹션 dict를 순서대로 yield 합니다.
+    SECTION-1은 종료 태그가 닫히는 즉시 하위 SECTION-2와 함께 내보내고 처리한 하위 트리는 비웁니다.
+    header dict를 넘기면 doc_name, doc_code, corp_code, corp_name을 채워 줍니다.
+    encoding을 생략하면 첫 조각으로 판별합니다 (detect_xml_encoding).
+    XML이 올바르지 않으면 ET.ParseError, 디코딩할 수 없으면 UnicodeDecodeError를 발생시킵니다.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    section1_depth = 0  # 루트를 제외한 열린 SECTION-1 개수
+    section2_cache = {}  # 미리 처리하고 비운 SECTION-2 -> (제목, 내용) 또는 None
+    sec_id_counter = 0
+
+    def handle_events():
+        nonlocal section1_depth, sec_id_counter
+        for event, element in parser.read_events():
+            if event == "start":
+                if stack and element.tag == "SECTION-1":
+                    section1_depth += 1
+                stack.append(element)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if header is not None and parent is not None and parent is stack[0]:
+                _read_header_element(element, header)
+
+            if element.tag == "SECTION-1" and parent is not None:
+                section1_depth -= 1
+                if section1_depth:
                     continue
-                extract_content_recursive(child_of_section1, collected_items_for_section1)
-            
-            # SECTION-1의 콘텐츠를 합치고 저장
-            section1_data["sec_content"] = _combine_contents(collected_items_for_section1)
-            report_data["sections"].append(section1_data)
+                # 최상위 SECTION-1: 자신과 하위 SECTION-1을 문서 순서대로 처리
+                for section1_element in [element, *element.iterfind(".//SECTION-1")]:
+                    for sec_title, sec_content in _iter_section1_items(section1_element, section2_cache):
+                        sec_id_counter += 1
+                        yield _section_data(sec_id_counter, sec_title, sec_content)
+                section2_cache.clear()
+                element.clear()
+            elif section1_depth == 0:
+                # 섹션 밖에서 끝난 엘리먼트는 더 이상 필요 없음
+                element.clear()
+            elif (
+                section1_depth == 1
+                and element.tag == "SECTION-2"
+                and parent.tag == "SECTION-1"
+                and element.find(".//SECTION-1") is None
+            ):
+                # SECTION-1의 직계 SECTION-2는 다른 섹션 내용에 포함되지 않으므로 미리 처리하고 비움
+                title = _section_title(element)
+                section2_cache[element] = (
+                    (title, _section_content(element)) if title is not None else None
+                )
+                element.clear()
 
-        # 2. SECTION-1 아래에 있는 SECTION-2 엘리먼트를 찾아서 순회
-        section2_elements = section1_element.findall("./SECTION-2")
+    chunks = _iter_sanitized_chunks(source, chunk_size or STREAM_CHUNK_SIZE, encoding)
+    try:
+        for text in chunks:
+            parser.feed(text)
+            yield from handle_events()
+    finally:
+        # 파싱 오류의 traceback이 조각 생성기(와 버퍼 조각)를 붙잡고 있지 않도록 바로 닫음
+        chunks.close()
+    parser.close()
+    yield from handle_events()
+
+
+def _iter_sanitized_chunks(source, chunk_size, encoding=None):
+    """파일 경로, 바이트 스트림 또는 버퍼를 조각 단위로 디코딩하며 정제된 문자열 조각을 yield 합니다."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # 버퍼는 복사 없이 memoryview 조각으로 나눠 디코더에 넘기고, 끝나면 모든 조각을 해제
+        # (mmap은 내보낸 버퍼가 남아 있으면 닫을 수 없음)
+        with memoryview(source) as view:
+            yield from _sanitize_chunks(_iter_view_chunks(view, chunk_size), encoding)
+        return
+    if hasattr(source, "read"):
+        yield from _sanitize_chunks(iter(lambda: source.read(chunk_size), b""), encoding)
+        return
+    with open(source, "rb") as f:
+        yield from _sanitize_chunks(iter(lambda: f.read(chunk_size), b""), encoding)
+
+
+def _iter_view_chunks(view, chunk_size):
+    """memoryview를 chunk_size 조각으로 yield 하고, 다음 조각으로 넘어가거나 닫힐 때 이전 조각을 해제합니다."""
+    for start in range(0, len(view), chunk_size):
+        with view[start:start + chunk_size] as chunk:
+            yield chunk
+
+
+def _sanitize_chunks(chunks, encoding=None):
+    decoder = None
+    sanitizer = XmlSanitizer()
+    for chunk in chunks:
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(encoding or detect_xml_encoding(chunk))()
+        text = sanitizer.feed(decoder.decode(chunk))
+        if text:
+            yield text
+    text = sanitizer.feed(decoder.decode(b"", final=True)) if decoder is not None else ""
+    text += sanitizer.close()
+    if text:
+        yield text
+
+
+def _read_header_element(element, header):
+    """루트 바로 아래 DOCUMENT-NAME / COMPANY-NAME에서 보고서 정보를 읽어 header에 채웁니다."""
+    if element.tag == "DOCUMENT-NAME" and "doc_name" not in header:
+        header["doc_name"] = element.text.strip()
+        header["doc_code"] = element.get("ACODE")
+    elif element.tag == "COMPANY-NAME" and "corp_name" not in header:
+        header["corp_code"] = element.get("AREGCIK")
+        header["corp_name"] = element.text.strip()
+
+
+def _report_data(file_name, header, sections):
+    # 최상위 레벨 데이터 추출 (기존 코드와 동일)
+    doc_id = file_name.split(".")[0]
+    pub_date = file_name[:8]
 
-        for section2_element in section2_elements:
-            # SECTION-2의 제목을 추출
-            title2_element = section2_element.find("TITLE")
+    if profiling.is_enabled():
+        profiling.record(
+            sections=len(sections),
+            tables=sum(section["sec_content"].count("<table") for section in sections),
+            output_bytes=sum(len(section["sec_content"].encode("utf-8")) for section in sections),
+        )
 
-            if title2_element is not None and title2_element.text and title2_element.text.strip():
-                sec_id_counter += 1
-                section2_data = {
-                    "sec_id": f"{sec_id_counter}",
-                    "sec_title": title2_element.text.strip(),
-                    "sec_content": "",
-                }
-
-                collected_items_for_section2 = []
-                
-                # SECTION-2의 자식들을 순회 (SECTION-3부터는 모두 콘텐츠)
-                for child_of_section2 in section2_element:
-                    if child_of_section2.tag == "TITLE":
-                        continue
-                    extract_content_recursive(child_of_section2, collected_items_for_section2)
-                
-                # SECTION-2의 콘텐츠를 합치고 저장
-                section2_data["sec_content"] = _combine_contents(collected_items_for_section2)
-                report_data["sections"].append(section2_data)
-
-    return report_data
+    return {
+        "doc_id": doc_id,
+        "doc_name": header.get("doc_name", ""),
+        "doc_code": header.get("doc_code", ""),
+        "pub_date": pub_date,
+        "corp_code": header.get("corp_code", ""),
+        "corp_name": header.get("corp_name", ""),
+        "sections": sections,
+    }
+
+
+def _section_data(sec_id, sec_title, sec_content):
+    return {
+        "sec_id": f"{sec_id}",
+        "sec_title": sec_title,
+        "sec_content": sec_content,
+    }
+
+
+def _iter_section1_items(section1_element, section2_cache=None):
+    """
+    SECTION-1과 그 아래 SECTION-2의 (제목, 내용)을 순서대로 yield 합니다.
+    제목이 없는 섹션은 건너뜁니다.
+    """
+    # SECTION-1의 제목을 추출
+    title1 = _section_title(section1_element)
+    if title1 is not None:
+        # SECTION-1의 자식들을 순회 (SECTION-2는 별도로 처리하므로 제외)
+        yield title1, _section_content(section1_element, skip_tag="SECTION-2")
+
+    # 2. SECTION-1 아래에 있는 SECTION-2 엘리먼트를 찾아서 순회
+    for section2_element in section1_element.findall("./SECTION-2"):
+        if section2_cache is not None and section2_element in section2_cache:
+            item = section2_cache[section2_element]
+            if item is not None:
+                yield item
+            continue
+        title2 = _section_title(section2_element)
+        if title2 is not None:
+            # SECTION-2의 자식들을 순회 (SECTION-3부터는 모두 콘텐츠)
+            yield title2, _section_content(section2_element)
+
+
+def _section_title(section_element):
+    title_element = section_element.find("TITLE")
+    if title_element is not None and title_element.text and title_element.text.strip():
+        return title_element.text.strip()
+    return None
+
+
+def _section_content(section_element, skip_tag=None):
+    collected_items = []
+    for child in section_element:
+        if child.tag == "TITLE" or child.tag == skip_tag:
+            continue
+        extract_content_recursive(child, collected_items)
+    # 섹션의 콘텐츠를 합치고 저장
+    return _combine_contents(collected_items)
 
 def _combine_contents(items):
     """
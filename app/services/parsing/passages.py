@@ -0,0 +1,143 @@
+# passages.py
+# 섹션 본문(sec_content)을 검색용 작은 패시지로 나누기
+# 섹션 하나가 수 MB인 사업보고서도 검색/하이라이트가 패시지 단위로 동작하게 한다.
+# 패시지는 보고서 문서에 넣지 않고 패시지 인덱스(rpt_*_psg)에 문서 하나씩 적재한다 (본문이 한 문서에 두 번 실리지 않도록).
+
+import re
+
+# 패시지 기본 최대 길이 (문자 수)
+DEFAULT_PASSAGE_MAX_CHARS = 2000
+
+# 정제된 테이블의 시작/끝 태그 (clean_table_element_for_llm 출력은 소문자)
+_TABLE_TAG_RE = re.compile(r"<(/?)table\b[^>]*>")
+# 텍스트 분할 후보: 문장 끝(마침표/물음표/느낌표 뒤 공백) > 공백
+_SENTENCE_END_RE = re.compile(r"[.?!。](?= )")
+# 큰 테이블 분할 후보: 행 끝 > 셀 끝 > 태그 끝
+_TABLE_SPLIT_TAGS = ("</tr>", "</td>", "</th>", ">")
+
+
+def split_passages(content, max_chars=DEFAULT_PASSAGE_MAX_CHARS):
+    """
+    섹션 본문을 최대 max_chars 길이의 (start, end) 구간 목록으로 나눕니다.
+    content[start:end]가 곧 패시지 내용이며 앞뒤 공백은 구간에서 제외됩니다.
+    테이블은 가능한 한 통째로 한 패시지에 넣고, max_chars보다 큰 테이블만 행 경계에서 자릅니다.
+    텍스트는 문장 끝, 공백 순으로 경계를 찾아 자릅니다.
+    """
+    spans = []
+    current_start = current_end = None
+
+    def flush():
+        nonlocal current_start, current_end
+        if current_start is not None:
+            _append_span(content, current_start, current_end, spans)
+        current_start = current_end = None
+
+    for start, end, is_table in _iter_blocks(content):
+        if current_start is not None and end - current_start <= max_chars:
+            current_end = end
+            continue
+        flush()
+        if end - start <= max_chars:
+            current_start, current_end = start, end
+            continue
+        # 블록 하나가 max_chars보다 크면 경계를 찾아 잘라 넣고 마지막 조각은 다음 블록과 합칠 수 있게 둠
+        pieces = list(_split_block(content, start, end, max_chars, is_table))
+        for piece_start, piece_end in pieces[:-1]:
+            _append_span(content, piece_start, piece_end, spans)
+        current_start, current_end = pieces[-1]
+    flush()
+    return spans
+
+
+def build_passages(parsed_data, max_chars=DEFAULT_PASSAGE_MAX_CHARS):
+    """
+    파싱 결과의 섹션마다 패시지를 만들어 목록으로 반환합니다.
+    passage_id는 "{doc_id}_{sec_id}_{순번}"으로 같은 문서를 다시 파싱해도 바뀌지 않습니다.
+    """
+    passages = []
+    doc_id = parsed_data.get("doc_id", "")
+    for section in parsed_data.get("sections", []):
+        sec_content = section.get("sec_content") or ""
+        for number, (start, end) in enumerate(split_passages(sec_content, max_chars), start=1):
+            passages.append({
+                "passage_id": f"{doc_id}_{section['sec_id']}_{number}",
+                "sec_id": section["sec_id"],
+                "sec_title": section.get("sec_title"),
+                "start": start,
+                "end": end,
+                "content": sec_content[start:end],
+            })
+    return passages
+
+
+def remove_tables(content):
+    """본문에서 테이블(중첩 포함)을 빼고 텍스트 블록만 남깁니다 (테이블 없이 내보낼 때)."""
+    return "\n".join(
+        content[start:end].strip() for start, end, is_table in _iter_blocks(content)
+        if not is_table and content[start:end].strip()
+    )
+
+
+def _iter_blocks(content):
+    """본문을 (start, end, 테이블 여부) 블록으로 나눕니다. 중첩 테이블은 바깥 테이블에 포함됩니다."""
+    position = 0
+    depth = 0
+    table_start = None
+    for match in _TABLE_TAG_RE.finditer(content):
+        if match.group(1):  # </table>
+            if depth == 0:
+                continue
+            depth -= 1
+            if depth == 0:
+                yield table_start, match.end(), True
+                position = match.end()
+        else:
+            if depth == 0:
+                if match.start() > position:
+                    yield position, match.start(), False
+                table_start = match.start()
+            depth += 1
+    if depth:
+        # 닫히지 않은 테이블은 끝까지 테이블로 취급
+        yield table_start, len(content), True
+    elif position < len(content):
+        yield position, len(content), False
+
+
+def _split_block(content, start, end, max_chars, is_table):
+    """max_chars보다 큰 블록을 경계 후보에서 잘라 (start, end) 조각을 yield 합니다."""
+    while end - start > max_chars:
+        limit = start + max_chars
+        cut = _find_cut(content, start, limit, is_table)
+        yield start, cut
+        start = cut
+    yield start, end
+
+
+def _find_cut(content, start, limit, is_table):
+    # 너무 앞에서 자르면 조각이 잘게 쪼개지므로 구간의 절반 이후에서만 경계를 찾음
+    minimum = start + (limit - start) // 2
+    if is_table:
+        for tag in _TABLE_SPLIT_TAGS:
+            index = content.rfind(tag, minimum, limit)
+            if index != -1:
+                return index + len(tag)
+        return limit
+
+    best = None
+    for match in _SENTENCE_END_RE.finditer(content, minimum, limit):
+        best = match.end()
+    if best is not None:
+        return best
+    index = content.rfind(" ", minimum, limit)
+    return index if index != -1 else limit
+
+
+def _append_span(content, start, end, spans):
+    # 패시지 앞뒤 공백 제외
+    while start < end and content[start] == " ":
+        start += 1
+    while end > start and content[end - 1] == " ":
+        end -= 1
+    if start < end:
+        spans.append((start, end))
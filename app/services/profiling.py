@@ -0,0 +1,319 @@
+# profiling.py
+# 다운로드 → 압축 해제 → 전처리 → 파싱 → bulk 단계별 시간 측정 훅
+# 측정이 꺼져 있으면(기본값) 모든 훅은 아무것도 하지 않는 컨텍스트를 바로 반환한다.
+#
+#   with profiling.document(rcept_no):
+#       with profiling.stage("download"):
+#           ...
+#       profiling.record(download_bytes=len(data))
+#   profiling.report()
+
+import contextvars
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+_NULL_CONTEXT = nullcontext()
+_EXHAUSTED = object()
+_current_record = contextvars.ContextVar("profiling_current_record", default=None)
+
+# 히스토그램 구간 상한 (ms)
+_HISTOGRAM_BOUNDS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 30000)
+
+
+class DocumentRecord:
+    """문서 하나의 단계별 소요 시간(초)과 크기/개수 정보"""
+
+    __slots__ = ("doc_id", "total", "stages", "counts")
+
+    def __init__(self, doc_id, total=0.0, stages=None, counts=None):
+        self.doc_id = doc_id
+        self.total = total
+        self.stages = stages or {}
+        self.counts = counts or {}
+
+    def to_dict(self):
+        return {"doc_id": self.doc_id, "total": self.total, "stages": self.stages, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["doc_id"], data["total"], data["stages"], data["counts"])
+
+
+class RunProfiler:
+    """
+    한 번의 실행(run) 동안 문서별 측정값을 모아 마지막에 느린 문서 목록과 단계별 분포를 출력합니다.
+    cprofile_threshold(초)가 0보다 크면 문서마다 cProfile을 켜 두고,
+    처리 시간이 임계값을 넘은 문서만 output_dir에 .prof 파일로 남깁니다.
+    """
+
+    def __init__(self, slowest_n=10, cprofile_threshold=0.0, output_dir=None):
+        self.slowest_n = slowest_n
+        self.cprofile_threshold = cprofile_threshold
+        self.output_dir = output_dir
+        self.records = []
+        self.run_stages = {}  # 문서에 속하지 않는 단계 (예: 디렉터리 인제스트 전체 bulk)
+        self._lock = threading.Lock()
+
+    def config(self):
+        """프로세스 풀 워커에 같은 설정을 넘기기 위한 값"""
+        return {
+            "slowest_n": self.slowest_n,
+            "cprofile_threshold": self.cprofile_threshold,
+            "output_dir": self.output_dir,
+        }
+
+    @contextmanager
+    def document(self, doc_id, collect=True):
+        """
+        문서 하나의 측정 범위. 안쪽의 stage()/record() 값이 이 문서에 기록됩니다.
+        collect=False면 결과를 모으지 않고 기록만 반환합니다 (워커 프로세스에서 부모로 넘길 때).
+        이미 문서 범위 안이면 바깥 문서에 합산합니다.
+        """
+        if _current_record.get() is not None:
+            yield _current_record.get()
+            return
+
+        record = DocumentRecord(doc_id)
+        token = _current_record.set(record)
+        profiler = self._start_cprofile()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.total = time.perf_counter() - start
+            _current_record.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                if record.total >= self.cprofile_threshold:
+                    self._dump_cprofile(profiler, record)
+            if collect:
+                self.add_record(record)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            record = _current_record.get()
+            if record is not None:
+                record.stages[name] = record.stages.get(name, 0.0) + elapsed
+            else:
+                with self._lock:
+                    self.run_stages[name] = self.run_stages.get(name, 0.0) + elapsed
+
+    def record(self, **counts):
+        record = _current_record.get()
+        if record is not None:
+            record.counts.update(counts)
+
+    def merge(self, data):
+        """다른 스레드/프로세스에서 잰 기록(to_dict 결과)의 단계 시간과 개수를 현재 문서에 더합니다."""
+        record = _current_record.get()
+        if record is None or not data:
+            return
+        for name, seconds in data["stages"].items():
+            record.stages[name] = record.stages.get(name, 0.0) + seconds
+        record.counts.update(data["counts"])
+
+    def add_record(self, record):
+        if isinstance(record, dict):
+            record = DocumentRecord.from_dict(record)
+        with self._lock:
+            self.records.append(record)
+
+    def iter_stage(self, iterable, name):
+        """제너레이터가 다음 항목을 만드는 데 걸린 시간을 name 단계로 누적합니다."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                item = next(iterator, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            yield item
+
+    def report(self, reset=False):
+        """
+        느린 문서 상위 N개, 단계별 통계와 히스토그램을 출력하고 output_dir이 있으면 JSON으로 저장합니다.
+        reset=True면 출력한 기록을 비웁니다 (서버처럼 오래 떠 있는 프로세스용).
+        """
+        with self._lock:
+            records = list(self.records)
+            run_stages = dict(self.run_stages)
+            if reset:
+                self.records = []
+                self.run_stages = {}
+
+        print(f"\n===== Profiling report: {len(records)} documents =====")
+        if run_stages:
+            print("-- run stages")
+            for name, seconds in run_stages.items():
+                print(f"{name:<24}{seconds:>10.3f} s")
+
+        stage_times = {}
+        for record in records:
+            stage_times.setdefault("total", []).append(record.total)
+            for name, seconds in record.stages.items():
+                stage_times.setdefault(name, []).append(seconds)
+
+        if stage_times:
+            print("-- per-document stages (ms)")
+            print(f"{'stage':<24}{'count':>7}{'sum s':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+            for name, values in stage_times.items():
+                values.sort()
+                print(
+                    f"{name:<24}{len(values):>7}{sum(values):>10.3f}"
+                    f"{_percentile(values, 50) * 1000:>10.1f}{_percentile(values, 90) * 1000:>10.1f}"
+                    f"{_percentile(values, 99) * 1000:>10.1f}{values[-1] * 1000:>10.1f}"
+                )
+
+            print(f"-- slowest {self.slowest_n} documents")
+            for record in sorted(records, key=lambda r: r.total, reverse=True)[: self.slowest_n]:
+                stages = " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in record.stages.items())
+                counts = " ".join(f"{name}={value}" for name, value in record.counts.items())
+                print(f"{record.doc_id:<28}{record.total * 1000:>10.0f}ms  {stages}  {counts}")
+
+            for name, values in stage_times.items():
+                print(f"-- histogram: {name}")
+                for label, count in _histogram(values):
+                    print(f"{label:>12} {count:>6} {'#' * min(count, 60)}")
+
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"run-{datetime.now():%Y%m%d-%H%M%S}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"run_stages": run_stages, "documents": [record.to_dict() for record in records]},
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            print(f"Profiling records saved to {path}")
+
+    def _start_cprofile(self):
+        if self.cprofile_threshold <= 0:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 켜져 있음 (동시에 처리 중인 다른 문서)
+            return None
+        return profiler
+
+    def _dump_cprofile(self, profiler, record):
+        output_dir = self.output_dir or "."
+        os.makedirs(output_dir, exist_ok=True)
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(record.doc_id))
+        path = os.path.join(output_dir, f"{safe_id}.prof")
+        profiler.dump_stats(path)
+        print(f"Slow document {record.doc_id} ({record.total:.1f}s): cProfile saved to {path}")
+
+
+def _percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+def _histogram(values):
+    counts = [0] * (len(_HISTOGRAM_BOUNDS_MS) + 1)
+    for seconds in values:
+        ms = seconds * 1000
+        for i, bound in enumerate(_HISTOGRAM_BOUNDS_MS):
+            if ms < bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<{bound}ms" for bound in _HISTOGRAM_BOUNDS_MS] + [f">={_HISTOGRAM_BOUNDS_MS[-1]}ms"]
+    return [(label, count) for label, count in zip(labels, counts) if count]
+
+
+_profiler = None
+
+
+def enable_profiling(slowest_n=None, cprofile_threshold=None, output_dir=None):
+    """이번 실행에서 측정을 켭니다. 인자를 생략하면 settings 값을 사용합니다."""
+    global _profiler
+    # 파서 모듈이 설정(.env) 없이도 import 되도록 필요할 때만 읽음
+    from app.config import settings
+
+    _profiler = RunProfiler(
+        slowest_n=settings.PROFILE_SLOWEST_N if slowest_n is None else slowest_n,
+        cprofile_threshold=settings.PROFILE_CPROFILE_THRESHOLD_SEC if cprofile_threshold is None else cprofile_threshold,
+        output_dir=settings.PROFILE_OUTPUT_DIR if output_dir is None else output_dir,
+    )
+    return _profiler
+
+
+def disable_profiling():
+    global _profiler
+    _profiler = None
+
+
+def init_worker(config):
+    """프로세스 풀 initializer: 부모 프로세스의 측정 설정을 워커에 적용"""
+    if config is None:
+        disable_profiling()
+    else:
+        enable_profiling(**config)
+
+
+def get_profiler():
+    return _profiler
+
+
+def is_enabled():
+    return _profiler is not None
+
+
+def document(doc_id, collect=True):
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.document(doc_id, collect=collect)
+
+
+def stage(name):
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.stage(name)
+
+
+def record(**counts):
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record(**counts)
+
+
+def merge(data):
+    profiler = _profiler
+    if profiler is not None:
+        profiler.merge(data)
+
+
+def iter_stage(iterable, name):
+    profiler = _profiler
+    if profiler is None:
+        return iterable
+    return profiler.iter_stage(iterable, name)
+
+
+def report(reset=False):
+    if _profiler is not None:
+        _profiler.report(reset=reset)
+
+
+def enable_from_settings():
+    """settings.PROFILE_ENABLED가 켜져 있고 아직 측정 중이 아니면 측정을 켭니다."""
+    from app.config import settings
+
+    if settings.PROFILE_ENABLED and _profiler is None:
+        enable_profiling()
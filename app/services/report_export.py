@@ -0,0 +1,257 @@
+# report_export.py
+# 기업 공시 전체를 NDJSON으로 내보내기 (분석/LLM 배치 작업용)
+# 보고서 인덱스(rpt_*)를 PIT + search_after로 끝까지 읽으며 섹션마다 한 줄씩 내보낸다 (max_result_window 제한 없음).
+# 보고서 문서의 페이지에는 메타데이터만 싣고 섹션 본문은 보고서마다 nested 순서대로 EXPORT_SECTION_BATCH개씩 따로 읽으며,
+# 섹션 문서 인덱스에서 본문을 읽을 때는 한 페이지가 EXPORT_MAX_PAGE_BYTES를 넘지 않게 페이지 크기를 줄인다.
+# 줄은 만드는 대로 작은 버퍼 단위로 흘려보내 메모리 사용량이 보고서/섹션 크기나 내보내는 양에 비례하지 않는다.
+#
+#   plan = prepare_export(["00126380"], fields=["doc_id", "sec_id", "sec_title"])
+#   async for chunk in iter_export_ndjson(client, plan):
+#       ...   # NDJSON 바이트
+
+import json
+import zlib
+
+import anyio
+from opensearchpy.exceptions import NotFoundError
+
+from app.config import settings
+from app.models.parsing_schemas import section_alias
+from app.services.parsing.passages import remove_tables
+from app.services.report_search import REPORT_FIELDS, close_pit_async, index_patterns, resolve_aliases
+
+SECTION_FIELDS = ["sec_id", "sec_title", "sec_content"]
+EXPORT_FIELDS = REPORT_FIELDS + SECTION_FIELDS
+
+# 소비하는 쪽이 느려 다음 페이지를 늦게 읽어도 PIT가 만료되지 않을 만큼
+EXPORT_PIT_KEEP_ALIVE = "5m"
+MAX_EXPORT_PAGE_SIZE = 100
+# 보고서 문서에서 섹션 본문을 한 번에 읽을 섹션 수
+EXPORT_SECTION_BATCH = 10
+# inner_hits의 from + size 한도 (index.max_inner_result_window 기본값), 넘는 섹션은 _source에서 한 번에 읽음
+_INNER_RESULT_WINDOW = 100
+# 섹션 문서에서 본문을 읽을 때 검색 응답 한 페이지의 대략적인 최대 크기
+EXPORT_MAX_PAGE_BYTES = 8 * 1024 ** 2
+# 이만큼 쌓이면 내보냄 (줄마다 보내면 쓰기 횟수가 너무 많음)
+_FLUSH_BYTES = 64 * 1024
+
+
+def prepare_export(
+    corp_codes,
+    report_types=None,
+    doc_codes=None,
+    pub_date_from=None,
+    pub_date_to=None,
+    fields=None,
+    include_tables=True,
+    page_size=20,
+):
+    """
+    내보내기 조건을 검사하고 실행 계획을 만듭니다. 잘못된 값은 스트림을 시작하기 전에 ValueError로 알립니다.
+    fields에 섹션 필드(sec_id/sec_title/sec_content)가 없으면 섹션을 읽지 않고 보고서마다 한 줄을 내보냅니다.
+    include_tables=False면 sec_content에서 테이블을 빼고 보냅니다.
+    page_size는 한 번에 읽을 최대 문서 수입니다 (섹션 문서에서 본문을 읽으면 문서 크기에 맞춰 줄임).
+    """
+    if not corp_codes:
+        raise ValueError("corp_codes is required")
+    fields = list(dict.fromkeys(fields or EXPORT_FIELDS))
+    unknown = [field for field in fields if field not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown export fields: {', '.join(unknown)} (available: {', '.join(EXPORT_FIELDS)})")
+
+    aliases = resolve_aliases(report_types, doc_codes)
+    # 섹션 문서만 적재하는 경우 섹션 인덱스에서 읽음 (문서 하나가 섹션 하나)
+    nested = settings.INGEST_INDEX_MODE != "section"
+    if not nested:
+        aliases = [section_alias(alias) for alias in aliases]
+
+    filters = [{"terms": {"corp_code": sorted(set(corp_codes))}}]
+    if pub_date_from or pub_date_to:
+        date_range = {"format": "yyyyMMdd"}
+        if pub_date_from:
+            date_range["gte"] = pub_date_from
+        if pub_date_to:
+            date_range["lte"] = pub_date_to
+        filters.append({"range": {"pub_date": date_range}})
+
+    report_fields = [field for field in fields if field in REPORT_FIELDS]
+    section_fields = [field for field in fields if field in SECTION_FIELDS]
+    with_content = "sec_content" in section_fields
+    if nested:
+        # 본문은 보고서마다 섹션 묶음으로 따로 읽으므로 페이지에는 보고서 필드만
+        source = report_fields + ([] if with_content else [f"sections.{field}" for field in section_fields])
+        sort = [{"doc_id": "asc"}]
+    else:
+        source = report_fields + section_fields
+        sort = [{"doc_id": "asc"}, {"sec_id": "asc"}]
+    page_size = max(1, min(page_size, MAX_EXPORT_PAGE_SIZE))
+
+    return {
+        "indices": index_patterns(aliases, pub_date_from, pub_date_to),
+        "nested": nested,
+        "fields": fields,
+        "per_section": bool(section_fields),
+        "section_fields": section_fields,
+        "section_batches": nested and with_content,
+        # 섹션 문서의 본문은 페이지에 바로 실리므로 문서 크기를 보며 페이지 크기를 정함 (크기를 모르는 첫 페이지는 1건)
+        "page_size": page_size,
+        "sized_by_bytes": not nested and with_content,
+        "include_tables": include_tables,
+        "body": {
+            "size": 1 if not nested and with_content else page_size,
+            "query": {"bool": {"filter": filters}},
+            "_source": {"includes": source},
+            "sort": sort,
+            "track_total_hits": False,
+        },
+    }
+
+
+def export_rows(plan, source, sections=None):
+    """
+    문서 _source 하나를 내보낼 줄(dict)로 (요청한 필드 순서대로)
+    보고서 문서는 섹션마다 한 줄이며, sections를 주면 _source의 섹션 대신 그 섹션들로 만듭니다.
+    """
+    if plan["nested"] and plan["per_section"]:
+        report = {field: source.get(field) for field in REPORT_FIELDS}
+        rows = ({**report, **section} for section in (source.get("sections") or [] if sections is None else sections))
+    else:
+        rows = [source]
+    for row in rows:
+        row = {field: row.get(field) for field in plan["fields"]}
+        if not plan["include_tables"] and row.get("sec_content"):
+            row["sec_content"] = remove_tables(row["sec_content"])
+        yield row
+
+
+def build_section_batch_body(plan, doc_id, start, size, pit):
+    """
+    보고서 doc_id의 섹션 중 nested 위치(_nested.offset) start부터 size개를 요청한 섹션 필드까지 읽는 검색 본문.
+    모든 섹션 점수가 같아 inner_hits가 nested 문서 순서(= offset 순서)로 정렬되므로 from/size가 곧 offset 범위입니다.
+    """
+    return {
+        "size": 1,
+        "query": {
+            "bool": {
+                "filter": [
+                    {"term": {"doc_id": doc_id}},
+                    {
+                        "nested": {
+                            "path": "sections",
+                            "query": {"match_all": {}},
+                            "inner_hits": {
+                                "from": start,
+                                "size": size,
+                                "_source": {"includes": [f"sections.{field}" for field in plan["section_fields"]]},
+                            },
+                        }
+                    },
+                ]
+            }
+        },
+        "_source": False,
+        "pit": pit,
+    }
+
+
+def build_section_tail_body(plan, doc_id, pit):
+    """inner_hits로 읽을 수 없는 위치의 섹션을 위해 보고서 doc_id의 섹션 전체를 _source에서 읽는 검색 본문"""
+    return {
+        "size": 1,
+        "query": {"bool": {"filter": [{"term": {"doc_id": doc_id}}]}},
+        "_source": {"includes": [f"sections.{field}" for field in plan["section_fields"]]},
+        "pit": pit,
+    }
+
+
+async def _iter_report_rows(client, plan, source, pit):
+    """
+    보고서 문서 하나의 줄. 본문을 읽으면 섹션을 nested 위치 순서대로 EXPORT_SECTION_BATCH개씩 읽어 오며,
+    _INNER_RESULT_WINDOW를 넘는 위치의 섹션은 _source에서 나머지를 한 번에 읽습니다.
+    """
+    if not plan["section_batches"]:
+        for row in export_rows(plan, source):
+            yield row
+        return
+    doc_id = source.get("doc_id")
+    start = 0
+    total = None  # 섹션 수 (첫 묶음의 inner_hits 건수)
+    while total is None or start < total:
+        size = min(EXPORT_SECTION_BATCH, _INNER_RESULT_WINDOW - start)
+        if size <= 0:
+            response = await client.search(body=build_section_tail_body(plan, doc_id, pit))
+            pit["id"] = response.get("pit_id", pit["id"])
+            hits = response["hits"]["hits"]
+            sections = (hits[0].get("_source", {}).get("sections") or [])[start:] if hits else []
+            for row in export_rows(plan, source, sections):
+                yield row
+            return
+        response = await client.search(body=build_section_batch_body(plan, doc_id, start, size, pit))
+        pit["id"] = response.get("pit_id", pit["id"])
+        hits = response["hits"]["hits"]
+        if not hits:
+            return  # 섹션이 없는 보고서
+        inner = hits[0].get("inner_hits", {}).get("sections", {}).get("hits", {})
+        total = inner.get("total", {}).get("value", 0)
+        inner_hits = sorted(inner.get("hits", []), key=lambda inner_hit: inner_hit["_nested"]["offset"])
+        for row in export_rows(plan, source, [inner_hit.get("_source", {}) for inner_hit in inner_hits]):
+            yield row
+        start += size
+
+
+async def iter_export_ndjson(client, plan):
+    """
+    PIT를 열어 search_after로 끝까지 읽으며 NDJSON 바이트를 yield 합니다 (_FLUSH_BYTES 정도씩).
+    보고서 단위 내보내기(per_section=False)가 아니면 섹션마다 한 줄입니다.
+    끝나거나 중간에 끊겨도(클라이언트 연결 종료) PIT를 닫습니다.
+    """
+    try:
+        response = await client.create_pit(index=",".join(plan["indices"]), keep_alive=EXPORT_PIT_KEEP_ALIVE)
+    except NotFoundError:
+        return  # 내보낼 인덱스가 없음
+    body = {**plan["body"], "pit": {"id": response["pit_id"], "keep_alive": EXPORT_PIT_KEEP_ALIVE}}
+    # 섹션 문서에서 보고서 단위로 내보낼 때는 doc_id 순으로 읽으므로 이어지는 같은 doc_id를 건너뜀
+    one_per_report = not plan["nested"] and not plan["per_section"]
+    last_doc_id = None
+    buffer = bytearray()
+    try:
+        while True:
+            response = await client.search(body=body)
+            body["pit"]["id"] = response.get("pit_id", body["pit"]["id"])
+            hits = response["hits"]["hits"]
+            if not hits:
+                break
+            largest = 0
+            for hit in hits:
+                doc_id = hit["sort"][0]
+                if one_per_report and doc_id == last_doc_id:
+                    continue
+                last_doc_id = doc_id
+                async for row in _iter_report_rows(client, plan, hit.get("_source", {}), body["pit"]):
+                    line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+                    largest = max(largest, len(line))
+                    buffer += line
+                    if len(buffer) >= _FLUSH_BYTES:
+                        yield bytes(buffer)
+                        buffer.clear()
+            if len(hits) < body["size"]:
+                break
+            body["search_after"] = hits[-1]["sort"]
+            if plan["sized_by_bytes"]:
+                body["size"] = max(1, min(plan["page_size"], EXPORT_MAX_PAGE_BYTES // max(largest, 1)))
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        # 연결이 끊겨 취소된 중에도 PIT는 닫음
+        with anyio.CancelScope(shield=True):
+            await close_pit_async(client, body["pit"]["id"])
+
+
+async def gzip_chunks(chunks, level=6):
+    """바이트 스트림을 gzip으로 압축하며 흘려보냅니다 (압축기 하나만 유지)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
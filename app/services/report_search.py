@@ -0,0 +1,624 @@
+# report_search.py
+# 보고서(rpt_*) 검색
+# 섹션(nested) 단위로 매칭해 inner_hits로 맞은 섹션만 돌려주고, 보고서 본문(_source)은 읽지 않는다.
+# 깊은 페이지는 from/size 대신 search_after로 넘기고, 같은 시점의 결과로 넘기려면 use_pit로 point-in-time(PIT)을 연다.
+#
+#   page = search_reports("매출 감소", corp_codes=["00126380"], pub_date_from="20230101", use_pit=True)
+#   next_page = search_reports("매출 감소", ..., pit_id=page["pit_id"], search_after=page["search_after"])
+# PIT 없이 검색하는 요청(use_pit 없는 첫 페이지, search_after만으로 이어 받는 페이지)은 검색 캐시(search_cache)를 거친다.
+# snippets=k면 맞은 섹션마다 본문 대신 하이라이트 조각 k개만 싣고, 섹션 전체는 get_section으로 따로 받는다.
+# SEARCH_SOURCE=passage면 패시지 인덱스(rpt_*_psg)를, section이면 섹션 문서 인덱스(rpt_*_sec)를
+# 검색해 doc_id로 collapse 한다. collapse는 search_after와 함께 쓸 수 없어 이때 search_after는 [다음 페이지 시작 위치]이다.
+
+import html
+import re
+
+from opensearchpy.exceptions import NotFoundError
+
+from app.config import settings
+from app.models.parsing_schemas import REPORT_ALIASES, passage_alias, section_alias
+from app.opensearch_client import os_client
+from app.services.parsing.ingest_to_os_from_xml import DOC_CODE_INDEX_MAP
+from app.services.search_cache import cache_key, get_search_cache, normalize_text
+
+# 결과에 싣는 보고서 메타데이터 (모두 keyword/date라 _source 대신 doc values로 읽음)
+REPORT_FIELDS = ["doc_id", "doc_name", "doc_code", "pub_date", "corp_code", "corp_name"]
+# 섹션 검색 필드와 가중치 (보고서 문서의 nested 섹션)
+SECTION_SEARCH_FIELDS = ["sections.sec_title^2", "sections.sec_content"]
+# collapse로 검색하는 평면 문서 종류별 (검색 필드와 가중치, inner_hits에 싣는 필드, 하이라이트 필드)
+FLAT_SOURCES = {
+    "section": (["sec_title^2", "sec_content"], ["sec_id", "sec_title"], "sec_content"),
+    "passage": (["sec_title^2", "content"], ["passage_id", "sec_id", "sec_title", "start", "end"], "content"),
+}
+
+PIT_KEEP_ALIVE = "2m"
+MAX_PAGE_SIZE = 100
+MAX_INNER_HITS = 10
+MAX_SNIPPETS = 5
+# collapse 검색은 from으로 넘기므로 index.max_result_window(기본 10000)까지만 받을 수 있음
+MAX_COLLAPSE_WINDOW = 10_000
+# collapse 검색 전체 보고서 수(cardinality)가 정확한 한도 (넘으면 근사값)
+_CARDINALITY_PRECISION = 40_000
+
+# 하이라이트 표시 (본문에 나올 일이 없는 사용자 정의 영역 문자, 응답에서는 오프셋으로 바꿈)
+_HIGHLIGHT_PRE = "\ue000"
+_HIGHLIGHT_POST = "\ue001"
+_HIGHLIGHT_SPLIT_RE = re.compile(f"([{_HIGHLIGHT_PRE}{_HIGHLIGHT_POST}])")
+# 조각 안의 태그, 조각 경계에서 잘린 태그 앞/뒷부분 (예: 'ss="x">매출', '매출 <td cla')
+_TAG_RE = re.compile(r"<[^<>]*>")
+_PARTIAL_TAG_HEAD_RE = re.compile(r'^(?:[^<>"]*"[^<>]*|\s*/?[a-zA-Z][a-zA-Z0-9]*\s*/?)>')
+_PARTIAL_TAG_TAIL_RE = re.compile(r"<[/a-zA-Z][^<>]*$")
+
+
+def resolve_aliases(report_types=None, doc_codes=None):
+    """보고서 종류 alias(rpt_qt 등)나 doc_code(11013 등)를 검색할 alias 목록으로 (둘 다 없으면 전체)"""
+    aliases = []
+    for report_type in report_types or []:
+        if report_type not in REPORT_ALIASES:
+            raise ValueError(f"Unknown report type: {report_type}")
+        aliases.append(report_type)
+    for doc_code in doc_codes or []:
+        if doc_code not in DOC_CODE_INDEX_MAP:
+            raise ValueError(f"Unknown doc_code: {doc_code}")
+        aliases.append(DOC_CODE_INDEX_MAP[doc_code])
+    return list(dict.fromkeys(aliases)) or list(REPORT_ALIASES)
+
+
+def index_patterns(aliases, pub_date_from=None, pub_date_to=None):
+    """
+    검색할 연도별 인덱스 패턴. pub_date 범위가 양쪽 다 있으면 해당 연도 파티션만 봅니다.
+    없는 연도도 와일드카드라 오류 없이 건너뜁니다 (예: rpt_qt-2024*).
+    """
+    if pub_date_from and pub_date_to:
+        years = range(int(pub_date_from[:4]), int(pub_date_to[:4]) + 1)
+        return [f"{alias}-{year}*" for alias in aliases for year in years]
+    return [f"{alias}-*" for alias in aliases]
+
+
+def build_report_query(
+    q=None, corp_codes=None, pub_date_from=None, pub_date_to=None, inner_hits_size=3, snippets=0, snippet_size=150
+):
+    """
+    검색어는 섹션 제목/본문에 nested로 매칭하고 보고서 점수는 가장 잘 맞은 섹션 점수를 씁니다.
+    inner_hits에는 맞은 섹션의 sec_id/sec_title만 싣습니다 (sec_content 제외).
+    snippets > 0이면 섹션마다 본문에서 점수가 높은 하이라이트 조각을 snippets개까지 함께 받습니다.
+    """
+    filters = _filters(corp_codes, pub_date_from, pub_date_to)
+    must = []
+    if q:
+        inner_hits = {
+            "size": min(inner_hits_size, MAX_INNER_HITS),
+            "_source": {"includes": ["sections.sec_id", "sections.sec_title"]},
+        }
+        if snippets:
+            inner_hits["highlight"] = _snippet_highlight(snippets, snippet_size)
+        must.append({
+            "nested": {
+                "path": "sections",
+                "score_mode": "max",
+                "query": {"multi_match": {"query": q, "fields": SECTION_SEARCH_FIELDS}},
+                "inner_hits": inner_hits,
+            }
+        })
+    return {"bool": {"must": must or [{"match_all": {}}], "filter": filters}}
+
+
+def build_flat_query(source, q=None, corp_codes=None, pub_date_from=None, pub_date_to=None):
+    """섹션/패시지 문서 검색 쿼리 (보고서 메타데이터가 문서마다 복제되어 있어 nested 없이 필터)"""
+    fields = FLAT_SOURCES[source][0]
+    must = [{"multi_match": {"query": q, "fields": fields}}] if q else [{"match_all": {}}]
+    return {"bool": {"must": must, "filter": _filters(corp_codes, pub_date_from, pub_date_to)}}
+
+
+def _collapse(source, inner_hits_size, snippets, snippet_size):
+    """
+    섹션/패시지 문서를 doc_id로 묶어 보고서마다 가장 잘 맞은 문서 하나를 결과로 하고,
+    맞은 섹션/패시지들은 nested 검색과 같은 이름("sections")의 inner_hits로 받습니다.
+    """
+    _, includes, highlight_field = FLAT_SOURCES[source]
+    collapse = {"field": "doc_id"}
+    if inner_hits_size:
+        inner_hits = {
+            "name": "sections",
+            "size": min(inner_hits_size, MAX_INNER_HITS),
+            "_source": {"includes": includes},
+        }
+        if snippets:
+            inner_hits["highlight"] = _snippet_highlight(snippets, snippet_size, highlight_field)
+        collapse["inner_hits"] = inner_hits
+    return collapse
+
+
+def _filters(corp_codes, pub_date_from, pub_date_to):
+    filters = []
+    if corp_codes:
+        filters.append({"terms": {"corp_code": list(corp_codes)}})
+    if pub_date_from or pub_date_to:
+        date_range = {"format": "yyyyMMdd"}
+        if pub_date_from:
+            date_range["gte"] = pub_date_from
+        if pub_date_to:
+            date_range["lte"] = pub_date_to
+        filters.append({"range": {"pub_date": date_range}})
+    return filters
+
+
+def _snippet_highlight(snippets, snippet_size, field="sections.sec_content"):
+    # unified 하이라이터는 필드 분석기(my_html_strip_analyzer)로 다시 분석하므로 태그 안 글자는 맞지 않음
+    # 긴 섹션은 앞 SEARCH_SNIPPET_MAX_ANALYZED_CHARS자까지만 하이라이트 (인덱스 한도를 넘는 오류 방지)
+    return {
+        "fields": {
+            field: {
+                "type": "unified",
+                "fragment_size": snippet_size,
+                "number_of_fragments": min(snippets, MAX_SNIPPETS),
+                "order": "score",
+                "no_match_size": 0,
+                "pre_tags": [_HIGHLIGHT_PRE],
+                "post_tags": [_HIGHLIGHT_POST],
+                "max_analyzer_offset": settings.SEARCH_SNIPPET_MAX_ANALYZED_CHARS,
+            }
+        }
+    }
+
+
+def _sort(q):
+    # doc_id가 보고서마다 유일해 search_after 동점 처리 기준으로 씀
+    if q:
+        return [{"_score": "desc"}, {"doc_id": "asc"}]
+    return [{"pub_date": "desc"}, {"doc_id": "asc"}]
+
+
+def open_pit(indices):
+    """PIT를 열고 id를 반환합니다. 검색할 인덱스가 하나도 없으면 None"""
+    try:
+        response = os_client.create_pit(index=",".join(indices), keep_alive=PIT_KEEP_ALIVE)
+    except NotFoundError:
+        return None
+    return response["pit_id"]
+
+
+def close_pit(pit_id):
+    try:
+        os_client.delete_pit(body={"pit_id": [pit_id]})
+    except NotFoundError:
+        pass  # 이미 만료됨
+
+
+def search_reports(
+    q=None,
+    report_types=None,
+    doc_codes=None,
+    corp_codes=None,
+    pub_date_from=None,
+    pub_date_to=None,
+    size=10,
+    inner_hits_size=3,
+    snippets=0,
+    snippet_size=150,
+    pit_id=None,
+    search_after=None,
+    use_pit=False,
+):
+    """
+    보고서를 검색해 한 페이지를 반환합니다.
+    첫 페이지(search_after 없음)는 전체 건수를 세고, 다음 페이지는 돌려받은 search_after를 그대로 넘기면 이어서 받습니다
+    (건수는 다시 세지 않음). 더 받을 결과가 없으면 search_after가 None입니다.
+    use_pit면 첫 페이지에서 PIT를 열어 pit_id를 돌려주고, 다음 페이지에 pit_id도 넘기면 같은 시점의 결과를 받습니다.
+    PIT는 다음 페이지가 없거나 검색이 실패하면 바로 닫습니다.
+    PIT 없이 검색하는 요청은 검색 캐시를 거칩니다.
+    """
+    params = _search_params(
+        q, report_types, doc_codes, corp_codes, pub_date_from, pub_date_to,
+        size, inner_hits_size, snippets, snippet_size, search_after,
+    )
+    new_pit = use_pit and pit_id is None and not search_after
+    cache, key, generations = _cache_entry("reports", params, _search_aliases(params), pit_id is not None or new_pit)
+    page = cache.get(key, generations) if cache is not None else None
+    if page is not None:
+        return page
+
+    count_total = not search_after
+    indices = index_patterns(_search_aliases(params), pub_date_from, pub_date_to)
+    if new_pit:
+        pit_id = open_pit(indices)
+        if pit_id is None:
+            return _empty_page()
+
+    page = None
+    try:
+        body = build_search_body(params, pit_id, count_total)
+        try:
+            if pit_id:
+                response = os_client.search(body=body)
+            else:
+                response = os_client.search(index=",".join(indices), body=body)
+        except NotFoundError:
+            if pit_id:
+                raise
+            page = _empty_page()  # 검색할 인덱스가 없음
+        else:
+            page = format_page(response, params, count_total, pit_id)
+    finally:
+        # 이어 받을 pit_id를 돌려주지 않는 PIT는 여기서 닫음
+        if pit_id and (page is None or page["pit_id"] is None):
+            close_pit(pit_id)
+
+    if cache is not None:
+        cache.put(key, generations, page)
+    return page
+
+
+async def search_reports_async(
+    client,
+    q=None,
+    report_types=None,
+    doc_codes=None,
+    corp_codes=None,
+    pub_date_from=None,
+    pub_date_to=None,
+    size=10,
+    inner_hits_size=3,
+    snippets=0,
+    snippet_size=150,
+    pit_id=None,
+    search_after=None,
+    use_pit=False,
+):
+    """search_reports의 비동기 버전 (client는 AsyncOpenSearch, app/opensearch_client.get_async_client)"""
+    params = _search_params(
+        q, report_types, doc_codes, corp_codes, pub_date_from, pub_date_to,
+        size, inner_hits_size, snippets, snippet_size, search_after,
+    )
+    new_pit = use_pit and pit_id is None and not search_after
+    cache, key, generations = await _cache_entry_async(
+        "reports", params, _search_aliases(params), pit_id is not None or new_pit
+    )
+    page = await cache.get_async(key, generations) if cache is not None else None
+    if page is not None:
+        return page
+
+    count_total = not search_after
+    indices = index_patterns(_search_aliases(params), pub_date_from, pub_date_to)
+    if new_pit:
+        try:
+            pit_id = (await client.create_pit(index=",".join(indices), keep_alive=PIT_KEEP_ALIVE))["pit_id"]
+        except NotFoundError:
+            return _empty_page()  # 검색할 인덱스가 없음
+
+    page = None
+    try:
+        body = build_search_body(params, pit_id, count_total)
+        try:
+            if pit_id:
+                response = await client.search(body=body)
+            else:
+                response = await client.search(index=",".join(indices), body=body)
+        except NotFoundError:
+            if pit_id:
+                raise
+            page = _empty_page()  # 검색할 인덱스가 없음
+        else:
+            page = format_page(response, params, count_total, pit_id)
+    finally:
+        # 이어 받을 pit_id를 돌려주지 않는 PIT는 여기서 닫음
+        if pit_id and (page is None or page["pit_id"] is None):
+            await close_pit_async(client, pit_id)
+
+    if cache is not None:
+        await cache.put_async(key, generations, page)
+    return page
+
+
+async def close_pit_async(client, pit_id):
+    try:
+        await client.delete_pit(body={"pit_id": [pit_id]})
+    except NotFoundError:
+        pass  # 이미 만료됨
+
+
+def _search_params(
+    q, report_types, doc_codes, corp_codes, pub_date_from, pub_date_to,
+    size, inner_hits_size, snippets, snippet_size, search_after,
+):
+    """검색 조건을 정규화합니다 (같은 검색은 같은 값이 되어 캐시 키로도 씀)."""
+    source = _search_source()
+    if source != "report" and search_after and not (
+        len(search_after) == 1 and isinstance(search_after[0], int) and search_after[0] >= 0
+    ):
+        raise ValueError(f"search_after must be [offset] when searching {source} documents")
+    if source != "report" and search_after and search_after[0] + size > MAX_COLLAPSE_WINDOW:
+        raise ValueError(f"{source.capitalize()} document search can page up to {MAX_COLLAPSE_WINDOW} reports")
+    return {
+        "source": source,
+        "q": normalize_text(q),
+        "aliases": sorted(resolve_aliases(report_types, doc_codes)),
+        "corp_codes": sorted(set(corp_codes or [])),
+        "pub_date_from": pub_date_from,
+        "pub_date_to": pub_date_to,
+        "size": max(1, min(size, MAX_PAGE_SIZE)),
+        "inner_hits_size": min(inner_hits_size, MAX_INNER_HITS),
+        "snippets": min(snippets, MAX_SNIPPETS),
+        "snippet_size": snippet_size,
+        "search_after": search_after,
+    }
+
+
+def _cache_entry(kind, params, scopes, with_pit=False):
+    """
+    캐시할 요청이면 (캐시, 키, 검색 전 세대)를 반환합니다.
+    PIT로 검색하는 페이지(with_pit)는 그 PIT 시점에 묶인 결과라 캐시하지 않습니다.
+    """
+    cache = get_search_cache()
+    if cache is None or with_pit:
+        return None, None, None
+    return cache, cache_key(kind, params), cache.generations(scopes)
+
+
+async def _cache_entry_async(kind, params, scopes, with_pit=False):
+    """_cache_entry의 비동기 버전 (SQLite 캐시는 스레드에서 읽음)"""
+    cache = get_search_cache()
+    if cache is None or with_pit:
+        return None, None, None
+    return cache, cache_key(kind, params), await cache.generations_async(scopes)
+
+
+def _search_source():
+    """
+    검색할 문서 종류 (SEARCH_SOURCE): 보고서 문서의 nested 섹션 report, 섹션 문서 section, 패시지 문서 passage.
+    비어 있으면 섹션 문서만 적재할 때(INGEST_INDEX_MODE=section) section, 아니면 report
+    """
+    source = settings.SEARCH_SOURCE
+    if not source:
+        return "section" if settings.INGEST_INDEX_MODE == "section" else "report"
+    if source != "report" and source not in FLAT_SOURCES:
+        raise ValueError(f"Unknown SEARCH_SOURCE: {source} (report / section / passage)")
+    return source
+
+
+def _search_aliases(params):
+    """검색(과 캐시 무효화 단위)에 쓰는 alias 목록"""
+    if params["source"] == "passage":
+        return [passage_alias(alias) for alias in params["aliases"]]
+    if params["source"] == "section":
+        return [section_alias(alias) for alias in params["aliases"]]
+    return params["aliases"]
+
+
+def build_search_body(params, pit_id, count_total):
+    if params["source"] != "report":
+        return _build_collapse_body(params, pit_id, count_total)
+    body = {
+        "size": params["size"],
+        "query": build_report_query(
+            params["q"], params["corp_codes"], params["pub_date_from"], params["pub_date_to"],
+            params["inner_hits_size"], params["snippets"], params["snippet_size"],
+        ),
+        "sort": _sort(params["q"]),
+        "_source": False,
+        "docvalue_fields": _docvalue_fields(),
+        # 건수는 첫 페이지에서만 (깊은 페이지에서 매번 세지 않도록)
+        "track_total_hits": count_total,
+    }
+    if pit_id:
+        body["pit"] = {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE}
+    if params["search_after"]:
+        body["search_after"] = params["search_after"]
+    return body
+
+
+def _build_collapse_body(params, pit_id, count_total):
+    """섹션/패시지 문서를 doc_id로 collapse 해 보고서 단위 페이지로 (search_after 대신 from으로 넘김)"""
+    source = params["source"]
+    inner_hits_size = params["inner_hits_size"] if params["q"] else 0
+    body = {
+        "from": params["search_after"][0] if params["search_after"] else 0,
+        "size": params["size"],
+        "query": build_flat_query(
+            source, params["q"], params["corp_codes"], params["pub_date_from"], params["pub_date_to"]
+        ),
+        "collapse": _collapse(source, inner_hits_size, params["snippets"], params["snippet_size"]),
+        "sort": _sort(params["q"]),
+        "_source": False,
+        "docvalue_fields": _docvalue_fields(),
+        # hits.total은 섹션/패시지 문서 수라 보고서 수는 doc_id cardinality로 셈
+        "track_total_hits": False,
+    }
+    if pit_id:
+        body["pit"] = {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE}
+    if count_total:
+        body["aggs"] = {"reports": {"cardinality": {"field": "doc_id", "precision_threshold": _CARDINALITY_PRECISION}}}
+    return body
+
+
+def _docvalue_fields():
+    return [
+        {"field": "pub_date", "format": "yyyyMMdd"} if field == "pub_date" else field
+        for field in REPORT_FIELDS
+    ]
+
+
+def format_page(response, params, count_total, pit_id):
+    """검색 응답을 한 페이지 결과로. PIT 없이 검색했거나 마지막 페이지면 pit_id가 None (호출하는 쪽에서 PIT를 닫음)"""
+    raw_hits = response["hits"]["hits"]
+    size = params["size"]
+    if params["source"] == "report":
+        total = response["hits"]["total"]["value"] if count_total else None
+        next_page = raw_hits[-1]["sort"] if len(raw_hits) == size else None
+    else:
+        total = response["aggregations"]["reports"]["value"] if count_total else None
+        offset = (params["search_after"] or [0])[0] + size
+        next_page = [offset] if len(raw_hits) == size and offset + size <= MAX_COLLAPSE_WINDOW else None
+    return {
+        "total": total,
+        "hits": [_format_hit(hit) for hit in raw_hits],
+        # 검색할 때마다 PIT id가 바뀔 수 있어 응답의 최신 id를 돌려줌
+        "pit_id": response.get("pit_id", pit_id) if next_page is not None else None,
+        "search_after": next_page,
+    }
+
+
+def _empty_page():
+    return {"total": 0, "hits": [], "pit_id": None, "search_after": None}
+
+
+def _report_fields(hit):
+    fields = hit.get("fields", {})
+    return {field: (fields.get(field) or [None])[0] for field in REPORT_FIELDS}
+
+
+def _format_hit(hit):
+    report = _report_fields(hit)
+    report["index"] = hit["_index"]
+    report["score"] = hit.get("_score")
+
+    sections = []
+    for inner in hit.get("inner_hits", {}).get("sections", {}).get("hits", {}).get("hits", []):
+        source = inner.get("_source", {})
+        highlight = inner.get("highlight", {})
+        fragments = next(
+            (highlight[field] for field in ("sections.sec_content", "sec_content", "content") if field in highlight), []
+        )
+        snippets = [format_snippet(fragment) for fragment in fragments]
+        section = {
+            "sec_id": source.get("sec_id"),
+            "sec_title": source.get("sec_title"),
+            "score": inner.get("_score"),
+            "snippets": [snippet for snippet in snippets if snippet["text"]],
+        }
+        if "passage_id" in source:
+            # 패시지 검색: 맞은 패시지와 섹션 본문 안 위치 (sec_content[start:end])
+            section.update(passage_id=source["passage_id"], start=source.get("start"), end=source.get("end"))
+        sections.append(section)
+    report["sections"] = sections
+    return report
+
+
+def format_snippet(fragment):
+    """
+    하이라이트 조각을 태그 없는 텍스트와 맞은 부분의 [시작, 끝) 문자 오프셋(텍스트 기준)으로 바꿉니다.
+    본문의 테이블 HTML은 조각 경계에서 잘린 태그까지 지우고 엔티티(&amp; 등)는 풀어 둡니다.
+        {"text": "... 매출 감소 ...", "highlights": [[4, 6], [7, 9]]}
+    """
+    text = _TAG_RE.sub(" ", fragment)
+    text = _PARTIAL_TAG_TAIL_RE.sub("", _PARTIAL_TAG_HEAD_RE.sub("", text))
+    text = " ".join(html.unescape(text).split())
+
+    plain = []
+    highlights = []
+    length = 0
+    start = None
+    for part in _HIGHLIGHT_SPLIT_RE.split(text):
+        if part == _HIGHLIGHT_PRE:
+            start = length
+        elif part == _HIGHLIGHT_POST:
+            if start is not None and length > start:
+                highlights.append([start, length])
+            start = None
+        else:
+            plain.append(part)
+            length += len(part)
+    return {"text": "".join(plain), "highlights": highlights}
+
+
+def _section_source():
+    """섹션 본문을 읽을 alias 목록과 nested 여부 (INGEST_INDEX_MODE=section이면 섹션 문서 인덱스에서)"""
+    if settings.INGEST_INDEX_MODE == "section":
+        return [section_alias(alias) for alias in REPORT_ALIASES], False
+    return list(REPORT_ALIASES), True
+
+
+def build_section_body(doc_id, sec_id, nested=True):
+    """doc_id 보고서의 sec_id 섹션 하나를 본문까지 읽는 검색 본문"""
+    if not nested:
+        # 섹션 단위 문서: 보고서 메타데이터가 섹션 문서마다 복제되어 있음
+        return {
+            "size": 1,
+            "query": {"bool": {"filter": [{"term": {"doc_id": doc_id}}, {"term": {"sec_id": sec_id}}]}},
+            "_source": {"includes": ["sec_id", "sec_title", "sec_content"]},
+            "docvalue_fields": _docvalue_fields(),
+        }
+    return {
+        "size": 1,
+        "query": {
+            "bool": {
+                "filter": [
+                    {"term": {"doc_id": doc_id}},
+                    {
+                        "nested": {
+                            "path": "sections",
+                            "query": {"term": {"sections.sec_id": sec_id}},
+                            "inner_hits": {
+                                "size": 1,
+                                "_source": {
+                                    "includes": ["sections.sec_id", "sections.sec_title", "sections.sec_content"]
+                                },
+                            },
+                        }
+                    },
+                ]
+            }
+        },
+        "_source": False,
+        "docvalue_fields": _docvalue_fields(),
+    }
+
+
+def format_section(response, nested=True):
+    hits = response["hits"]["hits"]
+    if not hits:
+        return None
+    hit = hits[0]
+    if nested:
+        inner_hits = hit.get("inner_hits", {}).get("sections", {}).get("hits", {}).get("hits", [])
+        if not inner_hits:
+            return None
+        source = inner_hits[0].get("_source", {})
+    else:
+        source = hit.get("_source", {})
+    return {
+        **_report_fields(hit),
+        "index": hit["_index"],
+        "sec_id": source.get("sec_id"),
+        "sec_title": source.get("sec_title"),
+        "sec_content": source.get("sec_content"),
+    }
+
+
+def get_section(doc_id, sec_id):
+    """
+    보고서 섹션 하나를 본문까지 읽어 반환합니다 (검색 결과의 snippet에서 섹션 전체를 열 때). 없으면 None
+    같은 섹션 요청은 검색 캐시를 거칩니다.
+    """
+    aliases, nested = _section_source()
+    cache, key, generations = _cache_entry("section", {"doc_id": doc_id, "sec_id": sec_id}, aliases)
+    section = cache.get(key, generations) if cache is not None else None
+    if section is None:
+        response = os_client.search(
+            index=",".join(aliases),
+            body=build_section_body(doc_id, sec_id, nested),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        section = format_section(response, nested)
+        if section is not None and cache is not None:
+            cache.put(key, generations, section)
+    return section
+
+
+async def get_section_async(client, doc_id, sec_id):
+    """get_section의 비동기 버전"""
+    aliases, nested = _section_source()
+    cache, key, generations = await _cache_entry_async("section", {"doc_id": doc_id, "sec_id": sec_id}, aliases)
+    section = await cache.get_async(key, generations) if cache is not None else None
+    if section is None:
+        response = await client.search(
+            index=",".join(aliases),
+            body=build_section_body(doc_id, sec_id, nested),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        section = format_section(response, nested)
+        if section is not None and cache is not None:
+            await cache.put_async(key, generations, section)
+    return section
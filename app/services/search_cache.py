@@ -0,0 +1,347 @@
+# search_cache.py
+# 검색 결과 캐시 (크기 제한 LRU + TTL)
+# 정규화한 검색 조건을 키로 결과 페이지를 압축해 저장하고, 적재 경로가 인덱스에 쓰면 그 인덱스(alias)를
+# 읽은 결과를 무효화한다. 무효화는 alias별 세대 번호를 올리는 방식이라 항목을 찾아 지울 필요가 없고,
+# 조회할 때 저장 당시 세대와 다르면 버린다.
+# 백엔드는 프로세스 메모리(memory) 또는 여러 uvicorn 워커/적재 스크립트가 함께 쓰는 SQLite 파일(sqlite)
+#
+#   cache = get_search_cache()
+#   generations = cache.generations(["rpt_qt"])   # 검색 전에 읽어 둠 (검색 중 적재되면 저장한 결과가 바로 무효)
+#   page = cache.get(key, generations) or search(...)
+#   cache.put(key, generations, page)
+# 비동기 핸들러에서는 *_async 메서드를 쓴다 (SQLite 백엔드는 스레드에서 실행해 이벤트 루프를 막지 않음)
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import anyio
+
+from app.config import settings
+from app.models.parsing_schemas import UNKNOWN_PARTITION
+
+# 이보다 큰 결과만 압축 (작은 결과는 zlib 헤더만큼 손해)
+_COMPRESS_MIN_BYTES = 512
+_PARTITION_SUFFIX = re.compile(rf"-(\d{{4}}|{UNKNOWN_PARTITION})$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key         TEXT PRIMARY KEY,
+    value       BLOB,
+    generations TEXT,   -- 저장 당시 {alias: 세대} JSON
+    expires_at  REAL,
+    accessed_at REAL,
+    size        INTEGER
+);
+CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed_at);
+CREATE TABLE IF NOT EXISTS index_generations (
+    scope      TEXT PRIMARY KEY,
+    generation INTEGER
+);
+"""
+
+
+def cache_key(kind, params):
+    """검색 종류와 정규화된 조건으로 캐시 키를 만듭니다."""
+    payload = json.dumps([kind, params], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return f"{kind}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+def normalize_text(text):
+    """검색어 앞뒤/연속 공백 정리 ("위험  요소 " -> "위험 요소")"""
+    return " ".join((text or "").split())
+
+
+def index_scope(index_name):
+    """쓰기가 일어난 인덱스의 무효화 단위 (연도 파티션은 alias로: rpt_qt-2024 -> rpt_qt)"""
+    return _PARTITION_SUFFIX.sub("", index_name)
+
+
+def _encode(value):
+    data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(data) >= _COMPRESS_MIN_BYTES:
+        return b"z" + zlib.compress(data, 1)
+    return b"j" + data
+
+
+def _decode(blob):
+    data = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+    return json.loads(data)
+
+
+class MemoryBackend:
+    """프로세스 안 LRU (OrderedDict, 최근에 읽은 항목이 뒤)"""
+
+    name = "memory"
+    blocking = False  # 잠금만 잡는 짧은 연산이라 이벤트 루프에서 바로 실행
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (blob, generations, expires_at)
+        self._bytes = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key, blob, generations, expires_at):
+        """저장하고 LRU로 밀려난 항목 수를 반환합니다."""
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (blob, generations, expires_at)
+            self._bytes += len(blob)
+            evicted = 0
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def generations(self, scopes):
+        with self._lock:
+            return {scope: self._generations.get(scope, 0) for scope in scopes}
+
+    def bump(self, scopes):
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def usage(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def close(self):
+        pass
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+
+class SqliteBackend:
+    """
+    여러 프로세스가 공유하는 SQLite 파일 캐시 (같은 서버의 uvicorn 워커들, 별도 프로세스의 적재 스크립트)
+    세대 번호도 같은 파일에 있어 다른 프로세스의 적재가 곧바로 무효화로 보입니다.
+    """
+
+    name = "sqlite"
+    blocking = True  # 파일 I/O와 잠금 대기가 있어 비동기 경로에서는 스레드에서 실행
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # 캐시라 마지막 몇 건을 잃어도 됨
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, generations, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return row[0], json.loads(row[1]), row[2]
+
+    def store(self, key, blob, generations, expires_at):
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, json.dumps(generations), expires_at, now, len(blob)),
+            )
+            evicted = self._evict(now)
+            self.conn.commit()
+        return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self.conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def generations(self, scopes):
+        scopes = list(scopes)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT scope, generation FROM index_generations WHERE scope IN ({','.join('?' * len(scopes))})",
+                scopes,
+            ).fetchall()
+        found = dict(rows)
+        return {scope: found.get(scope, 0) for scope in scopes}
+
+    def bump(self, scopes):
+        with self._lock:
+            self.conn.executemany(
+                """
+                INSERT INTO index_generations (scope, generation) VALUES (?, 1)
+                ON CONFLICT(scope) DO UPDATE SET generation = generation + 1
+                """,
+                [(scope,) for scope in scopes],
+            )
+            self.conn.commit()
+
+    def usage(self):
+        with self._lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+        return {"entries": entries, "bytes": size}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _evict(self, now):
+        # 만료된 항목을 먼저 지우고, 그래도 크면 오래 안 읽은 항목부터
+        evicted = self.conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,)).rowcount
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM search_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+        for key, size in self.conn.execute("SELECT key, size FROM search_cache ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        return evicted
+
+
+class SearchCache:
+    """
+    검색 결과 캐시. 값은 JSON으로 직렬화해 (크면 zlib로 압축해) 저장합니다.
+    hit/miss/stale(무효화·만료로 버림)/eviction 수는 프로세스별로 셉니다.
+    """
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.counters = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+
+    def generations(self, scopes):
+        """scopes(alias 목록)의 현재 세대. 검색하기 전에 읽어 put에 그대로 넘깁니다."""
+        return self.backend.generations(sorted(set(scopes)))
+
+    def get(self, key, generations):
+        entry = self.backend.load(key)
+        if entry is None:
+            self._count("misses")
+            return None
+        blob, stored_generations, expires_at = entry
+        if expires_at <= time.time() or stored_generations != generations:
+            self.backend.delete(key)
+            self._count("stale")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return _decode(blob)
+
+    def put(self, key, generations, value):
+        evicted = self.backend.store(key, _encode(value), generations, time.time() + self.ttl)
+        if evicted:
+            self._count("evictions", evicted)
+
+    def invalidate(self, scopes):
+        scopes = sorted(set(scopes))
+        if scopes:
+            self.backend.bump(scopes)
+            self._count("invalidations", len(scopes))
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "backend": self.backend.name,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None,
+            **self.backend.usage(),
+        }
+
+    def close(self):
+        self.backend.close()
+
+    async def generations_async(self, scopes):
+        return await self._run(self.generations, scopes)
+
+    async def get_async(self, key, generations):
+        return await self._run(self.get, key, generations)
+
+    async def put_async(self, key, generations, value):
+        await self._run(self.put, key, generations, value)
+
+    async def invalidate_async(self, scopes):
+        await self._run(self.invalidate, scopes)
+
+    async def stats_async(self):
+        return await self._run(self.stats)
+
+    async def _run(self, function, *args):
+        if not self.backend.blocking:
+            return function(*args)
+        return await anyio.to_thread.run_sync(function, *args)
+
+    def _count(self, name, count=1):
+        with self._lock:
+            self.counters[name] += count
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """설정에 따른 프로세스별 검색 캐시 (SEARCH_CACHE_BACKEND=off면 None)"""
+    global _search_cache
+    backend_name = settings.SEARCH_CACHE_BACKEND
+    if backend_name == "off":
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            if backend_name == "sqlite":
+                backend = SqliteBackend(settings.SEARCH_CACHE_PATH, settings.SEARCH_CACHE_MAX_BYTES)
+            elif backend_name == "memory":
+                backend = MemoryBackend(settings.SEARCH_CACHE_MAX_BYTES)
+            else:
+                raise ValueError(f"Unknown SEARCH_CACHE_BACKEND: {backend_name} (memory / sqlite / off)")
+            _search_cache = SearchCache(backend, settings.SEARCH_CACHE_TTL_SEC)
+        return _search_cache
+
+
+def invalidate_indices(index_names):
+    """적재 경로에서 쓰기가 끝난 인덱스(연도 파티션 이름)를 받아 해당 alias를 읽은 캐시 결과를 무효화합니다."""
+    cache = get_search_cache()
+    scopes = sorted({index_scope(name) for name in index_names if name})
+    if cache is None or not scopes:
+        return
+    cache.invalidate(scopes)
+    print(f"Search cache invalidated: {', '.join(scopes)}")
+
+
+async def invalidate_indices_async(index_names):
+    """invalidate_indices의 비동기 버전 (API 핸들러에서 쓰기 후)"""
+    cache = get_search_cache()
+    scopes = sorted({index_scope(name) for name in index_names if name})
+    if cache is None or not scopes:
+        return
+    await cache.invalidate_async(scopes)
+    print(f"Search cache invalidated: {', '.join(scopes)}")
@@ -0,0 +1,224 @@
+# zip_cache.py
+# 접수번호별 DART 원문 ZIP 디스크 캐시
+# 접수된 공시 원문은 바뀌지 않으므로 한 번 받은 ZIP은 다시 내려받지 않는다 (API 한도 절약, 매핑 변경 후 재적재 시 네트워크 0회).
+
+import os
+import tempfile
+import threading
+from concurrent.futures import Future
+
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 압축 없이 저장
+    zstandard = None
+
+# 압축 방식별 항목 확장자 (설정을 바꿔도 기존 항목은 그대로 읽음)
+_SUFFIXES = {"none": ".zip", "zstd": ".zip.zst"}
+
+
+class ZipCache:
+    """
+    원문 ZIP을 "{cache_dir}/{접수일자}/{접수번호}.zip[.zst]"로 저장하는 디스크 캐시입니다.
+    - 저장은 임시 파일에 쓴 뒤 rename 하는 원자적 쓰기라 읽는 쪽이 쓰다 만 파일을 보지 않습니다.
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다.
+    - compression="zstd"면 zstandard로 한 번 더 압축합니다 (패키지가 없으면 경고 후 압축 없이 저장).
+    - fetch()는 같은 접수번호를 동시에 요청하면 다운로드를 한 번만 실행하고 결과를 나눠 줍니다.
+    """
+
+    def __init__(self, cache_dir, max_bytes, compression="none"):
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unknown zip cache compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            print("Warning: zstandard 패키지가 없어 ZIP 캐시를 압축 없이 저장합니다 (pip install zstandard).")
+            compression = "none"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # 다른 스레드의 다운로드 결과를 기다려 받은 수
+        self._lock = threading.Lock()
+        self._in_flight = {}  # 접수번호 -> Future
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._iter_entries())
+
+    def get(self, rcept_no):
+        """캐시된 ZIP bytes를 반환합니다. 없거나 손상되었으면 None"""
+        data = self._load(rcept_no)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def _load(self, rcept_no):
+        for compression, suffix in _SUFFIXES.items():
+            path = self._entry_path(rcept_no, suffix)
+            try:
+                with open(path, "rb") as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"Warning: ZIP 캐시 항목을 읽지 못했습니다 ({path}): {e}")
+                continue
+            try:
+                data = self._decompress(payload, compression)
+            except Exception as e:
+                print(f"Warning: 손상된 ZIP 캐시 항목을 무시합니다 ({path}): {e}")
+                continue
+            if not data.startswith(b"PK"):
+                print(f"Warning: 손상된 ZIP 캐시 항목을 무시합니다 ({path})")
+                continue
+
+            # LRU 판단을 위해 사용 시각 갱신
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return data
+        return None
+
+    def put(self, rcept_no, data):
+        """ZIP bytes를 원자적으로 저장합니다 (임시 파일에 쓴 뒤 rename)."""
+        path = self._entry_path(rcept_no, _SUFFIXES[self.compression])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = self._compress(data)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: ZIP 캐시 저장 실패 ({path}): {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._total_bytes += len(payload)
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def fetch(self, rcept_no, download):
+        """
+        캐시에 있으면 바로 반환하고, 없으면 download(rcept_no)로 받아 저장한 뒤 반환합니다.
+        같은 접수번호를 다른 스레드가 받는 중이면 새로 받지 않고 그 결과를 기다립니다.
+        (bytes, 출처) 튜플을 반환하며 출처는 "hit" / "miss" / "coalesced" 입니다.
+        """
+        data = self.get(rcept_no)
+        if data is not None:
+            return data, "hit"
+
+        with self._lock:
+            future = self._in_flight.get(rcept_no)
+            owner = future is None
+            if owner:
+                future = self._in_flight[rcept_no] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result(), "coalesced"
+
+        try:
+            # 위에서 못 찾은 뒤 잠금을 잡기 전에 다른 스레드가 받아 저장하고 끝냈을 수 있어 한 번 더 확인
+            data = self._load(rcept_no)
+            if data is not None:
+                with self._lock:
+                    self.misses -= 1
+                    self.hits += 1
+                future.set_result(data)
+                return data, "hit"
+            data = download(rcept_no)
+            self.put(rcept_no, data)
+            future.set_result(data)
+            return data, "miss"
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[rcept_no]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "bytes": self._total_bytes,
+            }
+
+    def _entry_path(self, rcept_no, suffix):
+        if not rcept_no.isalnum():
+            raise ValueError(f"Invalid rcept_no for zip cache: {rcept_no!r}")
+        return os.path.join(self.cache_dir, rcept_no[:8], rcept_no + suffix)
+
+    def _compress(self, data):
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return data
+
+    def _decompress(self, payload, compression):
+        if compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard 패키지가 없어 압축된 항목을 읽을 수 없습니다")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return payload
+
+    def _iter_entries(self):
+        """(경로, 크기, 마지막 사용 시각)을 yield 합니다."""
+        suffixes = tuple(_SUFFIXES.values())
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(suffixes):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """다른 프로세스가 쓴 항목까지 다시 집계한 뒤 용량의 90% 이하가 될 때까지 오래된 항목 삭제"""
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self._total_bytes = total
+
+
+_zip_cache = None
+_zip_cache_lock = threading.Lock()
+
+
+def get_zip_cache():
+    """설정에 따른 프로세스별 캐시 인스턴스 (비활성화 시 None)"""
+    global _zip_cache
+    if not settings.DART_ZIP_CACHE_ENABLED:
+        return None
+    with _zip_cache_lock:
+        if _zip_cache is None:
+            _zip_cache = ZipCache(
+                settings.DART_ZIP_CACHE_DIR,
+                settings.DART_ZIP_CACHE_MAX_BYTES,
+                settings.DART_ZIP_CACHE_COMPRESSION,
+            )
+        return _zip_cache
@@ -0,0 +1,221 @@
+# bench_parser.py
+# XML 파서 단계별 벤치마크: 합성 DART 문서로 각 단계의 처리량(MB/s)과 최대 메모리를 측정
+#   python -m benchmarks.bench_parser --sizes 1 5 20 --output bench_results/run.json
+#   python -m benchmarks.bench_parser --sizes 5 --compare bench_results/run.json
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from app.services.parsing.parse_xml import (
+    PARSER_VERSION,
+    _combine_contents,
+    clean_table_element_for_llm,
+    clean_table_html_for_llm,
+    extract_content_recursive,
+    parse_darter_xml,
+    parse_darter_xml_bytes,
+    parse_darter_xml_stream,
+    preprocess_xml_content,
+)
+from benchmarks.corpus import generate_document
+
+
+def _section_children(root):
+    """parse_darter_xml과 같은 기준으로 섹션별 콘텐츠 대상 자식 엘리먼트 목록을 만든다."""
+    groups = []
+    for section1 in root.findall(".//SECTION-1"):
+        groups.append([c for c in section1 if c.tag not in ("TITLE", "SECTION-2")])
+        for section2 in section1.findall("./SECTION-2"):
+            groups.append([c for c in section2 if c.tag != "TITLE"])
+    return groups
+
+
+def _border_tables(root):
+    return [t for t in root.iter("TABLE") if t.get("BORDER") == "1"]
+
+
+def _legacy_clean_table(element):
+    table_html = ET.tostring(element, encoding="utf-8").decode("utf-8").strip()
+    return clean_table_html_for_llm(table_html)
+
+
+def _stage_functions(xml, file_name, legacy_tables):
+    """(단계 이름, 실행 함수) 목록. 각 함수는 앞 단계 결과를 state에 넣고 꺼내 쓴다."""
+    state = {}
+    xml_bytes = xml.encode("utf-8")
+
+    def preprocess():
+        state["processed"] = preprocess_xml_content(xml)
+
+    def tree_parse():
+        state["root"] = ET.fromstring(state["processed"])
+        state["groups"] = _section_children(state["root"])
+        state["tables"] = _border_tables(state["root"])
+
+    def extract():
+        items = []
+        for children in state["groups"]:
+            collected = []
+            for child in children:
+                extract_content_recursive(child, collected)
+            items.append(collected)
+        state["items"] = items
+
+    def clean_tables():
+        for table in state["tables"]:
+            clean_table_element_for_llm(table)
+
+    def clean_tables_legacy():
+        for table in state["tables"]:
+            _legacy_clean_table(table)
+
+    def combine():
+        for collected in state["items"]:
+            _combine_contents(collected)
+
+    def end_to_end():
+        parse_darter_xml(xml, file_name)
+
+    def end_to_end_stream():
+        parse_darter_xml_stream(io.BytesIO(xml_bytes), file_name)
+
+    def end_to_end_bytes():
+        parse_darter_xml_bytes(xml_bytes, file_name)
+
+    stages = [
+        ("preprocess_xml_content", preprocess),
+        ("tree_parse", tree_parse),
+        # 테이블 정제(clean_table_element_for_llm) 시간 포함
+        ("extract_content_recursive", extract),
+        ("clean_table_element_for_llm", clean_tables),
+    ]
+    if legacy_tables:
+        stages.append(("clean_table_html_for_llm", clean_tables_legacy))
+    stages += [
+        ("_combine_contents", combine),
+        ("parse_darter_xml", end_to_end),
+        ("parse_darter_xml_stream", end_to_end_stream),
+        ("parse_darter_xml_bytes", end_to_end_bytes),
+    ]
+    return stages, state
+
+
+def bench_document(xml, repeat, legacy_tables, file_name="20240101000001.xml"):
+    input_bytes = len(xml.encode("utf-8"))
+    stages, state = _stage_functions(xml, file_name, legacy_tables)
+
+    # 1. 시간 측정 (best of N)
+    timings = {}
+    for _ in range(repeat):
+        for name, func in stages:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            timings[name] = min(elapsed, timings.get(name, elapsed))
+
+    # 2. 메모리 측정 (tracemalloc 오버헤드가 커서 시간 측정과 분리)
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for name, func in stages:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            func()
+            peaks[name] = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "input_bytes": input_bytes,
+        "sections": len(state["groups"]),
+        "tables": len(state["tables"]),
+        "stages": {
+            name: {
+                "seconds": round(timings[name], 6),
+                "mb_per_s": round(input_bytes / 1e6 / timings[name], 3) if timings[name] else None,
+                "peak_mb": round(peaks[name] / 1e6, 3),
+            }
+            for name, _ in stages
+        },
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    baseline_by_size = {r["size_mb"]: r for r in (baseline or {}).get("results", [])}
+    for result in results:
+        print(f"\n== {result['size_mb']} MB  (sections={result['sections']}, tables={result['tables']})")
+        header = f"{'stage':<30}{'sec':>10}{'MB/s':>10}{'peak MB':>10}"
+        base = baseline_by_size.get(result["size_mb"])
+        if base:
+            header += f"{'vs base':>10}"
+        print(header)
+        for name, stage in result["stages"].items():
+            line = f"{name:<30}{stage['seconds']:>10.3f}{stage['mb_per_s'] or 0:>10.2f}{stage['peak_mb']:>10.1f}"
+            base_stage = base and base["stages"].get(name)
+            if base_stage and stage["seconds"]:
+                line += f"{base_stage['seconds'] / stage['seconds']:>9.2f}x"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XML 파서 단계별 벤치마크")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5], help="문서 크기(MB) 목록")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy-tables", action="store_true", help="BeautifulSoup 테이블 정제 경로도 측정 (느림)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    results = []
+    for size_mb in args.sizes:
+        xml = generate_document(int(size_mb * 1_000_000), seed=args.seed)
+        result = bench_document(xml, args.repeat, args.legacy_tables)
+        result["size_mb"] = size_mb
+        results.append(result)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "parser_version": PARSER_VERSION,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
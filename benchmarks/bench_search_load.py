@@ -0,0 +1,187 @@
+# bench_search_load.py
+# 검색 API 부하 측정: 같은 보고서 검색을 동기 핸들러(def + 동기 클라이언트, 스레드 풀)와
+# 비동기 핸들러(async def + AsyncOpenSearch)로 각각 띄워 동시 요청 수별 처리량/지연을 비교한다.
+# OpenSearch 대신 로컬 스텁(benchmarks/opensearch_stub.py)을 쓰므로 지연만 흉내 내고 실제 검색 비용은 없다.
+#   python -m benchmarks.bench_search_load --latency 0.05 --concurrency 16 64 256 --duration 10
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import aiohttp
+from aiohttp import web
+from fastapi import FastAPI, HTTPException
+
+from benchmarks.opensearch_stub import make_app
+
+_SEARCH_BODY = {"q": "매출 감소", "size": 10}
+
+
+def create_bench_app():
+    """
+    비교용 API 서버 (uvicorn 자식 프로세스에서 import, OS_HOST는 스텁 주소)
+    /sync/reports는 app.routers.search의 이전 방식, /async/reports는 현재 방식과 같다.
+    """
+    from contextlib import asynccontextmanager
+
+    from app.opensearch_client import close_async_client, get_async_client, init_async_client
+    from app.schemas.search import ReportSearchRequest
+    from app.services.report_search import search_reports, search_reports_async
+
+    @asynccontextmanager
+    async def lifespan(app):
+        init_async_client()
+        yield
+        await close_async_client()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post("/sync/reports")
+    def sync_reports(request: ReportSearchRequest):
+        try:
+            return search_reports(**request.model_dump())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @app.post("/async/reports")
+    async def async_reports(request: ReportSearchRequest):
+        try:
+            return await search_reports_async(get_async_client(), **request.model_dump())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return app
+
+
+def start_stub(port, latency):
+    """스텁 OpenSearch를 별도 스레드의 이벤트 루프에서 실행 (측정 루프와 분리)"""
+    app = make_app(latency)
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+
+    async def serve():
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready.set()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve())
+        loop.run_forever()
+
+    threading.Thread(target=run, name="opensearch-stub", daemon=True).start()
+    ready.wait()
+    return app["stats"]
+
+
+def start_api(port, stub_port, pool_size):
+    env = dict(os.environ, OS_HOST=f"http://127.0.0.1:{stub_port}", OS_ASYNC_POOL_MAXSIZE=str(pool_size))
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.bench_search_load:create_bench_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+    )
+    return process
+
+
+async def _wait_ready(base_url, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.post(f"{base_url}/async/reports", json=_SEARCH_BODY) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"API server did not start: {base_url}")
+
+
+async def run_load(url, concurrency, duration):
+    """concurrency개 클라이언트가 duration초 동안 쉬지 않고 요청, 지연(초) 목록과 오류 수를 반환"""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def client(session):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=_SEARCH_BODY) as response:
+                    await response.read()
+                    ok = response.status == 200
+            except aiohttp.ClientError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def bench(args):
+    base_url = f"http://127.0.0.1:{args.api_port}"
+    await _wait_ready(base_url)
+    results = []
+    for concurrency in args.concurrency:
+        for mode in ("sync", "async"):
+            latencies, errors = await run_load(f"{base_url}/{mode}/reports", concurrency, args.duration)
+            results.append({
+                "mode": mode,
+                "concurrency": concurrency,
+                "rps": len(latencies) / args.duration,
+                "p50": _percentile(latencies, 50),
+                "p99": _percentile(latencies, 99),
+                "errors": errors,
+            })
+            print(
+                f"{mode:<6}{concurrency:>6}{results[-1]['rps']:>10.1f}"
+                f"{results[-1]['p50'] * 1000:>10.1f}{results[-1]['p99'] * 1000:>10.1f}{errors:>8}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 API 동기/비동기 핸들러 부하 비교")
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 OpenSearch 응답 지연(초)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256], help="동시 클라이언트 수 목록")
+    parser.add_argument("--duration", type=float, default=10.0, help="설정마다 측정 시간(초)")
+    parser.add_argument("--pool-size", type=int, default=100, help="비동기 클라이언트 연결 풀 (OS_ASYNC_POOL_MAXSIZE)")
+    parser.add_argument("--stub-port", type=int, default=9800)
+    parser.add_argument("--api-port", type=int, default=8900)
+    args = parser.parse_args()
+
+    stats = start_stub(args.stub_port, args.latency)
+    process = start_api(args.api_port, args.stub_port, args.pool_size)
+    print(f"stub latency={args.latency * 1000:.0f}ms, async pool={args.pool_size}, duration={args.duration:.0f}s")
+    print(f"{'mode':<6}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    try:
+        asyncio.run(bench(args))
+    finally:
+        process.terminate()
+        process.wait()
+        print(f"opensearch stub: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
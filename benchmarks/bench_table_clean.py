@@ -0,0 +1,74 @@
+# bench_table_clean.py
+# 테이블 정제 경로 비교: ET.tostring + BeautifulSoup 재파싱 vs 엘리먼트 직접 직렬화
+#   python -m benchmarks.bench_table_clean --tables 500 --rows 30
+import argparse
+import random
+import time
+import xml.etree.ElementTree as ET
+
+from app.services.parsing.parse_xml import (
+    clean_table_element_for_llm,
+    clean_table_html_for_llm,
+)
+
+
+def make_table_xml(rows, rng):
+    """재무제표 형태의 BORDER="1" 테이블 XML 문자열을 만듭니다."""
+    parts = [
+        '<TABLE BORDER="1" WIDTH="600" ACLASS="EXTRACTION" AFIXTABLE="Y">',
+        '<COLGROUP><COL WIDTH="200"/><COL WIDTH="150"/><COL WIDTH="150"/></COLGROUP>',
+        '<THEAD><TR><TH HEIGHT="30" ALIGN="CENTER">과목</TH>'
+        '<TH ALIGN="CENTER">당기</TH><TH ALIGN="CENTER">전기</TH></TR></THEAD><TBODY>',
+    ]
+    for row in range(rows):
+        parts.append(
+            f'<TR><TD HEIGHT="30" USERMARK="F-BT14">계정과목 {row}</TD>'
+            f'<TE ALIGN="RIGHT" ACODE="A{row}" AUNIT="KRW">{rng.randint(0, 10**12):,}</TE>'
+            f'<TU ALIGN="RIGHT" AUNITVALUE="1">{rng.randint(0, 10**12):,}</TU></TR>\n'
+        )
+    parts.append("</TBODY></TABLE>")
+    return "".join(parts)
+
+
+def bs4_path(element):
+    table_html = ET.tostring(element, encoding="utf-8").decode("utf-8").strip()
+    return clean_table_html_for_llm(table_html)
+
+
+def run(label, func, elements, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for element in elements:
+            func(element)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    per_table_us = best / len(elements) * 1e6
+    print(f"{label:<10} {best * 1000:9.1f} ms  ({per_table_us:8.1f} us/table)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="테이블 정제 마이크로 벤치마크")
+    parser.add_argument("--tables", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    elements = [ET.fromstring(make_table_xml(args.rows, rng)) for _ in range(args.tables)]
+
+    # 두 경로의 결과가 같은지 먼저 확인
+    for element in elements:
+        if bs4_path(element) != clean_table_element_for_llm(element):
+            raise SystemExit("결과 불일치: 두 경로의 출력이 다릅니다.")
+
+    print(f"tables={args.tables} rows={args.rows} repeat={args.repeat}")
+    old = run("bs4", bs4_path, elements, args.repeat)
+    new = run("native", clean_table_element_for_llm, elements, args.repeat)
+    print(f"speedup    {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
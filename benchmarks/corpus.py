@@ -0,0 +1,157 @@
+# corpus.py
+# DART 공시 XML 형태의 합성 문서 생성기 (벤치마크/부하 테스트용)
+#   python -m benchmarks.corpus --out ./report --files 20 --size-mb 5
+import argparse
+import os
+import random
+
+# doc_code -> (보고서명, report/ 하위 폴더)
+REPORT_TYPES = {
+    "11013": ("분기보고서", "분기"),
+    "11012": ("반기보고서", "반기"),
+    "11011": ("사업보고서", "사업"),
+    "10001": ("증권신고서(지분증권)", "증권"),
+}
+
+_SECTION1_TITLES = ["회사의 개요", "사업의 내용", "재무에 관한 사항", "이사회 등 회사의 기관에 관한 사항", "주주에 관한 사항"]
+_SECTION2_TITLES = ["회사의 개요", "회사의 연혁", "자본금 변동사항", "주요 제품 및 서비스", "위험관리 및 파생거래", "연결재무제표"]
+_WORDS = ["당사는", "반도체", "디스플레이", "매출", "영업이익", "전기", "당기", "증가", "감소", "하였습니다.", "위험", "요소",
+          "관세", "환율", "연결", "재무제표", "주석", "참조", "R&D", "투자", "사업부문", "(단위 : 백만원)"]
+
+
+def _sentence(rng):
+    """일반 텍스트에 DART 원문에서 자주 보이는 잡음(비허용 태그, & , 제어 문자)을 섞는다."""
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 18))]
+    roll = rng.random()
+    if roll < 0.08:
+        words.insert(rng.randrange(len(words)), "<주석1>")  # 이스케이프되어야 하는 비허용 태그
+    elif roll < 0.14:
+        words.insert(rng.randrange(len(words)), "A & B")  # 이스케이프되지 않은 &
+    elif roll < 0.17:
+        words.insert(rng.randrange(len(words)), "\x0b\x01")  # XML 1.0 비허용 제어 문자
+    elif roll < 0.20:
+        words.insert(rng.randrange(len(words)), "매출 < 원가 > 0")
+    return " ".join(words)
+
+
+def _paragraph(rng):
+    text = _sentence(rng)
+    roll = rng.random()
+    if roll < 0.15:
+        return f'<P><SPAN USERMARK="F-BT14">{text}</SPAN></P>\n'
+    if roll < 0.2:
+        return f'<P>{text} <A HREF="#toc">바로가기</A></P>\n'
+    return f"<P>{text}</P>\n"
+
+
+def _table(rng, rows, border="1"):
+    parts = [
+        f'<TABLE BORDER="{border}" WIDTH="600" ACLASS="EXTRACTION" AFIXTABLE="Y">',
+        '<COLGROUP><COL WIDTH="200"/><COL WIDTH="150"/><COL WIDTH="150"/></COLGROUP>',
+        '<THEAD><TR><TH HEIGHT="30" ALIGN="CENTER">과목</TH>'
+        '<TH ALIGN="CENTER">당기</TH><TH ALIGN="CENTER">전기</TH></TR></THEAD><TBODY>\n',
+    ]
+    for row in range(rows):
+        rowspan = ' ROWSPAN="2"' if row % 7 == 0 else ""
+        parts.append(
+            f'<TR><TD HEIGHT="30" USERMARK="F-BT14"{rowspan}>{rng.choice(_WORDS)} {row}</TD>'
+            f'<TE ALIGN="RIGHT" ACODE="A{row}" AUNIT="KRW">{rng.randint(0, 10 ** 12):,}</TE>'
+            f'<TU ALIGN="RIGHT" AUNITVALUE="1">{rng.randint(0, 10 ** 12):,}</TU></TR>\n'
+        )
+    parts.append("</TBODY></TABLE>\n")
+    return "".join(parts)
+
+
+def _section2(rng, number, sub_number):
+    parts = [f'<SECTION-2 ACLASS="MANDATORY"><TITLE ATOC="Y" AASSOCNOTE="D-0-2-{sub_number}-0">'
+             f"{sub_number}. {rng.choice(_SECTION2_TITLES)}</TITLE>\n"]
+    for _ in range(rng.randint(2, 6)):
+        parts.append(_paragraph(rng))
+    if rng.random() < 0.7:
+        parts.append(_table(rng, rng.randint(5, 40)))
+    if rng.random() < 0.3:
+        # 레이아웃용 테이블(BORDER="0")은 텍스트로 추출됨
+        parts.append(_table(rng, rng.randint(1, 4), border="0"))
+    if rng.random() < 0.25:
+        parts.append(f"<SECTION-3><TITLE>({sub_number}) 세부 내용</TITLE>\n")
+        parts.append(_paragraph(rng))
+        parts.append(_table(rng, rng.randint(3, 15)))
+        parts.append("</SECTION-3>\n")
+    parts.append("</SECTION-2>\n")
+    return "".join(parts)
+
+
+def generate_document(size_bytes, doc_code="11011", corp_code="00126380", corp_name="삼성전자", seed=0):
+    """
+    대략 size_bytes(UTF-8 기준) 크기의 DART 형태 XML 문자열을 만듭니다.
+    DOCUMENT-NAME/ACODE, COMPANY-NAME/AREGCIK, 중첩 SECTION-1/2/3, BORDER="1" 테이블,
+    비허용 태그, 이스케이프되지 않은 &, 제어 문자, SPAN/A 태그를 포함합니다.
+    """
+    rng = random.Random(seed)
+    doc_name = REPORT_TYPES.get(doc_code, ("기타", "기타"))[0]
+    head = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<DOCUMENT xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+        f'<DOCUMENT-NAME ACODE="{doc_code}">{doc_name}</DOCUMENT-NAME>\n'
+        '<FORMULA-VERSION ADATE="20240101">5.4</FORMULA-VERSION>\n'
+        f'<COMPANY-NAME AREGCIK="{corp_code}">{corp_name}</COMPANY-NAME>\n'
+        f'<SUMMARY><EXTRACTION ACODE="TOT_ASSETS">1,000</EXTRACTION></SUMMARY>\n'
+        f'<BODY>\n<COVER><COVER-TITLE>{doc_name}</COVER-TITLE>\n'
+        f'<TABLE BORDER="0"><TR><TD>회사명 :</TD><TD>{corp_name}</TD></TR></TABLE></COVER>\n'
+    )
+    tail = "</BODY>\n</DOCUMENT>\n"
+    parts = [head]
+    size = len(head.encode("utf-8")) + len(tail.encode("utf-8"))
+    number = 0
+    while size < size_bytes:
+        number += 1
+        section = [f'<SECTION-1 ACLASS="MANDATORY"><TITLE ATOC="Y">{number}. {rng.choice(_SECTION1_TITLES)}</TITLE>\n']
+        section.append(_paragraph(rng))
+        for sub_number in range(1, rng.randint(2, 7)):
+            section.append(_section2(rng, number, sub_number))
+        section.append("<PGBRK/>\n</SECTION-1>\n")
+        chunk = "".join(section)
+        parts.append(chunk)
+        size += len(chunk.encode("utf-8"))
+    parts.append(tail)
+    return "".join(parts)
+
+
+def write_corpus(out_dir, files, size_mb, seed=0):
+    """report/ 폴더 구조(분기/반기/사업/증권)로 합성 문서를 저장하고 경로 목록을 반환합니다."""
+    rng = random.Random(seed)
+    doc_codes = list(REPORT_TYPES)
+    paths = []
+    for i in range(files):
+        doc_code = doc_codes[i % len(doc_codes)]
+        folder = REPORT_TYPES[doc_code][1]
+        rcept_no = f"2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}{i:06d}"
+        target_dir = os.path.join(out_dir, folder, rcept_no)
+        os.makedirs(target_dir, exist_ok=True)
+        path = os.path.join(target_dir, f"{rcept_no}.xml")
+        xml = generate_document(
+            int(size_mb * 1_000_000),
+            doc_code=doc_code,
+            corp_code=f"{rng.randint(0, 10 ** 8):08d}",
+            seed=seed + i,
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(xml)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 DART XML 코퍼스 생성")
+    parser.add_argument("--out", required=True, help="출력 루트 디렉터리 (report/ 구조로 저장)")
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_corpus(args.out, args.files, args.size_mb, args.seed)
+    print(f"{len(paths)} files written under {args.out}")
+
+
+if __name__ == "__main__":
+    main()
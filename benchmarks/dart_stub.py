@@ -0,0 +1,141 @@
+# dart_stub.py
+# DART OpenAPI 원문 다운로드(document.xml) 로컬 스텁 서버 (다운로드 파이프라인 테스트/부하 측정용)
+# report/ 폴더의 XML을 접수번호로 찾아 ZIP으로 내려주고, 지연/간헐 오류를 흉내 낸다.
+#   python -m benchmarks.corpus --out ./bench_report --files 50 --size-mb 1
+#   python -m benchmarks.dart_stub --dir ./bench_report --port 8800 --latency 0.3 --error-rate 0.05
+#   (.env) DART_API_BASE_URL=http://127.0.0.1:8800/api
+import argparse
+import io
+import os
+import random
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# DART가 없는 접수번호에 돌려주는 형태 (HTTP 200 + 오류 XML)
+_NOT_FOUND_BODY = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    "<result><status>014</status><message>파일이 존재하지 않습니다.</message></result>"
+).encode("utf-8")
+
+
+def index_documents(data_dir):
+    """data_dir 하위 XML 파일을 접수번호(파일명) -> 경로로 모은다."""
+    documents = {}
+    for root, _, files in os.walk(data_dir):
+        for file_name in files:
+            if file_name.endswith(".xml"):
+                documents[file_name[:-4]] = os.path.join(root, file_name)
+    return documents
+
+
+def build_zip(xml_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.write(xml_path, os.path.basename(xml_path))
+    return buffer.getvalue()
+
+
+class StubStats:
+    """요청 수와 최대 동시 요청 수 (연결 풀/속도 제한 확인용)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.active = 0
+        self.max_active = 0
+        self.first_at = None
+        self.last_at = None
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            now = time.monotonic()
+            self.first_at = self.first_at or now
+            self.last_at = now
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def end(self, error=False):
+        with self._lock:
+            self.active -= 1
+            self.errors += int(error)
+
+    def summary(self):
+        elapsed = (self.last_at - self.first_at) if self.first_at else 0.0
+        rate = (self.requests - 1) / elapsed if elapsed else 0.0
+        return f"requests={self.requests} errors={self.errors} max_concurrent={self.max_active} rate={rate:.1f}/s"
+
+
+def make_server(data_dir, port=8800, latency=0.0, error_rate=0.0, seed=0):
+    """스텁 서버를 만들어 반환 (serve_forever는 호출하는 쪽에서). server.stats로 요청 통계를 볼 수 있다."""
+    documents = index_documents(data_dir)
+    zip_cache = {}
+    rng = random.Random(seed)
+    stats = StubStats()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/api/document.xml":
+                self._send(404, b"not found", "text/plain")
+                return
+            rcept_no = parse_qs(url.query).get("rcept_no", [""])[0]
+            stats.begin()
+            error = False
+            try:
+                time.sleep(latency)
+                if rng.random() < error_rate:
+                    error = True
+                    self._send(503, b"service unavailable", "text/plain")
+                elif rcept_no not in documents:
+                    self._send(200, _NOT_FOUND_BODY, "application/xml")
+                else:
+                    if rcept_no not in zip_cache:
+                        zip_cache[rcept_no] = build_zip(documents[rcept_no])
+                    self._send(200, zip_cache[rcept_no], "application/x-msdownload")
+            finally:
+                stats.end(error)
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    server.documents = documents
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DART document.xml 로컬 스텁 서버")
+    parser.add_argument("--dir", required=True, help="접수번호.xml 파일이 있는 폴더 (하위 폴더 포함)")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답마다 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503을 돌려줄 확률")
+    args = parser.parse_args()
+
+    server = make_server(args.dir, args.port, args.latency, args.error_rate)
+    print(f"Serving {len(server.documents)} documents on http://127.0.0.1:{args.port}/api/document.xml")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(server.stats.summary())
+
+
+if __name__ == "__main__":
+    main()
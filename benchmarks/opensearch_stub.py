@@ -0,0 +1,106 @@
+# opensearch_stub.py
+# OpenSearch 검색 API 로컬 스텁 서버 (검색 API 부하 측정용)
+# PIT 열기/닫기, _search, 문서 색인에 정해진 응답을 지연(latency) 뒤에 돌려준다. 비동기라 동시 요청 수에 제한이 없다.
+#   python -m benchmarks.opensearch_stub --port 9800 --latency 0.05
+#   (.env) OS_HOST=http://127.0.0.1:9800
+import argparse
+import asyncio
+import itertools
+
+from aiohttp import web
+
+from benchmarks.dart_stub import StubStats
+
+
+def make_search_response(hits=3, sections=2):
+    """report_search가 읽는 모양의 검색 응답 (docvalue fields + nested inner_hits)"""
+    return {
+        "took": 1,
+        "timed_out": False,
+        "hits": {
+            "total": {"value": hits, "relation": "eq"},
+            "max_score": 1.0,
+            "hits": [
+                {
+                    "_index": "rpt_qt-2024",
+                    "_id": f"2024081300000{number}",
+                    "_score": 1.0,
+                    "fields": {
+                        "doc_id": [f"2024081300000{number}"],
+                        "doc_name": ["분기보고서"],
+                        "doc_code": ["11013"],
+                        "pub_date": ["20240813"],
+                        "corp_code": ["00126380"],
+                        "corp_name": ["테스트"],
+                    },
+                    "sort": [1.0, f"2024081300000{number}"],
+                    "inner_hits": {
+                        "sections": {
+                            "hits": {
+                                "hits": [
+                                    {"_score": 1.0, "_source": {"sec_id": f"s{index}", "sec_title": f"섹션 {index}"}}
+                                    for index in range(sections)
+                                ]
+                            }
+                        }
+                    },
+                }
+                for number in range(hits)
+            ],
+        },
+    }
+
+
+def make_app(latency=0.0, hits=3):
+    """스텁 aiohttp 앱. app["stats"]로 요청 통계를 볼 수 있다."""
+    stats = StubStats()
+    pit_ids = itertools.count(1)
+    search_response = make_search_response(hits)
+
+    async def respond(request, body):
+        stats.begin()
+        try:
+            await request.read()  # 요청 본문(gzip)은 보지 않고 비우기만 함
+            await asyncio.sleep(latency)
+            return web.json_response(body)
+        finally:
+            stats.end()
+
+    async def create_pit(request):
+        return await respond(request, {"pit_id": f"pit-{next(pit_ids)}", "creation_time": 0})
+
+    async def search(request):
+        return await respond(request, search_response)
+
+    async def delete_pit(request):
+        return await respond(request, {"pits": [{"successful": True}]})
+
+    async def index(request):
+        return await respond(request, {"_id": request.match_info["doc_id"], "result": "created"})
+
+    app = web.Application()
+    app.router.add_post("/{index}/_search/point_in_time", create_pit)
+    app.router.add_delete("/_search/point_in_time", delete_pit)
+    app.router.add_route("*", "/_search", search)
+    app.router.add_route("*", "/{index}/_search", search)
+    app.router.add_route("*", "/{index}/_doc/{doc_id}", index)
+    app["stats"] = stats
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenSearch 검색 API 로컬 스텁 서버")
+    parser.add_argument("--port", type=int, default=9800)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답마다 지연(초)")
+    parser.add_argument("--hits", type=int, default=3, help="검색 응답의 보고서 수")
+    args = parser.parse_args()
+
+    app = make_app(args.latency, args.hits)
+    try:
+        web.run_app(app, host="127.0.0.1", port=args.port)
+    finally:
+        print(app["stats"].summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+
+# app.config.Settings의 필수 값 (테스트는 외부 서비스에 접속하지 않음)
+os.environ.setdefault("OS_HOST", "http://127.0.0.1:9200")
+os.environ.setdefault("MY_API_BASE_URL", "http://127.0.0.1:8000")
+os.environ.setdefault("MY_API_CORE_REPORTS", "/core-reports")
+os.environ.setdefault("DART_API_KEY", "test-key")
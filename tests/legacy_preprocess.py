@@ -0,0 +1,79 @@
+# legacy_preprocess.py
+# 단일 패스 XmlSanitizer로 바꾸기 전의 정규식 preprocess_xml_content (baseline 그대로)
+# tests/test_parse_xml.py에서 새 구현과 출력이 같은지 비교하는 기준으로만 쓴다.
+import re
+
+
+def preprocess_xml_content(xml_string):
+    # 허용되는 태그 이름 리스트
+    WHITELIST = {
+        "DOCUMENT", "DOCUMENT-NAME", "FORMULA-VERSION", "COMPANY-NAME", "SUMMARY",
+        "LIBRARY", "BODY", "EXTRACTION", "COVER", "COVER-TITLE",
+        "IMAGE", "IMG", "IMG-CAPTION",  "P", "A", "SPAN",
+        "TR", "TD", "TH", "TE", "TU", "SECTION-1", "SECTION-2", "SECTION-3",
+        "TITLE", "TABLE", "TABLE-GROUP", "COLGROUP", "COL", "THEAD",
+        "TBODY", "PGBRK", "PART", "CORRECTION"
+    }
+    # TAG_RE = re.compile(
+    #     r"<(/?)([A-Za-z0-9\-]+)"               # 그룹 1: 슬래시?, 그룹 2: 태그명
+    #     r"([^>]*)"                             # 그룹 3: 속성 등
+    #     r">"
+    # )
+    # 태그 이름만 추출하는 정규식: &lt;/TD&gt; -> /TD, &lt;TD ...&gt; -> TD ...
+    TAG_RE = re.compile(r"&lt;(/?)(\w+(?:-\w+)*)([^&]*)&gt;")
+    def restore_whitelisted_tags(match):
+        slash, tag, attrs = match.groups()
+        if tag.upper() in WHITELIST:
+            return f"<{slash}{tag}{attrs}>"
+        return match.group(0) # 화이트리스트에 없으면 그대로 둠
+    
+    def repl(m):
+        slash, tag, attrs = m.group(1), m.group(2), m.group(3)
+        if tag not in WHITELIST:
+            # 전체 태그 엔티티 처리
+            inner = m.group(0)[1:-1]  # "<...>" 사이 문자열
+            return "&lt;" + inner + "&gt;"
+        else:
+            # 허용된 태그: 속성은 그대로 유지
+            return f"<{slash}{tag}{attrs}>"
+
+    # 1. XML 선언 (Processing Instruction) 추출 및 보호
+    xml_declaration_match = re.match(r"<\?xml[^>]*\?>\s*", xml_string)
+    xml_declaration = ""
+    remaining_xml_string = xml_string
+
+    if xml_declaration_match:
+        xml_declaration = xml_declaration_match.group(
+            0
+        )  # 매치된 선언과 뒤따르는 공백 포함
+        remaining_xml_string = xml_string[
+            xml_declaration_match.end() :
+        ]  # 선언 부분 제거
+
+    encoded_xml = remaining_xml_string.replace("<", "&lt;").replace(">", "&gt;")
+    cleaned_xml = TAG_RE.sub(restore_whitelisted_tags, encoded_xml)
+
+    # SPAN(스타일), A(링크) 태그 제거
+    span_pattern = re.compile(r'</?SPAN\b[^>]*?>', re.IGNORECASE)
+    cleaned_xml_string = span_pattern.sub('', cleaned_xml)
+    a_pattern = re.compile(r'</?A\b[^>]*?>', re.IGNORECASE)
+    cleaned_xml_string = a_pattern.sub('', cleaned_xml_string)
+
+    # 2. 전체 문자열 앞뒤의 공백 및 개행 문자 제거 (XML 선언 제외한 나머지 부분에 적용)
+    cleaned_xml_string = cleaned_xml_string.strip()
+
+    # 3. XML 1.0 사양에서 허용되지 않는 제어 문자 제거 (ParseError 방지)
+    cleaned_xml_string = re.sub(
+        r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", cleaned_xml_string
+    )
+
+    # 4. 이스케이프되지 않은 '&' 문자를 '&amp;'로 변환
+    cleaned_xml_string = re.sub(r'&(?!#|amp;)', r'&amp;', cleaned_xml_string)
+
+    if xml_declaration:
+        # 원래 선언 뒤에 공백이나 개행이 있었다면 그것을 유지
+        # 새로운 시작 문자열 앞에도 개행을 넣어 줄 맞춤을 시도합니다.
+        cleaned_xml_string = xml_declaration + "\n" + cleaned_xml_string.lstrip()
+    # print(cleaned_xml_string)
+
+    return cleaned_xml_string
@@ -0,0 +1,104 @@
+import io
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import requests
+
+from app.config import settings
+from app.services.dart_client import DartApiError, RateLimiter, download_document
+from app.services.zip_cache import ZipCache
+from benchmarks.dart_stub import make_server
+
+FIXTURES = Path(__file__).parent / "fixtures"
+RCEPT_NO = "20240315000101"
+
+
+@pytest.fixture
+def stub():
+    # port 0: 빈 포트를 받아 씀
+    servers = []
+
+    def start(latency=0.0, error_rate=0.0):
+        server = make_server(str(FIXTURES), port=0, latency=latency, error_rate=error_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _download(server, rcept_no, session=None):
+    return download_document(
+        rcept_no,
+        session=session or requests.Session(),
+        rate_limiter=RateLimiter(0),
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/api",
+    )
+
+
+def _xml_in_zip(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        return zip_file.read(zip_file.namelist()[0])
+
+
+def test_download_document(stub):
+    server = stub()
+
+    data = _download(server, RCEPT_NO)
+
+    assert _xml_in_zip(data) == (FIXTURES / f"{RCEPT_NO}.xml").read_bytes()
+    assert server.stats.requests == 1
+
+
+def test_download_document_unknown_rcept_no(stub):
+    server = stub()
+
+    with pytest.raises(DartApiError):
+        _download(server, "20240315999999")
+
+
+def test_download_document_retries_server_errors(stub, monkeypatch):
+    monkeypatch.setattr(settings, "DART_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "DART_INITIAL_BACKOFF", 0.0)
+    server = stub(error_rate=1.0)
+
+    with pytest.raises(requests.HTTPError):
+        _download(server, RCEPT_NO)
+    assert server.stats.requests == 3
+
+
+def test_zip_cache_fetch_downloads_once(stub, tmp_path):
+    server = stub()
+    cache = ZipCache(str(tmp_path / "zip"), 1024 ** 2)
+    session = requests.Session()
+
+    def download(rcept_no):
+        return _download(server, rcept_no, session)
+
+    data, source = cache.fetch(RCEPT_NO, download)
+    assert source == "miss"
+    assert cache.fetch(RCEPT_NO, download) == (data, "hit")
+    # 새 인스턴스(다음 실행)도 디스크에서 읽음
+    assert ZipCache(str(tmp_path / "zip"), 1024 ** 2).fetch(RCEPT_NO, download) == (data, "hit")
+    assert server.stats.requests == 1
+
+
+def test_zip_cache_fetch_coalesces_concurrent_downloads(stub, tmp_path):
+    server = stub(latency=0.2)
+    cache = ZipCache(str(tmp_path / "zip"), 1024 ** 2)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda _: cache.fetch(RCEPT_NO, lambda rcept_no: _download(server, rcept_no)), range(4)
+        ))
+
+    assert len({data for data, _ in results}) == 1
+    assert sorted(source for _, source in results).count("miss") == 1
+    assert server.stats.requests == 1
+    assert cache.stats()["coalesced"] + cache.stats()["hits"] == 3
@@ -0,0 +1,50 @@
+import pytest
+
+from app.services.parsing import parse_cache
+from app.services.parsing.parse_cache import ParseCache, parse_file_cached
+
+VALID_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    "<DOCUMENT>"
+    '<DOCUMENT-NAME ACODE="11011">사업보고서</DOCUMENT-NAME>'
+    '<COMPANY-NAME AREGCIK="00126380">삼성전자</COMPANY-NAME>'
+    "<BODY>"
+    "<SECTION-1><TITLE>I. 회사의 개요</TITLE><P>" + "가나다라" * 20000 + "</P></SECTION-1>"
+    "<SECTION-1><TITLE>II. 사업의 내용</TITLE><P>본문</P></SECTION-1>"
+    "</BODY></DOCUMENT>"
+)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path / "cache"), 1024 ** 2)
+    monkeypatch.setattr(parse_cache, "_parse_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize(
+    "xml",
+    [
+        VALID_XML[: len(VALID_XML) // 2],  # 파일 중간에서 잘림
+        VALID_XML.replace("</P></SECTION-1>", "</Q></SECTION-1>", 1),  # 조각 중간의 태그 오류
+    ],
+    ids=["truncated", "mismatched"],
+)
+def test_malformed_file_is_parse_failure(tmp_path, cache, xml):
+    # mmap 조각이 traceback에 남아 BufferError가 나던 회귀 테스트
+    path = tmp_path / "20240101000001.xml"
+    path.write_bytes(xml.encode("utf-8"))
+
+    assert parse_file_cached(str(path)) is None
+    assert parse_file_cached(str(path)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_valid_file_is_cached(tmp_path, cache):
+    path = tmp_path / "20240101000001.xml"
+    path.write_bytes(VALID_XML.encode("utf-8"))
+
+    parsed = parse_file_cached(str(path))
+    assert [section["sec_title"] for section in parsed["sections"]] == ["I. 회사의 개요", "II. 사업의 내용"]
+    assert parse_file_cached(str(path)) == parsed
+    assert cache.hits == 1
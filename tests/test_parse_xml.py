@@ -0,0 +1,133 @@
+import io
+import random
+from pathlib import Path
+
+import pytest
+
+from app.services.parsing.parse_xml import (
+    XmlSanitizer,
+    iter_darter_sections,
+    parse_darter_xml,
+    parse_darter_xml_bytes,
+    parse_darter_xml_stream,
+    preprocess_xml_content,
+)
+from benchmarks.corpus import generate_document
+from tests.legacy_preprocess import preprocess_xml_content as legacy_preprocess_xml_content
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# 픽스처 파일 -> 원문 인코딩 (같은 문서를 인코딩/BOM만 바꿔 저장)
+ENCODED_FIXTURES = {
+    "20240315000101.xml": "utf-8",
+    "20240315000102.xml": "cp949",  # encoding="EUC-KR" 선언
+    "20240315000103.xml": "utf-8-sig",  # BOM
+    "20240315000104.xml": "cp949",  # 선언 없는 EUC-KR (UTF-8로 읽다 실패하면 cp949로 재시도)
+}
+# 두 번째 SECTION-1 중간에서 잘린 문서
+MALFORMED_FIXTURE = "20240315000105.xml"
+
+CHUNK_SIZES = [7, 64, 4096, None]
+
+# preprocess 비교용 조각 (비허용 태그, 이스케이프 안 된 &, 제어 문자, 잘린 태그/엔티티 등)
+ATOMS = [
+    "<", ">", "&", "&lt;", "&gt;", "&amp;", "&#", "#", "amp;", "a", ";", "<P>", "</P>", "<SPAN>", "</span>",
+    "<A HREF='x'>", "</A>", "<foo>", "</bar x>", "<P-X>", "<가나>", "<P가>", " ", "\n", "\t", "\x01", "\x0b",
+    "\x7f", "\xa0", "텍스트", '<?xml version="1.0"?>', "<?xml", "?>", "-", "/", "&lt;P&gt;", "&lt;/SPAN&gt;",
+    "<TABLE-GROUP>", "<p\x01 a>", "\x00", "<IMG/>", "&nbsp;", '<DOCUMENT-NAME ACODE="1">', "<DOCUMENT-X>",
+    "<TITLE\x01>", "<TR>",
+]
+
+
+def fixture_text(name):
+    return (FIXTURES / name).read_bytes().decode(ENCODED_FIXTURES[name])
+
+
+def corpus_documents():
+    return [generate_document(20_000, seed=seed) for seed in range(3)]
+
+
+@pytest.mark.parametrize("name", ENCODED_FIXTURES)
+def test_preprocess_matches_legacy_on_fixtures(name):
+    text = fixture_text(name)
+    assert preprocess_xml_content(text) == legacy_preprocess_xml_content(text)
+
+
+def test_preprocess_matches_legacy_on_corpus():
+    for xml in corpus_documents():
+        assert preprocess_xml_content(xml) == legacy_preprocess_xml_content(xml)
+
+
+def test_preprocess_matches_legacy_on_random_input():
+    rng = random.Random(0)
+    for _ in range(3000):
+        parts = [rng.choice(ATOMS) for _ in range(rng.randint(0, 14))]
+        if rng.random() < 0.3:
+            parts.insert(0, rng.choice(["<?xml version='1.0' encoding='utf-8'?>", "<?xml ?>\n \x01 ", "<?xml?>"]))
+        text = "".join(parts)
+        expected = legacy_preprocess_xml_content(text)
+        assert preprocess_xml_content(text) == expected, text
+
+        # 조각을 나눠 넣어도 결과가 같아야 함 (스트리밍 파서 경로)
+        sanitizer = XmlSanitizer()
+        out = []
+        start = 0
+        while start < len(text):
+            step = rng.randint(1, 6)
+            out.append(sanitizer.feed(text[start:start + step]))
+            start += step
+        out.append(sanitizer.close())
+        assert "".join(out) == expected, text
+
+
+@pytest.mark.parametrize("name", ENCODED_FIXTURES)
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_bytes_parser_matches_tree_parser(name, chunk_size):
+    expected = parse_darter_xml(fixture_text(name), name)
+    assert expected is not None and expected["sections"]
+    data = (FIXTURES / name).read_bytes()
+
+    assert parse_darter_xml_bytes(data, name, chunk_size=chunk_size) == expected
+    assert parse_darter_xml_bytes(memoryview(bytearray(data)), name, chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "chunk_size"),
+    [(name, chunk_size) for name in ("20240315000101.xml", "20240315000103.xml") for chunk_size in CHUNK_SIZES]
+    # 스트림은 인코딩을 첫 조각으로 판별하므로 EUC-KR 선언이 첫 조각에 들어가는 크기만
+    + [("20240315000102.xml", 4096), ("20240315000102.xml", None)],
+)
+def test_stream_parser_matches_tree_parser(name, chunk_size):
+    expected = parse_darter_xml(fixture_text(name), name)
+    path = FIXTURES / name
+
+    assert parse_darter_xml_stream(str(path), name, chunk_size=chunk_size) == expected
+    assert parse_darter_xml_stream(io.BytesIO(path.read_bytes()), name, chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_parsers_match_tree_parser_on_corpus(chunk_size):
+    for xml in corpus_documents():
+        expected = parse_darter_xml(xml, "20240101000001.xml")
+        data = xml.encode("utf-8")
+        assert parse_darter_xml_bytes(data, "20240101000001.xml", chunk_size=chunk_size) == expected
+        assert parse_darter_xml_stream(io.BytesIO(data), "20240101000001.xml", chunk_size=chunk_size) == expected
+
+
+def test_iter_darter_sections_reads_header_and_sections():
+    name = "20240315000101.xml"
+    expected = parse_darter_xml(fixture_text(name), name)
+    header = {}
+
+    sections = list(iter_darter_sections(str(FIXTURES / name), header, chunk_size=64))
+
+    assert sections == expected["sections"]
+    assert header == {field: expected[field] for field in ("doc_name", "doc_code", "corp_code", "corp_name")}
+
+
+def test_malformed_document_is_parse_failure():
+    data = (FIXTURES / MALFORMED_FIXTURE).read_bytes()
+
+    assert parse_darter_xml(data.decode("utf-8"), MALFORMED_FIXTURE) is None
+    assert parse_darter_xml_bytes(data, MALFORMED_FIXTURE) is None
+    assert parse_darter_xml_stream(io.BytesIO(data), MALFORMED_FIXTURE) is None